@@ -0,0 +1,28 @@
+"""add token version to users
+
+Revision ID: 3c8e5f2a9b61
+Revises: 2a6d93c0e4b7
+Create Date: 2026-10-19 15:12:37.518204
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3c8e5f2a9b61"
+down_revision = "2a6d93c0e4b7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("token_version", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "token_version")
@@ -0,0 +1,34 @@
+"""add tokens revoked at to users
+
+Revision ID: 4d1b8e6f2c37
+Revises: 9b4e2d7f1a63
+Create Date: 2026-10-19 22:31:54.207613
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4d1b8e6f2c37"
+down_revision = "9b4e2d7f1a63"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users", sa.Column("tokens_revoked_at", sa.TIMESTAMP(timezone=True), nullable=True)
+    )
+    op.create_index(
+        op.f("ix_users_tokens_revoked_at"), "users", ["tokens_revoked_at"], unique=False
+    )
+    # The real revocation times are unknown: keep past revokers on the denylist
+    # for one more token lifetime.
+    op.execute("UPDATE users SET tokens_revoked_at = CURRENT_TIMESTAMP WHERE token_version > 0")
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_users_tokens_revoked_at"), table_name="users")
+    op.drop_column("users", "tokens_revoked_at")
@@ -0,0 +1,30 @@
+"""add group members pagination indexes
+
+Revision ID: 4d7b1e9c3a52
+Revises: 3c8e5f2a9b61
+Create Date: 2026-10-19 17:41:09.284613
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4d7b1e9c3a52"
+down_revision = "3c8e5f2a9b61"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_group_members_group_id_joined_at",
+        "group_members",
+        ["group_id", "joined_at"],
+        unique=False,
+    )
+    op.create_index("ix_group_members_user_id", "group_members", ["user_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_group_members_user_id", table_name="group_members")
+    op.drop_index("ix_group_members_group_id_joined_at", table_name="group_members")
@@ -0,0 +1,26 @@
+"""index expense_shares.expense_id
+
+Revision ID: 5b2e8c41d7a3
+Revises: d9f75a7ac096
+Create Date: 2026-10-19 09:12:40.118532
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5b2e8c41d7a3"
+down_revision = "d9f75a7ac096"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Splits are read per expense via a correlated subquery; keep that lookup indexed.
+    op.create_index(
+        op.f("ix_expense_shares_expense_id"), "expense_shares", ["expense_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_expense_shares_expense_id"), table_name="expense_shares")
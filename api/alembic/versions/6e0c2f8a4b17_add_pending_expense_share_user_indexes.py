@@ -0,0 +1,39 @@
+"""add pending expense share user indexes
+
+Revision ID: 6e0c2f8a4b17
+Revises: 4d7b1e9c3a52
+Create Date: 2026-10-19 18:26:44.903172
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "6e0c2f8a4b17"
+down_revision = "4d7b1e9c3a52"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_expense_shares_debtor_id_pending",
+        "expense_shares",
+        ["debtor_id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+    op.create_index(
+        "ix_expense_shares_creditor_id_pending",
+        "expense_shares",
+        ["creditor_id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_expense_shares_creditor_id_pending", table_name="expense_shares")
+    op.drop_index("ix_expense_shares_debtor_id_pending", table_name="expense_shares")
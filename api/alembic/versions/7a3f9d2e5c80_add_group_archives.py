@@ -0,0 +1,44 @@
+"""add group archives
+
+Revision ID: 7a3f9d2e5c80
+Revises: 6e0c2f8a4b17
+Create Date: 2026-10-19 19:02:15.640381
+
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7a3f9d2e5c80"
+down_revision = "6e0c2f8a4b17"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("groups", sa.Column("archived_at", sa.TIMESTAMP(timezone=True), nullable=True))
+    op.create_table(
+        "group_archives",
+        sa.Column("group_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("payload", sa.LargeBinary(), nullable=False),
+        sa.Column("expense_count", sa.Integer(), nullable=False),
+        sa.Column("last_activity_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column(
+            "archived_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["group_id"], ["groups.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("group_id"),
+    )
+
+
+def downgrade() -> None:
+    # Archived groups must be restored first (scripts/archive_inactive_groups.py --restore),
+    # otherwise their expenses are lost with the table.
+    op.drop_table("group_archives")
+    op.drop_column("groups", "archived_at")
@@ -0,0 +1,41 @@
+"""add expense filter indexes
+
+Revision ID: 8f3a1d6c2b94
+Revises: 5b2e8c41d7a3
+Create Date: 2026-10-19 10:03:27.561904
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8f3a1d6c2b94"
+down_revision = "5b2e8c41d7a3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index("ix_expenses_group_id_date", "expenses", ["group_id", "date"], unique=False)
+    op.create_index(
+        "ix_expenses_group_id_category_date",
+        "expenses",
+        ["group_id", "category", "date"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_expenses_description_trgm",
+        "expenses",
+        ["description"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"description": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_expenses_description_trgm", table_name="expenses")
+    op.drop_index("ix_expenses_group_id_category_date", table_name="expenses")
+    op.drop_index("ix_expenses_group_id_date", table_name="expenses")
+    # pg_trgm is left installed: other objects may depend on it.
@@ -0,0 +1,63 @@
+"""add group archive expenses
+
+Revision ID: 9b4e2d7f1a63
+Revises: 7a3f9d2e5c80
+Create Date: 2026-10-19 21:40:08.112954
+
+"""
+
+import gzip
+import json
+import uuid
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9b4e2d7f1a63"
+down_revision = "7a3f9d2e5c80"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "group_archive_expenses",
+        sa.Column("expense_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("group_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.ForeignKeyConstraint(["group_id"], ["group_archives.group_id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("expense_id"),
+    )
+    op.create_index(
+        op.f("ix_group_archive_expenses_group_id"),
+        "group_archive_expenses",
+        ["group_id"],
+        unique=False,
+    )
+    # Index the expenses of groups archived before this table existed
+    # (payload format: see api/app/archival.py)
+    conn = op.get_bind()
+    archives = sa.table(
+        "group_archives",
+        sa.column("group_id", postgresql.UUID(as_uuid=True)),
+        sa.column("payload", sa.LargeBinary()),
+    )
+    index = sa.table(
+        "group_archive_expenses",
+        sa.column("expense_id", postgresql.UUID(as_uuid=True)),
+        sa.column("group_id", postgresql.UUID(as_uuid=True)),
+    )
+    for group_id, payload in conn.execute(sa.select(archives.c.group_id, archives.c.payload)):
+        expenses = json.loads(gzip.decompress(payload))["expenses"]
+        if expenses:
+            conn.execute(
+                index.insert(),
+                [{"expense_id": uuid.UUID(row["id"]), "group_id": group_id} for row in expenses],
+            )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_group_archive_expenses_group_id"), table_name="group_archive_expenses")
+    op.drop_table("group_archive_expenses")
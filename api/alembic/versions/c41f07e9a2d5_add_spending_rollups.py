@@ -0,0 +1,48 @@
+"""add spending rollups
+
+Revision ID: c41f07e9a2d5
+Revises: 8f3a1d6c2b94
+Create Date: 2026-10-19 11:20:51.734210
+
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c41f07e9a2d5"
+down_revision = "8f3a1d6c2b94"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "group_spending_rollups",
+        sa.Column("group_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("category", sa.String(length=100), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("total", sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column("expense_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["group_id"], ["groups.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("group_id", "category", "month"),
+    )
+    op.create_table(
+        "user_spending_rollups",
+        sa.Column("group_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("category", sa.String(length=100), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("total", sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.ForeignKeyConstraint(["group_id"], ["groups.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("group_id", "user_id", "category", "month"),
+    )
+    # Existing history is backfilled with scripts/rebuild_spending_rollups.py
+
+
+def downgrade() -> None:
+    op.drop_table("user_spending_rollups")
+    op.drop_table("group_spending_rollups")
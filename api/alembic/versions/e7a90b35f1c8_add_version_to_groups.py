@@ -0,0 +1,28 @@
+"""add version to groups
+
+Revision ID: e7a90b35f1c8
+Revises: c41f07e9a2d5
+Create Date: 2026-10-19 12:41:09.286317
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e7a90b35f1c8"
+down_revision = "c41f07e9a2d5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "groups",
+        sa.Column("version", sa.Integer(), nullable=False, server_default=sa.text("1")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("groups", "version")
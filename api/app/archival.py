@@ -0,0 +1,205 @@
+"""Cold storage for settled, idle groups.
+
+Archiving moves a group's ``expenses`` and ``expense_shares`` rows into a single
+gzip-compressed JSON document in ``group_archives`` and marks the group with
+``archived_at``, so long-dead groups stop inflating the hot tables' indexes.
+Only groups with no pending debts and no expense for a configurable number of
+months qualify (see ``scripts/archive_inactive_groups.py``).
+
+Reading a group's expenses or debts, or one of its expenses by id (looked up in
+``group_archive_expenses``), restores it first (`restore_group`): the rows are
+re-inserted with their original ids and timestamps and the archive is
+deleted. Reads restore on the primary session, and only when a full response is
+needed; a conditional GET whose ETag still matches leaves the archive alone.
+Adding an expense restores the group in the same transaction. Spending rollups are not touched either way, so analytics keep working
+for archived groups. Payload format::
+
+    {"v": 1, "expenses": [{column: value, ...}], "shares": [{column: value, ...}]}
+
+with UUIDs and decimals as strings and timestamps in ISO 8601.
+"""
+
+import gzip
+import json
+import uuid
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import delete, exists, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.app.models.expense import Expense
+from api.app.models.expense_share import ExpenseShare
+from api.app.models.group import Group
+from api.app.models.group_archive import GroupArchive, GroupArchiveExpense
+
+ARCHIVE_FORMAT_VERSION = 1
+
+
+def idle_cutoff(idle_months: int, now: datetime | None = None) -> datetime:
+    """Groups whose last expense is older than this are idle (a month counts as 30 days)."""
+    return (now or datetime.now(UTC)) - timedelta(days=30 * idle_months)
+
+
+def _archivable(idle_since: datetime) -> list:
+    """Criteria on `Group` for groups that may be archived."""
+    group_expense = Expense.group_id == Group.id
+    pending_debt = (
+        select(ExpenseShare.id)
+        .join(Expense, ExpenseShare.expense_id == Expense.id)
+        .where(
+            group_expense,
+            ExpenseShare.status == "pending",
+            ExpenseShare.debtor_id != ExpenseShare.creditor_id,
+        )
+    )
+    return [
+        Group.archived_at.is_(None),
+        exists(select(Expense.id).where(group_expense)),
+        ~exists(select(Expense.id).where(group_expense, Expense.created_at >= idle_since)),
+        ~exists(pending_debt),
+    ]
+
+
+async def find_archivable_groups(
+    db: AsyncSession, idle_since: datetime, limit: int | None = None
+) -> list[uuid.UUID]:
+    """Ids of settled groups without expenses since `idle_since`, oldest groups first."""
+    query = select(Group.id).where(*_archivable(idle_since)).order_by(Group.created_at)
+    if limit is not None:
+        query = query.limit(limit)
+    result = await db.execute(query)
+    return list(result.scalars().all())
+
+
+def _encode(value):
+    if isinstance(value, uuid.UUID | Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _decode_row(table, data: dict) -> dict:
+    """Convert a payload row back to column values, using the columns' Python types."""
+    row = {}
+    for column in table.columns:
+        if column.name not in data:
+            continue
+        value = data[column.name]
+        if value is not None:
+            python_type = column.type.python_type
+            if python_type is uuid.UUID:
+                value = uuid.UUID(value)
+            elif python_type is Decimal:
+                value = Decimal(value)
+            elif python_type is datetime:
+                value = datetime.fromisoformat(value)
+        row[column.name] = value
+    return row
+
+
+def encode_payload(expenses: list[dict], shares: list[dict]) -> bytes:
+    document = {
+        "v": ARCHIVE_FORMAT_VERSION,
+        "expenses": [{k: _encode(v) for k, v in row.items()} for row in expenses],
+        "shares": [{k: _encode(v) for k, v in row.items()} for row in shares],
+    }
+    # mtime=0 keeps the output a pure function of the rows
+    return gzip.compress(json.dumps(document, separators=(",", ":")).encode(), mtime=0)
+
+
+def decode_payload(payload: bytes) -> tuple[list[dict], list[dict]]:
+    document = json.loads(gzip.decompress(payload))
+    if document.get("v") != ARCHIVE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported group archive format: {document.get('v')!r}")
+    return (
+        [_decode_row(Expense.__table__, row) for row in document["expenses"]],
+        [_decode_row(ExpenseShare.__table__, row) for row in document["shares"]],
+    )
+
+
+async def archive_group(db: AsyncSession, group_id: uuid.UUID, idle_since: datetime) -> int:
+    """Move a qualifying group's expenses into its archive; the caller commits.
+
+    The criteria are checked again under a row lock on the group, so a group
+    that received an expense since it was selected is left alone. Returns the
+    number of expenses archived (0 if the group no longer qualifies).
+    """
+    locked = await db.execute(
+        select(Group.id).where(Group.id == group_id, *_archivable(idle_since)).with_for_update()
+    )
+    if locked.scalar_one_or_none() is None:
+        return 0
+
+    group_expense_ids = select(Expense.id).where(Expense.group_id == group_id)
+    expenses = (
+        await db.execute(select(Expense.__table__).where(Expense.group_id == group_id))
+    ).all()
+    shares = (
+        await db.execute(
+            select(ExpenseShare.__table__).where(ExpenseShare.expense_id.in_(group_expense_ids))
+        )
+    ).all()
+
+    await db.execute(
+        insert(GroupArchive).values(
+            group_id=group_id,
+            payload=encode_payload(
+                [dict(row._mapping) for row in expenses], [dict(row._mapping) for row in shares]
+            ),
+            expense_count=len(expenses),
+            last_activity_at=max(row.created_at for row in expenses),
+        )
+    )
+    await db.execute(
+        insert(GroupArchiveExpense),
+        [{"expense_id": row.id, "group_id": group_id} for row in expenses],
+    )
+    await db.execute(
+        delete(ExpenseShare).where(ExpenseShare.expense_id.in_(group_expense_ids)),
+        execution_options={"synchronize_session": False},
+    )
+    await db.execute(
+        delete(Expense).where(Expense.group_id == group_id),
+        execution_options={"synchronize_session": False},
+    )
+    await db.execute(update(Group).where(Group.id == group_id).values(archived_at=func.now()))
+    return len(expenses)
+
+
+async def archived_group_of(db: AsyncSession, expense_id: uuid.UUID) -> uuid.UUID | None:
+    """Id of the archived group holding `expense_id`, or None if it is not archived."""
+    result = await db.execute(
+        select(GroupArchiveExpense.group_id).where(GroupArchiveExpense.expense_id == expense_id)
+    )
+    return result.scalar_one_or_none()
+
+
+async def restore_group(db: AsyncSession, group_id: uuid.UUID) -> int:
+    """Move an archived group's expenses back into the hot tables; the caller commits.
+
+    Deleting the archive row first makes concurrent restores safe: the second
+    one blocks on the row and then finds nothing to restore. Returns the number
+    of expenses restored.
+    """
+    result = await db.execute(
+        delete(GroupArchive)
+        .where(GroupArchive.group_id == group_id)
+        .returning(GroupArchive.payload),
+        execution_options={"synchronize_session": False},
+    )
+    payload = result.scalar_one_or_none()
+    await db.execute(
+        delete(GroupArchiveExpense).where(GroupArchiveExpense.group_id == group_id),
+        execution_options={"synchronize_session": False},
+    )
+    expenses: list[dict] = []
+    if payload is not None:
+        expenses, shares = decode_payload(payload)
+        if expenses:
+            await db.execute(insert(Expense), expenses)
+        if shares:
+            await db.execute(insert(ExpenseShare), shares)
+    await db.execute(update(Group).where(Group.id == group_id).values(archived_at=None))
+    return len(expenses)
@@ -1,29 +1,73 @@
-"""JWT authentication utilities."""
+"""JWT authentication utilities.
 
+python-jose (and the cryptography package it loads, about 40 ms) is imported
+on the first token encode or decode, keeping it out of the API's start-up.
+"""
+
+import hashlib
 import inspect
+import time
 import uuid
 from datetime import UTC, datetime, timedelta
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
-from sqlalchemy import select
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.app.database import AsyncSessionLocal
+from api.app import metrics
+from api.app.cache import TTLCache
+from api.app.dependencies import SESSION_USER_KEY, get_db
 from api.app.models.user import User
+from api.app.token_revocation import token_denylist
 from api.app.variables import MyVariables
 
 # Security scheme for Swagger UI
 security = HTTPBearer()
 
+# Column values of recently authenticated users, keyed by user id. Each hit is
+# returned as a fresh transient `User` so handlers never share mutable state.
+_user_cache = TTLCache(maxsize=MyVariables.user_cache_size, ttl=MyVariables.user_cache_ttl_seconds)
+_user_cache_hits = metrics.counter("auth.user_cache.hits")
+_user_cache_misses = metrics.counter("auth.user_cache.misses")
+
+# Verified claims of recently seen tokens, keyed by the token's SHA-256 digest.
+# Each entry expires at the token's own `exp`, so a hit never outlives the token.
+_token_cache = TTLCache(
+    maxsize=MyVariables.token_cache_size, ttl=MyVariables.jwt_access_token_expire_minutes * 60
+)
+_token_cache_hits = metrics.counter("auth.token_cache.hits")
+
+
+def _user_columns(user: User) -> dict:
+    return {column.key: getattr(user, column.key) for column in User.__mapper__.column_attrs}
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target: User) -> None:
+    """Drop a user from the cache when the ORM updates or deletes it.
 
-def create_access_token(user_id: uuid.UUID) -> str:
+    Bulk ``update(User)``/``delete(User)`` statements bypass these events and
+    must call `invalidate_cached_user` themselves.
+    """
+    invalidate_cached_user(target.id)
+
+
+def invalidate_cached_user(user_id: uuid.UUID) -> None:
+    """Forget the cached copy of a user, if any."""
+    _user_cache.pop(user_id)
+
+
+def create_access_token(user_id: uuid.UUID, user: User | None = None) -> str:
     """
     Create a JWT access token for a user.
 
     Args:
         user_id: The user's UUID
+        user: The user, if loaded. Its token version is embedded so the token
+            can be revoked, and in stateless auth mode so are the profile
+            fields `get_current_user` needs to skip the database.
 
     Returns:
         Encoded JWT token string
@@ -35,13 +79,21 @@ def create_access_token(user_id: uuid.UUID) -> str:
         "exp": expire,
         "iat": now_utc,
     }
+    if user is not None:
+        to_encode["ver"] = user.token_version or 0
+        if MyVariables.auth_mode == "stateless":
+            to_encode["name"] = user.name
+            to_encode["email"] = user.email
+            to_encode["created_at"] = user.created_at.isoformat()
+    from jose import jwt
+
     encoded_jwt = jwt.encode(
         to_encode, MyVariables.jwt_secret_key, algorithm=MyVariables.jwt_algorithm
     )
     return encoded_jwt
 
 
-def decode_access_token(token: str) -> uuid.UUID | None:
+def decode_access_token_claims(token: str) -> dict | None:
     """
     Decode and verify a JWT access token.
 
@@ -49,8 +101,16 @@ def decode_access_token(token: str) -> uuid.UUID | None:
         token: The JWT token string
 
     Returns:
-        The user's UUID if valid, None otherwise
+        The verified claims with ``sub`` parsed to a UUID if valid, None otherwise
     """
+    digest = hashlib.sha256(token.encode()).digest()
+    cached = _token_cache.get(digest)
+    if cached is not None:
+        _token_cache_hits.inc()
+        return dict(cached)
+
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(
             token, MyVariables.jwt_secret_key, algorithms=[MyVariables.jwt_algorithm]
@@ -58,27 +118,71 @@ def decode_access_token(token: str) -> uuid.UUID | None:
         user_id: str = payload.get("sub")
         if user_id is None:
             return None
-        return uuid.UUID(user_id)
+        payload["sub"] = uuid.UUID(user_id)
     except (JWTError, ValueError):
         return None
 
+    exp = payload.get("exp")
+    if isinstance(exp, int | float):
+        _token_cache.set(digest, payload, ttl=exp - time.time())
+    return dict(payload)
+
+
+def decode_access_token(token: str) -> uuid.UUID | None:
+    """
+    Decode and verify a JWT access token.
+
+    Args:
+        token: The JWT token string
+
+    Returns:
+        The user's UUID if valid, None otherwise
+    """
+    payload = decode_access_token_claims(token)
+    return None if payload is None else payload["sub"]
+
+
+def _user_from_claims(payload: dict) -> User | None:
+    """Build a transient principal from stateless-mode claims, if present."""
+    try:
+        return User(
+            id=payload["sub"],
+            name=payload["name"],
+            email=payload["email"],
+            created_at=datetime.fromisoformat(payload["created_at"]),
+            token_version=payload.get("ver", 0),
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+
 
-async def get_db_for_auth():
-    """Dependency to provide database session for auth operations."""
-    async with AsyncSessionLocal() as session:
-        yield session
+async def _load_user(db: AsyncSession, user_id: uuid.UUID) -> User | None:
+    cached = _user_cache.get(user_id)
+    if cached is not None:
+        _user_cache_hits.inc()
+        return User(**cached)
+
+    # Fetch user from database
+    _user_cache_misses.inc()
+    execution = db.execute(select(User).where(User.id == user_id))
+    result = await execution if inspect.isawaitable(execution) else execution
+    user = result.scalar_one_or_none()
+    if user is not None:
+        _user_cache.set(user_id, _user_columns(user))
+    return user
 
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db_for_auth),
+    db: AsyncSession = Depends(get_db),
 ) -> User:
     """
     Dependency to get the current authenticated user from JWT token.
 
     Args:
         credentials: HTTP Bearer token from Authorization header
-        db: Database session
+        db: Database session, shared with the route handler (FastAPI caches
+            `get_db` per request, so both use one pooled connection)
 
     Returns:
         The authenticated User object
@@ -93,17 +197,29 @@ async def get_current_user(
     )
 
     token = credentials.credentials
-    user_id = decode_access_token(token)
+    payload = decode_access_token_claims(token)
 
-    if user_id is None:
+    if payload is None:
         raise credentials_exception
 
-    # Fetch user from database
-    execution = db.execute(select(User).where(User.id == user_id))
-    result = await execution if inspect.isawaitable(execution) else execution
-    user = result.scalar_one_or_none()
+    user_id = payload["sub"]
+    version = payload.get("ver", 0)
+
+    # Stateless mode: the signed claims are the principal; only revocation is checked.
+    # Tokens issued in database mode lack the profile claims and fall through.
+    if MyVariables.auth_mode == "stateless":
+        principal = _user_from_claims(payload)
+        if principal is not None:
+            await token_denylist.refresh_if_stale(db)
+            if token_denylist.is_revoked(user_id, version):
+                raise credentials_exception
+            db.info[SESSION_USER_KEY] = principal.id
+            return principal
+
+    user = await _load_user(db, user_id)
 
-    if user is None:
+    if user is None or version < user.token_version:
         raise credentials_exception
 
+    db.info[SESSION_USER_KEY] = user.id
     return user
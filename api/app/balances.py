@@ -0,0 +1,68 @@
+"""Per-user net balances computed in SQL.
+
+A user's net balance in a group is what the others owe them minus what they owe
+the others, over pending shares. It is answered from the user's own pending
+shares (partial indexes on ``debtor_id`` and ``creditor_id``) joined to the
+group's expenses, instead of building the group's whole debt matrix.
+
+Whether a user may leave a group is a stricter question: debts that cancel out
+across different members still leave pending shares behind, so that check asks
+whether any pending share involves the user at all.
+"""
+
+import uuid
+from decimal import Decimal
+
+from sqlalchemy import case, exists, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.app.models.expense import Expense
+from api.app.models.expense_share import ExpenseShare
+
+
+def _pending_shares_of(group_id, user_id: uuid.UUID) -> tuple:
+    """WHERE clauses for `user_id`'s pending shares, on either side, in `group_id`."""
+    return (
+        Expense.group_id == group_id,
+        ExpenseShare.status == "pending",
+        ExpenseShare.debtor_id != ExpenseShare.creditor_id,
+        or_(ExpenseShare.creditor_id == user_id, ExpenseShare.debtor_id == user_id),
+    )
+
+
+def net_balance_query(group_id, user_id: uuid.UUID):
+    """SELECT of `user_id`'s net balance in `group_id` (a value or a correlated column)."""
+    return (
+        select(
+            func.coalesce(
+                func.sum(
+                    case(
+                        (ExpenseShare.creditor_id == user_id, ExpenseShare.amount_owed),
+                        else_=-ExpenseShare.amount_owed,
+                    )
+                ),
+                0,
+            )
+        )
+        .select_from(ExpenseShare)
+        .join(Expense, ExpenseShare.expense_id == Expense.id)
+        .where(*_pending_shares_of(group_id, user_id))
+    )
+
+
+async def get_net_balance(db: AsyncSession, group_id: uuid.UUID, user_id: uuid.UUID) -> Decimal:
+    """Positive: `user_id` is owed money in the group; negative: they owe."""
+    result = await db.execute(net_balance_query(group_id, user_id))
+    return Decimal(result.scalar())
+
+
+async def has_unsettled_balance(db: AsyncSession, group_id: uuid.UUID, user_id: uuid.UUID) -> bool:
+    """True while any pending share in the group has `user_id` as debtor or creditor."""
+    result = await db.execute(
+        select(
+            exists()
+            .where(ExpenseShare.expense_id == Expense.id)
+            .where(*_pending_shares_of(group_id, user_id))
+        )
+    )
+    return bool(result.scalar())
@@ -1,9 +1,16 @@
 import ssl
+from functools import lru_cache
 
-from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
+from api.app.db_pool import InstrumentedAsyncQueuePool
 from api.app.variables import MyVariables
 
 # Validate required DB configuration early so startup errors are actionable.
@@ -14,26 +21,63 @@ if not MyVariables.async_database_url or not MyVariables.sync_database_url:
     )
 
 # Async engine connected to PostgreSQL via asyncpg
-# asyncpg doesn't understand sslmode in URL params, so TLS is configured via connect_args.
+# asyncpg doesn't understand sslmode in URL params, so TLS is configured per connection.
 #
 # By default, certificate verification remains enabled (db_ssl_verify=true).
 # For local/dev environments where trust store configuration is missing, you can
 # set DB_SSL_VERIFY=false to allow encrypted connections without certificate checks.
-if MyVariables.db_ssl:
-    if MyVariables.db_ssl_verify:
-        connect_args = {"ssl": ssl.create_default_context()}
-    else:
-        insecure_context = ssl.create_default_context()
-        insecure_context.check_hostname = False
-        insecure_context.verify_mode = ssl.CERT_NONE
-        connect_args = {"ssl": insecure_context}
-else:
-    connect_args = {}
+
+
+@lru_cache(maxsize=1)
+def _ssl_context() -> ssl.SSLContext:
+    """TLS context for asyncpg, built on the first connection (loading CA certs takes ~20 ms)."""
+    context = ssl.create_default_context()
+    if not MyVariables.db_ssl_verify:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+def _use_tls(dialect, conn_rec, cargs, cparams) -> None:
+    cparams["ssl"] = _ssl_context()
+
+
+def configure_tls(async_engine: AsyncEngine) -> None:
+    """Connect `async_engine` over TLS when DB_SSL is enabled."""
+    if MyVariables.db_ssl:
+        event.listen(async_engine.sync_engine, "do_connect", _use_tls)
+
+
+# asyncpg's own statement cache and SQLAlchemy's prepared-statement cache
+connect_args = {
+    "statement_cache_size": MyVariables.db_statement_cache_size,
+    "prepared_statement_cache_size": MyVariables.db_statement_cache_size,
+}
+
+_engine_options = {
+    "echo": MyVariables.db_echo,
+    "connect_args": connect_args,
+    "pool_size": MyVariables.db_pool_size,
+    "max_overflow": MyVariables.db_max_overflow,
+    "pool_timeout": MyVariables.db_pool_timeout,
+    "pool_recycle": MyVariables.db_pool_recycle,
+    "pool_pre_ping": MyVariables.db_pool_pre_ping,
+}
+
 engine = create_async_engine(
-    MyVariables.async_database_url,
-    echo=MyVariables.db_echo,
-    connect_args=connect_args,
+    MyVariables.async_database_url, poolclass=InstrumentedAsyncQueuePool, **_engine_options
 )
+configure_tls(engine)
+
+# Optional read replica, used by read-only endpoints (see api/app/read_replica.py).
+# Its pool is not instrumented, so the /internal pool metrics describe the primary.
+replica_engine = (
+    create_async_engine(MyVariables.replica_async_database_url, **_engine_options)
+    if MyVariables.replica_async_database_url
+    else None
+)
+if replica_engine is not None:
+    configure_tls(replica_engine)
 
 # Session factory producing AsyncSession instances
 AsyncSessionLocal = async_sessionmaker(
@@ -42,9 +86,25 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
-# Sync engine and session for seeds/scripts
-sync_engine = create_engine(MyVariables.sync_database_url, echo=MyVariables.db_echo)
-Session = sessionmaker(bind=sync_engine)
+
+# Sync engine and session for seeds/scripts. They are created on first use (see
+# __getattr__) so the API process, which never uses them, doesn't import psycopg2.
+@lru_cache(maxsize=1)
+def get_sync_engine() -> Engine:
+    return create_engine(MyVariables.sync_database_url, echo=MyVariables.db_echo)
+
+
+@lru_cache(maxsize=1)
+def _sync_sessionmaker() -> sessionmaker:
+    return sessionmaker(bind=get_sync_engine())
+
+
+def __getattr__(name: str):
+    if name == "sync_engine":
+        return get_sync_engine()
+    if name == "Session":
+        return _sync_sessionmaker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class Base(DeclarativeBase):
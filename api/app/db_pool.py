@@ -0,0 +1,61 @@
+"""Connection pools that record how long checkouts wait, for pool sizing.
+
+The pools behave exactly like SQLAlchemy's ``QueuePool`` /
+``AsyncAdaptedQueuePool``; they additionally time every checkout (waiting for
+a free connection, or opening a new one) and count checkouts that gave up after
+``pool_timeout``. `pool_status` combines those with the pool's live counters
+for ``GET /internal/pool``. Values are per worker process.
+"""
+
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from api.app import metrics
+
+_checked_out = metrics.gauge("db.pool.checked_out")
+_checkout_wait = metrics.timer("db.pool.checkout_wait")
+_timeouts = metrics.counter("db.pool.timeouts")
+
+
+class _InstrumentedPoolMixin:
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            _timeouts.inc()
+            raise
+        finally:
+            _checkout_wait.observe(time.perf_counter() - start)
+        _checked_out.inc()
+        return record
+
+    def _do_return_conn(self, record) -> None:
+        _checked_out.dec()
+        super()._do_return_conn(record)
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_status(pool: QueuePool) -> dict:
+    """Live state of `pool` plus the process-wide checkout metrics."""
+    return {
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "timeout_seconds": pool.timeout(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        # Negative until the pool has opened `size` connections
+        "overflow": max(0, pool.overflow()),
+        "peak_checked_out": _checked_out.peak,
+        "checkout_wait": _checkout_wait.snapshot(),
+        "timeouts": _timeouts.snapshot(),
+    }
@@ -4,6 +4,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.app.database import AsyncSessionLocal
 
+# Session.info key under which get_current_user records who the request acts for
+SESSION_USER_KEY = "user_id"
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Yield an async database session and ensure it is closed afterwards."""
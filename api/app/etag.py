@@ -0,0 +1,87 @@
+"""Group versions and weak ETags for conditional GETs on group-scoped reads.
+
+Every write to a group's expenses, debts or members bumps `groups.version` in
+the same transaction. Read endpoints derive a weak ETag from that version, so a
+poll carrying a matching ``If-None-Match`` is answered with ``304`` after a
+single indexed lookup instead of the full query and serialization.
+"""
+
+import uuid
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import exists, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.app.models.group import Group
+from api.app.models.group_member import GroupMember
+
+
+def bump_group_version(group_id: uuid.UUID):
+    """Return the UPDATE that invalidates every cached read of a group."""
+    return update(Group).where(Group.id == group_id).values(version=Group.version + 1)
+
+
+def group_etag(group_id: uuid.UUID, version: int) -> str:
+    """Build the weak ETag for a group at `version`."""
+    return f'W/"{group_id}.{version}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of `etag` against an ``If-None-Match`` header value."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(",")
+    )
+
+
+async def load_group_state(
+    db: AsyncSession, group_id: uuid.UUID, user_id: uuid.UUID
+) -> tuple[str, bool]:
+    """Return the group's current ETag and whether it is archived.
+
+    Existence and membership are checked in the same query. Archiving and
+    restoring do not change what the group reads as, so the ETag is valid either
+    way; callers restore an archived group only once a full response is needed.
+    """
+    is_member = (
+        exists()
+        .where(GroupMember.group_id == Group.id, GroupMember.user_id == user_id)
+        .label("is_member")
+    )
+    result = await db.execute(
+        select(Group.version, Group.archived_at, is_member).where(Group.id == group_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+    if not row.is_member:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="You are not a member of this group"
+        )
+    return group_etag(group_id, row.version), row.archived_at is not None
+
+
+async def load_group_etag(db: AsyncSession, group_id: uuid.UUID, user_id: uuid.UUID) -> str:
+    """Return the group's current ETag, checking existence and membership in one query."""
+    etag, _ = await load_group_state(db, group_id, user_id)
+    return etag
+
+
+def not_modified(etag: str) -> Response:
+    """Build the empty ``304 Not Modified`` response for a matching ETag."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_cache_headers(etag))
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """Attach the ETag (and revalidation policy) to a full response."""
+    response.headers.update(_cache_headers(etag))
+
+
+def _cache_headers(etag: str) -> dict[str, str]:
+    # Responses are per-user, so shared caches must not store them, and clients
+    # must revalidate on every poll.
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
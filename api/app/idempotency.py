@@ -0,0 +1,170 @@
+"""Idempotency keys for retried writes.
+
+Clients send an ``Idempotency-Key`` header on a write. The first request stores
+its response in `idempotency_keys` in the same transaction as the write itself;
+any retry with the same key is answered from that record (or from an in-process
+LRU in front of it) without touching the tables the write changed.
+"""
+
+import hashlib
+import uuid
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.app.cache import TTLCache
+from api.app.models.idempotency_key import IdempotencyKey
+from api.app.variables import MyVariables
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    request_hash: str
+    status_code: int
+    body: Any
+    expires_at: datetime
+
+
+_cache = TTLCache(
+    maxsize=MyVariables.idempotency_cache_size,
+    ttl=MyVariables.idempotency_key_ttl_hours * 3600,
+)
+
+
+def request_fingerprint(method: str, path: str, body: BaseModel | None = None) -> str:
+    """Hash what identifies a request, so a reused key with a different request is caught."""
+    digest = hashlib.sha256(f"{method} {path}\n".encode())
+    if body is not None:
+        digest.update(body.model_dump_json().encode())
+    return digest.hexdigest()
+
+
+def _replay(stored: StoredResponse, request_hash: str) -> JSONResponse:
+    if stored.request_hash != request_hash:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used for a different request",
+        )
+    return JSONResponse(
+        content=stored.body, status_code=stored.status_code, headers={REPLAYED_HEADER: "true"}
+    )
+
+
+def _remember(user_id: uuid.UUID, key: str, stored: StoredResponse) -> None:
+    ttl = (stored.expires_at - datetime.now(UTC)).total_seconds()
+    _cache.set((user_id, key), stored, ttl=ttl)
+
+
+async def find_replay(
+    db: AsyncSession, user_id: uuid.UUID, key: str | None, request_hash: str
+) -> JSONResponse | None:
+    """Return the stored response for a retried request, or None for a new one."""
+    if key is None:
+        return None
+
+    stored = _cache.get((user_id, key))
+    if stored is None:
+        result = await db.execute(
+            select(IdempotencyKey).where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.key == key,
+                IdempotencyKey.expires_at > datetime.now(UTC),
+            )
+        )
+        record = result.scalar_one_or_none()
+        if record is None:
+            return None
+        expires_at = record.expires_at
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=UTC)
+        stored = StoredResponse(
+            record.request_hash, record.status_code, record.response_body, expires_at
+        )
+        _remember(user_id, key, stored)
+    return _replay(stored, request_hash)
+
+
+async def commit_with_key(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    key: str | None,
+    request_hash: str,
+    status_code: int,
+    response: BaseModel,
+) -> JSONResponse | None:
+    """Commit the pending write together with its idempotency record.
+
+    Returns None when the write was committed. If a concurrent request with the
+    same key committed first, the write is rolled back and that request's
+    response is returned instead.
+    """
+    if key is None:
+        await db.commit()
+        return None
+
+    now = datetime.now(UTC)
+    stored = StoredResponse(
+        request_hash,
+        status_code,
+        jsonable_encoder(response),
+        now + timedelta(hours=MyVariables.idempotency_key_ttl_hours),
+    )
+    # An expired record for this key may still be waiting for the sweep; drop it
+    # so the new one does not collide with it on the primary key.
+    await db.execute(
+        delete(IdempotencyKey).where(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.expires_at <= now,
+        )
+    )
+    db.add(
+        IdempotencyKey(
+            user_id=user_id,
+            key=key,
+            request_hash=stored.request_hash,
+            status_code=stored.status_code,
+            response_body=stored.body,
+            expires_at=stored.expires_at,
+        )
+    )
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        replay = await find_replay(db, user_id, key, request_hash)
+        if replay is None:
+            raise
+        return replay
+    _remember(user_id, key, stored)
+    return None
+
+
+async def sweep_expired_keys(db: AsyncSession, batch_size: int = 1000) -> int:
+    """Delete expired keys in batches, committing after each one. Returns rows deleted."""
+    deleted = 0
+    while True:
+        expired = (
+            select(IdempotencyKey.user_id, IdempotencyKey.key)
+            .where(IdempotencyKey.expires_at <= datetime.now(UTC))
+            .limit(batch_size)
+        )
+        result = await db.execute(
+            delete(IdempotencyKey).where(
+                tuple_(IdempotencyKey.user_id, IdempotencyKey.key).in_(expired)
+            )
+        )
+        await db.commit()
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted
@@ -0,0 +1,84 @@
+"""Invite-code resolution and the join-by-code statement.
+
+Invite links are opened in bursts when they are shared to a large chat, so the
+code -> group id mapping is cached per worker. Only codes that resolve are
+cached; guessing codes cannot fill the cache. Regenerating a code through
+`invalidate_invite_code` takes effect immediately in this process. Other
+workers may still have the old code cached; such a stale entry is detected and
+dropped when the group is loaded, so callers of `resolve_group_ref` must
+compare the loaded group's `invite_code` with the code they resolved.
+"""
+
+import uuid
+
+from sqlalchemy import literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.app import metrics
+from api.app.cache import TTLCache
+from api.app.models.group import Group
+from api.app.models.group_member import GroupMember
+from api.app.sql_compat import upsert_insert
+from api.app.variables import MyVariables
+
+_invite_code_cache = TTLCache(
+    maxsize=MyVariables.invite_code_cache_size, ttl=MyVariables.invite_code_cache_ttl_seconds
+)
+_invite_code_cache_hits = metrics.counter("invite_code_cache.hits")
+
+
+def remember_invite_code(code: str, group_id: uuid.UUID) -> None:
+    _invite_code_cache.set(code, group_id)
+
+
+def invalidate_invite_code(code: str) -> None:
+    """Forget `code`, e.g. after the group's invite code was regenerated."""
+    _invite_code_cache.pop(code)
+
+
+def parse_group_id(ref: str) -> uuid.UUID | None:
+    """`ref` as a group id, or None if it is not a UUID (i.e. an invite code)."""
+    try:
+        return uuid.UUID(ref)
+    except ValueError:
+        return None
+
+
+async def resolve_group_ref(db: AsyncSession, ref: str) -> uuid.UUID | None:
+    """Resolve a group id or invite code to the group id, or None if no group has that code.
+
+    A UUID is returned as-is without checking that the group exists. A cached
+    code may be stale; callers that load the group should compare its
+    `invite_code` with `ref`.
+    """
+    group_id = parse_group_id(ref)
+    if group_id is not None:
+        return group_id
+
+    group_id = _invite_code_cache.get(ref)
+    if group_id is not None:
+        _invite_code_cache_hits.inc()
+        return group_id
+    result = await db.execute(select(Group.id).where(Group.invite_code == ref))
+    group_id = result.scalar_one_or_none()
+    if group_id is not None:
+        remember_invite_code(ref, group_id)
+    return group_id
+
+
+def join_by_invite_code(db: AsyncSession, code: str, user_id: uuid.UUID):
+    """Return the INSERT ... SELECT adding `user_id` to the group whose invite code is `code`.
+
+    It resolves the code and creates the membership in one statement and returns
+    the group id only when a row was inserted: nothing comes back if the code is
+    unknown or the user already belongs to the group.
+    """
+    source = select(Group.id, literal(user_id, GroupMember.user_id.type)).where(
+        Group.invite_code == code
+    )
+    return (
+        upsert_insert(db, GroupMember)
+        .from_select(["group_id", "user_id"], source)
+        .on_conflict_do_nothing(index_elements=["group_id", "user_id"])
+        .returning(GroupMember.group_id)
+    )
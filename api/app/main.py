@@ -5,16 +5,16 @@ from fastapi.middleware.cors import CORSMiddleware
 
 # Import models so they are registered with Base.metadata
 import api.app.models  # noqa: F401
-from api.app.database import Base, engine
-from api.app.routers import auth, debts, expenses, groups, members
+from api.app.database import engine
+from api.app.routers import admin, analytics, auth, debts, expenses, groups, internal, members
+from api.app.startup import prepare_database
 from api.app.variables import MyVariables
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Create database tables on startup (dev convenience). Use Alembic in production."""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    """Prepare the database once per worker according to DB_STARTUP_MODE."""
+    await prepare_database(engine, MyVariables.db_startup_mode, MyVariables.db_startup_fail_fast)
     yield
 
 
@@ -33,6 +33,8 @@ app.add_middleware(
     allow_credentials=MyVariables.cors_credentials,
     allow_methods=MyVariables.cors_methods,
     allow_headers=MyVariables.cors_headers,
+    # Let browser clients read the revalidation and pagination headers
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 # Register routers
@@ -41,6 +43,10 @@ app.include_router(groups.router)
 app.include_router(members.router)
 app.include_router(expenses.router)
 app.include_router(debts.router)
+app.include_router(analytics.router)
+app.include_router(admin.router)
+if MyVariables.internal_endpoints_enabled:
+    app.include_router(internal.router)
 
 
 @app.get("/", tags=["Health"])
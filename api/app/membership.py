@@ -0,0 +1,95 @@
+"""Group-membership authorization shared by the group-scoped routers.
+
+Membership is checked with a single ``EXISTS`` query, memoized on the request's
+session and cached across requests for a short TTL. Only positive answers are
+cached, so a new member is let in immediately. Code that adds or removes members
+calls `invalidate_membership`; other workers may keep granting a removed member
+access for at most `MyVariables.membership_cache_ttl_seconds`.
+"""
+
+import uuid
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.app import metrics
+from api.app.auth import get_current_user
+from api.app.cache import TTLCache
+from api.app.dependencies import get_db
+from api.app.models.group import Group
+from api.app.models.group_member import GroupMember
+from api.app.models.user import User
+from api.app.variables import MyVariables
+
+_SESSION_MEMO_KEY = "group_membership"
+
+_membership_cache = TTLCache(
+    maxsize=MyVariables.membership_cache_size, ttl=MyVariables.membership_cache_ttl_seconds
+)
+_membership_cache_hits = metrics.counter("membership_cache.hits")
+
+
+def invalidate_membership(group_id: uuid.UUID, user_id: uuid.UUID) -> None:
+    """Forget the cached membership of `user_id` in `group_id`."""
+    _membership_cache.pop((user_id, group_id))
+
+
+async def is_group_member(db: AsyncSession, group_id: uuid.UUID, user_id: uuid.UUID) -> bool:
+    """Whether `user_id` belongs to `group_id`."""
+    key = (user_id, group_id)
+    memo = db.info.setdefault(_SESSION_MEMO_KEY, {})
+    if key in memo:
+        return memo[key]
+    if key in _membership_cache:
+        _membership_cache_hits.inc()
+        memo[key] = True
+        return True
+
+    result = await db.execute(
+        select(exists().where(GroupMember.group_id == group_id, GroupMember.user_id == user_id))
+    )
+    is_member = bool(result.scalar())
+    memo[key] = is_member
+    if is_member:
+        _membership_cache.set(key, True)
+    return is_member
+
+
+async def ensure_group_member(db: AsyncSession, group_id: uuid.UUID, user_id: uuid.UUID) -> None:
+    """Raise 403 unless `user_id` belongs to `group_id`."""
+    if not await is_group_member(db, group_id, user_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="You are not a member of this group"
+        )
+
+
+async def load_group_for_member(db: AsyncSession, group_id: uuid.UUID, user_id: uuid.UUID) -> Group:
+    """Load a group the user belongs to in one query: 404 if it is missing, 403 if not a member."""
+    is_member = (
+        exists()
+        .where(GroupMember.group_id == Group.id, GroupMember.user_id == user_id)
+        .label("is_member")
+    )
+    result = await db.execute(select(Group, is_member).where(Group.id == group_id))
+    row = result.one_or_none()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+
+    key = (user_id, group_id)
+    db.info.setdefault(_SESSION_MEMO_KEY, {})[key] = bool(row.is_member)
+    if not row.is_member:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="You are not a member of this group"
+        )
+    _membership_cache.set(key, True)
+    return row.Group
+
+
+async def require_group_member(
+    group_id: uuid.UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> None:
+    """Route dependency: the current user must belong to the ``{group_id}`` group."""
+    await ensure_group_member(db, group_id, current_user.id)
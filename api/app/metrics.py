@@ -0,0 +1,108 @@
+"""Minimal in-process metrics, exposed through ``GET /internal/metrics``.
+
+Values are per worker process. Counters keep one-second buckets for the last
+minute so a per-second rate can be reported without an external scraper.
+"""
+
+import time
+from collections import deque
+
+RATE_WINDOW_SECONDS = 60
+
+
+class Counter:
+    """A monotonically increasing count with a recent per-second rate."""
+
+    def __init__(self) -> None:
+        self.value = 0
+        self._buckets: deque[list[int]] = deque()
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+        second = int(time.monotonic())
+        if self._buckets and self._buckets[-1][0] == second:
+            self._buckets[-1][1] += amount
+        else:
+            self._buckets.append([second, amount])
+            self._trim(second)
+
+    def rate(self) -> float:
+        """Average increments per second over the last `RATE_WINDOW_SECONDS`."""
+        self._trim(int(time.monotonic()))
+        return sum(count for _, count in self._buckets) / RATE_WINDOW_SECONDS
+
+    def _trim(self, now: int) -> None:
+        while self._buckets and self._buckets[0][0] <= now - RATE_WINDOW_SECONDS:
+            self._buckets.popleft()
+
+    def snapshot(self) -> dict:
+        return {"total": self.value, "per_second": round(self.rate(), 3)}
+
+
+class Gauge:
+    """A value that goes up and down, remembering its peak."""
+
+    def __init__(self) -> None:
+        self.value = 0
+        self.peak = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+        self.peak = max(self.peak, self.value)
+
+    def dec(self, amount: int = 1) -> None:
+        self.value -= amount
+
+    def snapshot(self) -> dict:
+        return {"value": self.value, "peak": self.peak}
+
+
+class Timer:
+    """Count, total and maximum of observed durations (seconds)."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def snapshot(self) -> dict:
+        mean = self.total / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "mean_ms": round(mean * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+_registry: dict[str, Counter | Gauge | Timer] = {}
+
+
+def _get_or_create(name: str, kind: type):
+    metric = _registry.get(name)
+    if metric is None:
+        metric = _registry[name] = kind()
+    if not isinstance(metric, kind):
+        raise TypeError(f"Metric '{name}' is already registered as {type(metric).__name__}")
+    return metric
+
+
+def counter(name: str) -> Counter:
+    return _get_or_create(name, Counter)
+
+
+def gauge(name: str) -> Gauge:
+    return _get_or_create(name, Gauge)
+
+
+def timer(name: str) -> Timer:
+    return _get_or_create(name, Timer)
+
+
+def snapshot() -> dict[str, dict]:
+    """Current value of every registered metric, keyed by name."""
+    return {name: metric.snapshot() for name, metric in sorted(_registry.items())}
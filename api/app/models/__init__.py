@@ -2,7 +2,22 @@
 from api.app.models.expense import Expense
 from api.app.models.expense_share import ExpenseShare
 from api.app.models.group import Group
+from api.app.models.group_archive import GroupArchive, GroupArchiveExpense
 from api.app.models.group_member import GroupMember
+from api.app.models.group_spending_rollup import GroupSpendingRollup
+from api.app.models.idempotency_key import IdempotencyKey
 from api.app.models.user import User
+from api.app.models.user_spending_rollup import UserSpendingRollup
 
-__all__ = ["User", "Group", "GroupMember", "Expense", "ExpenseShare"]
+__all__ = [
+    "User",
+    "Group",
+    "GroupMember",
+    "Expense",
+    "ExpenseShare",
+    "GroupSpendingRollup",
+    "UserSpendingRollup",
+    "IdempotencyKey",
+    "GroupArchive",
+    "GroupArchiveExpense",
+]
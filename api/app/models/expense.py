@@ -1,11 +1,14 @@
 import uuid
 
 from sqlalchemy import (
+    DDL,
     TIMESTAMP,
     Column,
     ForeignKey,
+    Index,
     Numeric,
     String,
+    event,
     text,
 )
 from sqlalchemy.dialects.postgresql import UUID
@@ -35,3 +38,26 @@ class Expense(Base):
     created_at = Column(
         TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"), nullable=False
     )
+
+    __table_args__ = (
+        # Default listing: a group's expenses newest first.
+        Index("ix_expenses_group_id_date", "group_id", "date"),
+        # Filtered listing: category equality plus a date range within a group.
+        Index("ix_expenses_group_id_category_date", "group_id", "category", "date"),
+        # Substring search on descriptions (ILIKE '%...%'); needs pg_trgm.
+        Index(
+            "ix_expenses_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+    )
+
+
+# create_all needs the extension behind gin_trgm_ops too (migration 8f3a1d6c2b94
+# creates it for migrated databases).
+event.listen(
+    Expense.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
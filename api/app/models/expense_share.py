@@ -4,7 +4,9 @@ from sqlalchemy import (
     Column,
     Enum,
     ForeignKey,
+    Index,
     Numeric,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -19,7 +21,10 @@ class ExpenseShare(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
     expense_id = Column(
-        UUID(as_uuid=True), ForeignKey("expenses.id", ondelete="CASCADE"), nullable=False
+        UUID(as_uuid=True),
+        ForeignKey("expenses.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     debtor_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     creditor_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -33,3 +38,19 @@ class ExpenseShare(Base):
         nullable=False,
         default="pending",
     )
+
+    __table_args__ = (
+        # A single user's pending shares, for per-user balances
+        Index(
+            "ix_expense_shares_debtor_id_pending",
+            "debtor_id",
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+        Index(
+            "ix_expense_shares_creditor_id_pending",
+            "creditor_id",
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+    )
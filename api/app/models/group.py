@@ -7,6 +7,7 @@ from sqlalchemy import (
     Boolean,
     Column,
     ForeignKey,
+    Integer,
     String,
     text,
 )
@@ -15,7 +16,7 @@ from sqlalchemy.dialects.postgresql import UUID
 from api.app.database import Base
 
 
-def _generate_invite_code(length: int = 8) -> str:
+def generate_invite_code(length: int = 8) -> str:
     """Generate a random alphanumeric invite code."""
     alphabet = string.ascii_uppercase + string.digits
     return "".join(secrets.choice(alphabet) for _ in range(length))
@@ -31,10 +32,18 @@ class Group(Base):
     currency_code = Column(String(10), nullable=False, default="USD")
     cover_image = Column(String(500), nullable=True)
     invite_code = Column(
-        String(20), unique=True, nullable=False, default=_generate_invite_code, index=True
+        String(20), unique=True, nullable=False, default=generate_invite_code, index=True
     )
 
-    debt_simplification = Column(Boolean, nullable=False, default=False, server_default=text("false"))
+    debt_simplification = Column(
+        Boolean, nullable=False, default=False, server_default=text("false")
+    )
+
+    # Bumped on every write to the group's members, expenses or debts (ETags)
+    version = Column(Integer, nullable=False, default=1, server_default=text("1"))
+
+    # Set while the group's expenses live in group_archives (see api/app/archival.py)
+    archived_at = Column(TIMESTAMP(timezone=True), nullable=True)
 
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
 
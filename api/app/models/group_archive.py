@@ -0,0 +1,46 @@
+from sqlalchemy import (
+    TIMESTAMP,
+    Column,
+    ForeignKey,
+    Integer,
+    LargeBinary,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+
+from api.app.database import Base
+
+
+class GroupArchive(Base):
+    """A settled, idle group's expenses and shares, moved out of the hot tables."""
+
+    __tablename__ = "group_archives"
+
+    group_id = Column(
+        UUID(as_uuid=True), ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True
+    )
+
+    # gzip-compressed JSON document; see api/app/archival.py for the format
+    payload = Column(LargeBinary, nullable=False)
+
+    # Kept out of the payload so summaries need not decompress it
+    expense_count = Column(Integer, nullable=False)
+    last_activity_at = Column(TIMESTAMP(timezone=True), nullable=False)
+
+    archived_at = Column(
+        TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"), nullable=False
+    )
+
+
+class GroupArchiveExpense(Base):
+    """Which archive holds an expense, so it can be found without decompressing payloads."""
+
+    __tablename__ = "group_archive_expenses"
+
+    expense_id = Column(UUID(as_uuid=True), primary_key=True)
+    group_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("group_archives.group_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
@@ -4,6 +4,7 @@ from sqlalchemy import (
     TIMESTAMP,
     Column,
     ForeignKey,
+    Index,
     UniqueConstraint,
     text,
 )
@@ -26,4 +27,9 @@ class GroupMember(Base):
         TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"), nullable=False
     )
 
-    __table_args__ = (UniqueConstraint("group_id", "user_id", name="uq_group_user"),)
+    __table_args__ = (
+        UniqueConstraint("group_id", "user_id", name="uq_group_user"),
+        # Keyset pagination of a group's members and of a user's groups
+        Index("ix_group_members_group_id_joined_at", "group_id", "joined_at"),
+        Index("ix_group_members_user_id", "user_id"),
+    )
@@ -0,0 +1,34 @@
+from sqlalchemy import (
+    JSON,
+    TIMESTAMP,
+    Column,
+    ForeignKey,
+    Integer,
+    String,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+
+from api.app.database import Base
+
+
+class IdempotencyKey(Base):
+    """The stored outcome of a write made with an ``Idempotency-Key`` header."""
+
+    __tablename__ = "idempotency_keys"
+
+    # Keys are chosen by clients, so they are only unique per user
+    user_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    key = Column(String(255), primary_key=True)
+
+    # SHA-256 of the method, path and body of the original request
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=False)
+    response_body = Column(JSON, nullable=False)
+
+    created_at = Column(
+        TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"), nullable=False
+    )
+    expires_at = Column(TIMESTAMP(timezone=True), nullable=False, index=True)
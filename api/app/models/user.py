@@ -3,6 +3,7 @@ import uuid
 from sqlalchemy import (
     TIMESTAMP,
     Column,
+    Integer,
     String,
     text,
 )
@@ -19,6 +20,10 @@ class User(Base):
     name = Column(String(255), nullable=False)
     email = Column(String(255), unique=True, nullable=False, index=True)
     password_hash = Column(String(255), nullable=False)
+    # Tokens carrying an older version are rejected; bumped to revoke all sessions.
+    token_version = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    # When token_version was last bumped; older revocations only cover expired tokens.
+    tokens_revoked_at = Column(TIMESTAMP(timezone=True), nullable=True, index=True)
 
     created_at = Column(
         TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"), nullable=False
@@ -0,0 +1,28 @@
+from sqlalchemy import (
+    Column,
+    Date,
+    ForeignKey,
+    Numeric,
+    String,
+)
+from sqlalchemy.dialects.postgresql import UUID
+
+from api.app.database import Base
+
+
+class UserSpendingRollup(Base):
+    """A user's share of a group's spending per category and calendar month (UTC)."""
+
+    __tablename__ = "user_spending_rollups"
+
+    group_id = Column(
+        UUID(as_uuid=True), ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True
+    )
+    user_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    category = Column(String(100), primary_key=True)
+    # First day of the month the expenses are dated in
+    month = Column(Date, primary_key=True)
+
+    total = Column(Numeric(14, 2), nullable=False, default=0)
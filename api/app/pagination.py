@@ -0,0 +1,65 @@
+"""Keyset pagination and field trimming for list endpoints.
+
+Pages are ordered by a timestamp with the row id as tie-breaker. The cursor is
+the id of the last row of the previous page; the next page starts strictly
+after that row's ``(timestamp, id)``, which the database resolves from the id in
+a subquery, so no offset is scanned and rows inserted meanwhile are neither
+skipped nor repeated. When more rows follow, the id to pass as ``cursor`` is
+returned in the ``X-Next-Cursor`` header, keeping the body a plain list.
+
+``fields`` is a comma-separated subset of the item's fields; only those columns
+are selected and serialized.
+"""
+
+import uuid
+from collections.abc import Iterable, Mapping, Sequence
+
+from fastapi import HTTPException, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import and_, or_, select
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def after_cursor(timestamp, row_id, cursor: uuid.UUID, descending: bool = False):
+    """Criterion for rows strictly after the row `cursor` in ``(timestamp, id)`` order.
+
+    A cursor that matches no row compares against NULL and yields an empty page.
+    """
+    anchor = select(timestamp).where(row_id == cursor).scalar_subquery()
+    if descending:
+        return or_(timestamp < anchor, and_(timestamp == anchor, row_id < cursor))
+    return or_(timestamp > anchor, and_(timestamp == anchor, row_id > cursor))
+
+
+def parse_fields(fields: str | None, allowed: Iterable[str]) -> list[str] | None:
+    """Validate a ``fields`` query value; None means every field."""
+    if fields is None:
+        return None
+    requested = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in requested if f not in allowed]
+    if not requested or unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}" if unknown else "No fields requested",
+        )
+    return requested
+
+
+def paginate(rows: Sequence, limit: int, response: Response, cursor_of) -> Sequence:
+    """Trim the extra row fetched past `limit` and advertise the next cursor if there was one.
+
+    The query must fetch ``limit + 1`` rows; `cursor_of` returns a row's id.
+    """
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = str(cursor_of(rows[-1]))
+    return rows
+
+
+def trimmed_response(items: Iterable[Mapping], fields: list[str], response: Response) -> Response:
+    """Serialize only `fields` of each item, keeping the headers already set on `response`."""
+    headers = {k: v for k, v in response.headers.items() if k.lower() != "content-length"}
+    content = [{f: item[f] for f in fields} for item in items]
+    return JSONResponse(jsonable_encoder(content), headers=headers)
@@ -0,0 +1,244 @@
+"""Password hashing and verification.
+
+bcrypt is deliberately slow (hundreds of milliseconds per call), so request
+handlers must not run it on the event loop. The async helpers hand the work to
+a dedicated, bounded thread pool (bcrypt releases the GIL while hashing) and
+shed load with `PasswordHasherBusyError` once too many calls are waiting.
+
+passlib and multiprocessing are imported on first use, keeping them out of the
+API's start-up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from api.app import metrics
+from api.app.variables import MyVariables
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+    from passlib.context import CryptContext
+
+
+def build_context(scheme: str, rounds: int | None = None) -> CryptContext:
+    """Hash with `scheme` at `rounds`, flagging weaker or other-scheme hashes for update.
+
+    bcrypt stays verifiable (as a deprecated scheme) so existing hashes keep
+    working after the scheme changes.
+    """
+    from passlib.context import CryptContext
+
+    schemes = [scheme] if scheme == "bcrypt" else [scheme, "bcrypt"]
+    settings = {}
+    if rounds is not None:
+        settings[f"{scheme}__default_rounds"] = rounds
+        settings[f"{scheme}__min_rounds"] = rounds
+    return CryptContext(schemes=schemes, deprecated="auto", **settings)
+
+
+# Context installed with `set_context`, used instead of the configured one
+_context_override: CryptContext | None = None
+
+
+@lru_cache(maxsize=1)
+def get_context() -> CryptContext:
+    """The CryptContext used for hashing and verification, built on first use."""
+    if _context_override is not None:
+        return _context_override
+    return build_context(MyVariables.password_hash_scheme, MyVariables.password_hash_rounds)
+
+
+def set_context(context: CryptContext | None) -> None:
+    """Hash and verify with `context` from now on; None restores the configured one."""
+    global _context_override
+    _context_override = context
+    get_context.cache_clear()
+
+
+def hash_password(plain: str) -> str:
+    """Hash a plaintext password with the configured scheme."""
+    return get_context().hash(plain)
+
+
+def verify_password(plain: str, hashed: str) -> bool:
+    """Verify a plaintext password against a stored hash."""
+    return get_context().verify(plain, hashed)
+
+
+def hash_passwords(plains: list[str]) -> list[str]:
+    """Hash a batch of passwords in the calling process, preserving order."""
+    return [hash_password(plain) for plain in plains]
+
+
+def verify_and_update_password(plain: str, hashed: str) -> tuple[bool, str | None]:
+    """Verify a password; also return a new hash if the stored one is below policy."""
+    return get_context().verify_and_update(plain, hashed)
+
+
+class PasswordHasherBusyError(Exception):
+    """Raised when the hashing pool's queue is full."""
+
+
+class PasswordHashPool:
+    """A bounded worker pool for CPU-heavy password hashing calls.
+
+    At most `workers` calls run at once and at most `max_queue` more wait for a
+    worker; further calls are rejected immediately instead of piling up.
+    """
+
+    def __init__(self, workers: int, max_queue: int) -> None:
+        self.workers = workers
+        self.max_pending = workers + max_queue
+        self.pending = 0
+        self._executor: ThreadPoolExecutor | None = None
+        self._in_flight = metrics.gauge("password_hash.in_flight")
+        self._rejected = metrics.counter("password_hash.rejected")
+        self._queue_wait = metrics.timer("password_hash.queue_wait")
+        self._duration = metrics.timer("password_hash.duration")
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password-hash"
+            )
+        return self._executor
+
+    def _timed(self, submitted_at: float, fn, *args):
+        started = time.perf_counter()
+        self._queue_wait.observe(started - submitted_at)
+        try:
+            return fn(*args)
+        finally:
+            self._duration.observe(time.perf_counter() - started)
+
+    def _reserve(self, calls: int) -> None:
+        if self.pending + calls > self.max_pending:
+            self._rejected.inc()
+            raise PasswordHasherBusyError("Too many password hashing requests in progress")
+        self.pending += calls
+        self._in_flight.inc(calls)
+
+    def _release(self, calls: int) -> None:
+        self.pending -= calls
+        self._in_flight.dec(calls)
+
+    async def run(self, fn, *args):
+        """Run `fn(*args)` on a pool worker, or raise if the queue is full."""
+        self._reserve(1)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(), self._timed, time.perf_counter(), fn, *args
+            )
+        finally:
+            self._release(1)
+
+    async def map_on(
+        self, executor: Executor, fn, args_list: list[tuple], slots: int | None = None
+    ) -> list:
+        """Run `fn(*args)` for each entry of `args_list` on another executor.
+
+        The calls hold `slots` places in this pool's queue (one per call by
+        default) and count in its metrics: all of them are admitted together, or
+        `PasswordHasherBusyError` is raised.
+        """
+        slots = len(args_list) if slots is None else slots
+        self._reserve(slots)
+        try:
+            loop = asyncio.get_running_loop()
+            outcomes = await asyncio.gather(
+                *(
+                    loop.run_in_executor(executor, _timed_call, time.perf_counter(), fn, *args)
+                    for args in args_list
+                )
+            )
+        finally:
+            self._release(slots)
+        for _, queue_wait, duration in outcomes:
+            self._queue_wait.observe(queue_wait)
+            self._duration.observe(duration)
+        return [result for result, _, _ in outcomes]
+
+
+def _timed_call(submitted_at: float, fn, *args) -> tuple:
+    """Return `fn(*args)` with its queue wait and duration, measured where it ran.
+
+    Module-level so it can be sent to a process pool; `perf_counter` is a
+    system-wide monotonic clock, so `submitted_at` from the parent is comparable.
+    """
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, started - submitted_at, time.perf_counter() - started
+
+
+hash_pool = PasswordHashPool(
+    workers=MyVariables.password_hash_workers,
+    max_queue=MyVariables.password_hash_max_queue,
+)
+
+
+async def hash_password_async(plain: str) -> str:
+    """Hash a password on the hashing pool."""
+    return await hash_pool.run(hash_password, plain)
+
+
+async def verify_and_update_password_async(plain: str, hashed: str) -> tuple[bool, str | None]:
+    """Verify a password on the hashing pool, returning a replacement hash if needed."""
+    return await hash_pool.run(verify_and_update_password, plain, hashed)
+
+
+# Below this many passwords, process start-up and pickling cost more than they save.
+BULK_HASH_MIN_PROCESS_BATCH = 16
+# Passwords per process-pool task; each one holds a queue slot while it waits.
+BULK_HASH_CHUNK_SIZE = 8
+
+_process_pool: ProcessPoolExecutor | None = None
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        # spawn, not fork: the parent runs an event loop and worker threads
+        _process_pool = ProcessPoolExecutor(
+            max_workers=MyVariables.bulk_hash_processes,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _process_pool
+
+
+async def hash_passwords_bulk(plains: list[str]) -> list[str]:
+    """Hash many passwords across a process pool, preserving order.
+
+    Every password holds one slot in `hash_pool`'s queue while it is hashed, and
+    the batch is admitted in waves of at most half the queue, so a large import
+    leaves room for logins and is shed with `PasswordHasherBusyError` like any
+    other hashing call. Small batches go through the regular hashing threads.
+    """
+    wave = max(hash_pool.max_pending // 2, 1)
+    if len(plains) < BULK_HASH_MIN_PROCESS_BATCH:
+        executor, size = hash_pool._get_executor(), 1
+    else:
+        executor = _get_process_pool()
+        # Enough chunks per wave to keep every process busy.
+        per_process = wave // max(MyVariables.bulk_hash_processes, 1)
+        size = max(min(BULK_HASH_CHUNK_SIZE, per_process), 1)
+    chunks = [plains[i : i + size] for i in range(0, len(plains), size)]
+    per_wave = max(wave // size, 1)
+
+    hashed: list[str] = []
+    for start in range(0, len(chunks), per_wave):
+        batch = chunks[start : start + per_wave]
+        results = await hash_pool.map_on(
+            executor, hash_passwords, [(chunk,) for chunk in batch], slots=sum(map(len, batch))
+        )
+        hashed.extend(value for chunk in results for value in chunk)
+    return hashed
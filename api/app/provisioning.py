@@ -0,0 +1,98 @@
+"""Bulk user provisioning for organization onboarding.
+
+Used by ``POST /admin/users/bulk`` and ``scripts/provision_users.py``. A batch
+costs a fixed number of statements however many users it holds: one ``IN``
+query for emails that already exist, one multi-row INSERT for the new users and,
+optionally, one multi-row INSERT of group memberships, all in the caller's
+transaction. Passwords are hashed across a process pool beforehand.
+"""
+
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.app.etag import bump_group_version
+from api.app.models.group import Group
+from api.app.models.group_member import GroupMember
+from api.app.models.user import User
+from api.app.passwords import hash_passwords_bulk
+from api.app.sql_compat import upsert_insert
+
+
+class GroupNotFoundError(Exception):
+    """Raised when the group to add provisioned users to does not exist."""
+
+
+@dataclass(frozen=True)
+class NewUser:
+    name: str
+    email: str
+    password: str
+
+
+@dataclass
+class ProvisionResult:
+    created: list = field(default_factory=list)
+    existing_emails: list[str] = field(default_factory=list)
+    added_to_group: int = 0
+
+
+async def provision_users(
+    db: AsyncSession, users: Iterable[NewUser], group_id: uuid.UUID | None = None
+) -> ProvisionResult:
+    """Create the users whose emails are not taken yet; the caller commits.
+
+    Emails already registered are skipped and reported; an email repeated
+    within the batch is created once, from its first entry. With `group_id`,
+    every user in the batch, new or existing, is made a member of that group.
+    """
+    if group_id is not None and await db.get(Group, group_id) is None:
+        raise GroupNotFoundError(str(group_id))
+
+    unique: dict[str, NewUser] = {}
+    for user in users:
+        unique.setdefault(user.email, user)
+
+    result = ProvisionResult()
+    member_ids: list[uuid.UUID] = []
+    if unique:
+        existing = await db.execute(select(User.id, User.email).where(User.email.in_(list(unique))))
+        for row in existing.all():
+            result.existing_emails.append(row.email)
+            member_ids.append(row.id)
+            del unique[row.email]
+
+    if unique:
+        hashes = await hash_passwords_bulk([user.password for user in unique.values()])
+        rows = [
+            {"id": uuid.uuid4(), "name": user.name, "email": user.email, "password_hash": hashed}
+            for user, hashed in zip(unique.values(), hashes, strict=True)
+        ]
+        # A concurrent registration may take an email after the check above;
+        # such rows are skipped rather than failing the whole batch.
+        inserted = await db.execute(
+            upsert_insert(db, User)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["email"])
+            .returning(User.id, User.name, User.email, User.created_at)
+        )
+        result.created = inserted.all()
+        created_emails = {row.email for row in result.created}
+        result.existing_emails.extend(e for e in unique if e not in created_emails)
+        member_ids.extend(row.id for row in result.created)
+
+    if group_id is not None and member_ids:
+        added = await db.execute(
+            upsert_insert(db, GroupMember)
+            .values([{"group_id": group_id, "user_id": user_id} for user_id in member_ids])
+            .on_conflict_do_nothing(index_elements=["group_id", "user_id"])
+            .returning(GroupMember.id)
+        )
+        result.added_to_group = len(added.all())
+        if result.added_to_group:
+            await db.execute(bump_group_version(group_id))
+
+    return result
@@ -0,0 +1,123 @@
+"""Token-bucket rate limiting for abuse-prone endpoints.
+
+A bucket holds up to `capacity` tokens and refills continuously at `refill_rate`
+tokens per second; each attempt takes one token and is rejected when none is
+left. Checks are a dictionary lookup and a little arithmetic, so they can run
+before any database or hashing work. Buckets live in a pluggable store; the
+default keeps them in process memory, so each worker limits independently.
+
+Limits keyed on the client IP need the real client address; behind a reverse
+proxy that comes from X-Forwarded-For, trusted only when the connecting peer is
+one of ``TRUSTED_PROXIES``.
+"""
+
+import ipaddress
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Protocol
+
+from api.app import metrics
+from api.app.variables import MyVariables
+
+
+class BucketStore(Protocol):
+    def take(self, key: Hashable, capacity: float, refill_rate: float, now: float) -> float:
+        """Take a token from `key`'s bucket; return 0 on success, else seconds until one is free."""
+        ...
+
+    def clear(self) -> None: ...
+
+
+class MemoryBucketStore:
+    """Buckets in a bounded LRU dict; the least recently used key is forgotten first."""
+
+    def __init__(self, maxsize: int = 100_000) -> None:
+        self.maxsize = maxsize
+        self._buckets: OrderedDict[Hashable, tuple[float, float]] = OrderedDict()
+
+    def take(self, key: Hashable, capacity: float, refill_rate: float, now: float) -> float:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tokens = capacity
+        else:
+            tokens, updated_at = bucket
+            tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+            self._buckets.move_to_end(key)
+
+        allowed = tokens >= 1
+        self._buckets[key] = (tokens - 1 if allowed else tokens, now)
+        if len(self._buckets) > self.maxsize:
+            self._buckets.popitem(last=False)
+        return 0.0 if allowed else (1 - tokens) / refill_rate
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+class TokenBucketLimiter:
+    """Allow `capacity` attempts in a burst per key, refilled at `per_minute`."""
+
+    def __init__(
+        self, name: str, capacity: int, per_minute: float, store: BucketStore | None = None
+    ) -> None:
+        self.capacity = capacity
+        self.refill_rate = per_minute / 60
+        self.store = store if store is not None else MemoryBucketStore()
+        self._rejected = metrics.counter(f"rate_limit.{name}.rejected")
+
+    def check(self, key: Hashable) -> float:
+        """Consume an attempt for `key`; return 0 if allowed, else the Retry-After in seconds."""
+        retry_after = self.store.take(key, self.capacity, self.refill_rate, time.monotonic())
+        if retry_after:
+            self._rejected.inc()
+        return retry_after
+
+    def reset(self) -> None:
+        self.store.clear()
+
+
+def _parse_networks(entries: list[str]) -> list[ipaddress.IPv4Network | ipaddress.IPv6Network]:
+    return [ipaddress.ip_network(entry, strict=False) for entry in entries]
+
+
+_trusted_proxies = _parse_networks(MyVariables.trusted_proxies)
+
+
+def _is_trusted(address: str, proxies) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in proxies)
+
+
+def client_ip(peer: str | None, forwarded_for: str | None, proxies=None) -> str:
+    """The client address of a request whose connecting address is `peer`.
+
+    When `peer` is a trusted proxy, `forwarded_for` is read from the right and the
+    first address that is not a trusted proxy is the client. Otherwise the header
+    is ignored, since any client can send one.
+    """
+    proxies = _trusted_proxies if proxies is None else proxies
+    if peer is None:
+        return "unknown"
+    if not forwarded_for or not _is_trusted(peer, proxies):
+        return peer
+    hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted(hop, proxies):
+            return hop
+    return hops[0] if hops else peer
+
+
+login_ip_limiter = TokenBucketLimiter(
+    "login_ip",
+    capacity=MyVariables.login_rate_limit_ip_burst,
+    per_minute=MyVariables.login_rate_limit_ip_per_minute,
+)
+login_email_limiter = TokenBucketLimiter(
+    "login_email",
+    capacity=MyVariables.login_rate_limit_email_burst,
+    per_minute=MyVariables.login_rate_limit_email_per_minute,
+)
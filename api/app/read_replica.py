@@ -0,0 +1,109 @@
+"""Read-replica routing for read-only endpoints.
+
+`get_read_db` is a drop-in replacement for `get_db` on endpoints that only
+read. When ``REPLICA_DATABASE_URL`` is set it yields a `RoutingSession`: SELECTs
+go to the replica; anything else (a flush, INSERT/UPDATE/DELETE, e.g. restoring
+an archived group) goes to the primary and pins the rest of the session there,
+so a request reads its own writes.
+
+A user who committed a write within ``REPLICA_FRESHNESS_SECONDS`` reads through
+the request's primary session instead, so they never see the replica lag behind
+their own changes.
+Writes are tracked per worker process; without sticky sessions another worker
+may serve the next read from the replica. Without a replica URL `get_read_db`
+simply shares the request's primary session.
+"""
+
+import uuid
+from collections.abc import AsyncGenerator
+
+from fastapi import Depends
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from api.app import metrics
+from api.app.auth import get_current_user
+from api.app.cache import TTLCache
+from api.app.database import engine, replica_engine
+from api.app.dependencies import SESSION_USER_KEY, get_db
+from api.app.models.user import User
+from api.app.variables import MyVariables
+
+# Session.info flag: route every statement of this session to the primary
+USE_PRIMARY_KEY = "use_primary"
+
+_recent_writers = TTLCache(maxsize=100_000, ttl=MyVariables.replica_freshness_seconds)
+_replica_reads = metrics.counter("db.read_sessions.replica")
+_primary_reads = metrics.counter("db.read_sessions.primary")
+
+
+class RoutingSession(Session):
+    """A session that sends plain reads to `replica` and everything else to `primary`."""
+
+    def __init__(self, *, primary, replica, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._primary = primary
+        self._replica = replica
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.info.get(USE_PRIMARY_KEY) or self._flushing:
+            return self._primary
+        if getattr(clause, "is_select", False):
+            return self._replica
+        self.info[USE_PRIMARY_KEY] = True
+        return self._primary
+
+
+ReadSessionLocal = (
+    async_sessionmaker(
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        primary=engine.sync_engine,
+        replica=replica_engine.sync_engine,
+        expire_on_commit=False,
+    )
+    if replica_engine is not None
+    else None
+)
+
+
+def mark_recent_write(user_id: uuid.UUID) -> None:
+    """Keep `user_id`'s reads on the primary for the freshness window."""
+    _recent_writers.set(user_id, True)
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_writer(session: Session) -> None:
+    user_id = session.info.get(SESSION_USER_KEY)
+    if user_id is not None:
+        mark_recent_write(user_id)
+
+
+async def get_read_db(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Yield a session for a read-only endpoint, on the replica when it is safe.
+
+    Recent writers (and every caller when no replica is configured) share the
+    request's primary session, so the read takes no extra pool connection.
+    Otherwise the primary session is closed once authentication is done, so
+    the request never holds a primary and a replica connection at once.
+    """
+    if ReadSessionLocal is None or current_user.id in _recent_writers:
+        if ReadSessionLocal is not None:
+            _primary_reads.inc()
+        yield db
+        return
+
+    _replica_reads.inc()
+    # Closing detaches the authenticated user without expiring it and returns
+    # the primary connection to the pool.
+    await db.close()
+    session = ReadSessionLocal()
+    session.info[SESSION_USER_KEY] = current_user.id
+    try:
+        yield session
+    finally:
+        await session.close()
@@ -0,0 +1,201 @@
+"""Precomputed spending rollups backing the analytics endpoint.
+
+Rollups are bumped in the same transaction that creates an expense and can be
+rebuilt from the raw `expenses`/`expense_shares` history at any time (see
+``scripts/rebuild_spending_rollups.py``). Settlements move money between members
+rather than spend it, so they are left out.
+"""
+
+import uuid
+from collections.abc import Iterable
+from datetime import UTC, date, datetime
+from decimal import Decimal
+
+from sqlalchemy import delete, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.app.models.expense import Expense
+from api.app.models.expense_share import ExpenseShare
+from api.app.models.group import Group
+from api.app.models.group_spending_rollup import GroupSpendingRollup
+from api.app.models.user_spending_rollup import UserSpendingRollup
+from api.app.sql_compat import upsert_insert
+
+SETTLEMENT_CATEGORY = "settlement"
+UNCATEGORIZED = "uncategorized"
+
+
+def month_bucket(value: datetime) -> date:
+    """Return the first day of `value`'s month in UTC (naive values are taken as UTC)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC)
+    return date(value.year, value.month, 1)
+
+
+def user_shares(amount: Decimal, payer_id: uuid.UUID, splits: Iterable) -> dict[uuid.UUID, Decimal]:
+    """Split an expense into what each member consumed.
+
+    Debtors consumed what they owe; the payer consumed whatever part of the
+    amount nobody else owes back. `splits` items need `debtor_id` and `amount_owed`.
+    """
+    shares: dict[uuid.UUID, Decimal] = {}
+    owed_by_others = Decimal("0")
+    for split in splits:
+        if split.debtor_id == payer_id:
+            continue
+        owed = Decimal(split.amount_owed)
+        shares[split.debtor_id] = shares.get(split.debtor_id, Decimal("0")) + owed
+        owed_by_others += owed
+    payer_share = Decimal(amount) - owed_by_others
+    if payer_share > 0:
+        shares[payer_id] = payer_share
+    return shares
+
+
+def _counts_as_spending(category: str | None) -> bool:
+    return category != SETTLEMENT_CATEGORY
+
+
+async def record_expense(db: AsyncSession, expense: Expense, splits: Iterable) -> None:
+    """Add a newly created expense to the group and per-user rollups."""
+    if not _counts_as_spending(expense.category):
+        return
+
+    category = expense.category or UNCATEGORIZED
+    month = month_bucket(expense.date)
+
+    group_stmt = upsert_insert(db, GroupSpendingRollup).values(
+        group_id=expense.group_id,
+        category=category,
+        month=month,
+        total=expense.amount,
+        expense_count=1,
+    )
+    await db.execute(
+        group_stmt.on_conflict_do_update(
+            index_elements=["group_id", "category", "month"],
+            set_={
+                "total": GroupSpendingRollup.total + group_stmt.excluded.total,
+                "expense_count": GroupSpendingRollup.expense_count + 1,
+            },
+        )
+    )
+
+    shares = user_shares(expense.amount, expense.payer_id, splits)
+    if not shares:
+        return
+    user_stmt = upsert_insert(db, UserSpendingRollup).values(
+        [
+            {
+                "group_id": expense.group_id,
+                "user_id": user_id,
+                "category": category,
+                "month": month,
+                "total": total,
+            }
+            for user_id, total in shares.items()
+        ]
+    )
+    await db.execute(
+        user_stmt.on_conflict_do_update(
+            index_elements=["group_id", "user_id", "category", "month"],
+            set_={"total": UserSpendingRollup.total + user_stmt.excluded.total},
+        )
+    )
+
+
+async def _rebuild_group(db: AsyncSession, group_id: uuid.UUID) -> int:
+    """Recompute one group's rollups from its raw expenses. Returns expenses processed."""
+    # create_expense bumps the group's version before it inserts, so holding the
+    # row keeps new expenses from landing between the read and the insert below.
+    await db.execute(select(Group.id).where(Group.id == group_id).with_for_update())
+    await db.execute(delete(GroupSpendingRollup).where(GroupSpendingRollup.group_id == group_id))
+    await db.execute(delete(UserSpendingRollup).where(UserSpendingRollup.group_id == group_id))
+
+    spending = or_(Expense.category.is_(None), Expense.category != SETTLEMENT_CATEGORY)
+    expenses = (
+        await db.execute(
+            select(
+                Expense.id,
+                Expense.payer_id,
+                Expense.amount,
+                Expense.category,
+                Expense.date,
+            ).where(Expense.group_id == group_id, spending)
+        )
+    ).all()
+    if not expenses:
+        return 0
+
+    shares_result = await db.execute(
+        select(ExpenseShare.expense_id, ExpenseShare.debtor_id, ExpenseShare.amount_owed)
+        .join(Expense, ExpenseShare.expense_id == Expense.id)
+        .where(Expense.group_id == group_id, spending)
+    )
+    splits_by_expense: dict[uuid.UUID, list] = {}
+    for share in shares_result.all():
+        splits_by_expense.setdefault(share.expense_id, []).append(share)
+
+    group_totals: dict[tuple[str, date], list] = {}
+    user_totals: dict[tuple[uuid.UUID, str, date], Decimal] = {}
+    for expense in expenses:
+        key = (expense.category or UNCATEGORIZED, month_bucket(expense.date))
+        bucket = group_totals.setdefault(key, [Decimal("0"), 0])
+        bucket[0] += Decimal(expense.amount)
+        bucket[1] += 1
+        shares = user_shares(
+            expense.amount, expense.payer_id, splits_by_expense.get(expense.id, [])
+        )
+        for user_id, total in shares.items():
+            user_key = (user_id, *key)
+            user_totals[user_key] = user_totals.get(user_key, Decimal("0")) + total
+
+    await db.execute(
+        insert(GroupSpendingRollup),
+        [
+            {
+                "group_id": group_id,
+                "category": category,
+                "month": month,
+                "total": total,
+                "expense_count": count,
+            }
+            for (category, month), (total, count) in group_totals.items()
+        ],
+    )
+    if user_totals:
+        await db.execute(
+            insert(UserSpendingRollup),
+            [
+                {
+                    "group_id": group_id,
+                    "user_id": user_id,
+                    "category": category,
+                    "month": month,
+                    "total": total,
+                }
+                for (user_id, category, month), total in user_totals.items()
+            ],
+        )
+    return len(expenses)
+
+
+async def rebuild_spending_rollups(db: AsyncSession, group_id: uuid.UUID | None = None) -> int:
+    """Rebuild rollups for one group, or for every group when `group_id` is None.
+
+    Each group is recomputed and committed separately, which bounds memory and
+    keeps every transaction (and the locks it holds) to a single group.
+    Archived groups are skipped: their raw history is not in the hot tables and
+    their rollups were complete when they were archived. Returns the number of
+    expenses processed.
+    """
+    query = select(Group.id).where(Group.archived_at.is_(None))
+    if group_id is not None:
+        query = query.where(Group.id == group_id)
+
+    group_ids = (await db.execute(query)).scalars().all()
+    processed = 0
+    for gid in group_ids:
+        processed += await _rebuild_group(db, gid)
+        await db.commit()
+    return processed
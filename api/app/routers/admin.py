@@ -0,0 +1,55 @@
+import hmac
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.app.dependencies import get_db
+from api.app.passwords import PasswordHasherBusyError
+from api.app.provisioning import GroupNotFoundError, NewUser, provision_users
+from api.app.schemas.admin import BulkProvisionRequest, BulkProvisionResponse
+from api.app.schemas.auth import UserResponse
+from api.app.variables import MyVariables
+
+
+async def require_admin_key(x_admin_key: str | None = Header(default=None)) -> None:
+    """Allow the request only with the configured ``X-Admin-Key``."""
+    if not MyVariables.admin_api_key:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Admin endpoints are disabled"
+        )
+    if x_admin_key is None or not hmac.compare_digest(x_admin_key, MyVariables.admin_api_key):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin key")
+
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin_key)])
+
+
+@router.post(
+    "/users/bulk", response_model=BulkProvisionResponse, status_code=status.HTTP_201_CREATED
+)
+async def bulk_provision_users(body: BulkProvisionRequest, db: AsyncSession = Depends(get_db)):
+    """Create many users at once, optionally adding them all to a group.
+
+    Emails that are already registered are skipped and listed in `existing_emails`.
+    """
+    try:
+        result = await provision_users(
+            db,
+            (NewUser(name=u.name, email=u.email, password=u.password) for u in body.users),
+            body.group_id,
+        )
+    except GroupNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found") from e
+    except PasswordHasherBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Password hashing is temporarily overloaded, please retry",
+            headers={"Retry-After": "1"},
+        ) from e
+    await db.commit()
+
+    return BulkProvisionResponse(
+        created=[UserResponse.model_validate(row) for row in result.created],
+        existing_emails=result.existing_emails,
+        added_to_group=result.added_to_group,
+    )
@@ -0,0 +1,78 @@
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.app.dependencies import get_db
+from api.app.membership import require_group_member
+from api.app.models.group_spending_rollup import GroupSpendingRollup
+from api.app.models.user_spending_rollup import UserSpendingRollup
+from api.app.schemas.analytics import (
+    CategorySpending,
+    MonthSpending,
+    SpendingAnalyticsResponse,
+    SpendingBucket,
+)
+
+router = APIRouter(prefix="/groups/{group_id}/analytics", tags=["Analytics"])
+
+
+@router.get(
+    "/spending",
+    response_model=SpendingAnalyticsResponse,
+    dependencies=[Depends(require_group_member)],
+)
+async def get_spending(
+    group_id: uuid.UUID,
+    user_id: uuid.UUID | None = Query(
+        None, description="Report this member's share instead of the group's total"
+    ),
+    db: AsyncSession = Depends(get_db),
+):
+    """Spending per category and per month, served from the precomputed rollups."""
+    if user_id is None:
+        result = await db.execute(
+            select(
+                GroupSpendingRollup.category,
+                GroupSpendingRollup.month,
+                GroupSpendingRollup.total,
+                GroupSpendingRollup.expense_count,
+            )
+            .where(GroupSpendingRollup.group_id == group_id)
+            .order_by(GroupSpendingRollup.month, GroupSpendingRollup.category)
+        )
+    else:
+        result = await db.execute(
+            select(
+                UserSpendingRollup.category,
+                UserSpendingRollup.month,
+                UserSpendingRollup.total,
+            )
+            .where(
+                UserSpendingRollup.group_id == group_id,
+                UserSpendingRollup.user_id == user_id,
+            )
+            .order_by(UserSpendingRollup.month, UserSpendingRollup.category)
+        )
+    buckets = [SpendingBucket(**row._asdict()) for row in result.all()]
+
+    by_category: dict[str, Decimal] = {}
+    by_month: dict[date, Decimal] = {}
+    for bucket in buckets:
+        by_category[bucket.category] = by_category.get(bucket.category, Decimal("0")) + bucket.total
+        by_month[bucket.month] = by_month.get(bucket.month, Decimal("0")) + bucket.total
+
+    return SpendingAnalyticsResponse(
+        group_id=group_id,
+        user_id=user_id,
+        total=sum(by_category.values(), Decimal("0")),
+        by_category=[
+            CategorySpending(category=category, total=total)
+            for category, total in sorted(by_category.items(), key=lambda item: -item[1])
+        ],
+        by_month=[MonthSpending(month=month, total=total) for month, total in by_month.items()],
+        buckets=buckets,
+    )
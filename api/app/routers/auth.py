@@ -1,26 +1,33 @@
 import inspect
+import math
+from datetime import UTC, datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from passlib.context import CryptContext
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.app.auth import create_access_token, get_current_user
 from api.app.dependencies import get_db
+from api.app.etag import bump_group_version
+from api.app.membership import invalidate_membership
 from api.app.models.group_member import GroupMember
 from api.app.models.user import User
+from api.app.passwords import (
+    PasswordHasherBusyError,
+    hash_password_async,
+    verify_and_update_password_async,
+)
+from api.app.rate_limit import client_ip, login_email_limiter, login_ip_limiter
 from api.app.schemas.auth import (
     AuthResponse,
     LoginRequest,
     RegisterRequest,
     UserResponse,
 )
+from api.app.token_revocation import token_denylist
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
-# Password hashing context using bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 async def _maybe_await(value):
     """Support both async and sync SQLAlchemy sessions."""
@@ -29,14 +36,31 @@ async def _maybe_await(value):
     return value
 
 
-def hash_password(plain: str) -> str:
-    """Hash a plaintext password with bcrypt."""
-    return pwd_context.hash(plain)
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is temporarily overloaded, please retry",
+        headers={"Retry-After": "1"},
+    )
+
 
+def _check_login_rate(request: Request, email: str) -> None:
+    """Reject the attempt with 429 when its IP, or its IP for this email, is over the limit.
 
-def verify_password(plain: str, hashed: str) -> bool:
-    """Verify a plaintext password against a bcrypt hash."""
-    return pwd_context.verify(plain, hashed)
+    The email bucket is per client IP, so guessing from elsewhere cannot lock the
+    account's owner out.
+    """
+    ip = client_ip(
+        request.client.host if request.client else None,
+        request.headers.get("x-forwarded-for"),
+    )
+    retry_after = login_ip_limiter.check(ip) or login_email_limiter.check((email.lower(), ip))
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, please retry later",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
 
 
 async def _maybe_join_group(db: AsyncSession, user_id, group_id) -> None:
@@ -54,6 +78,8 @@ async def _maybe_join_group(db: AsyncSession, user_id, group_id) -> None:
     )
     if existing.scalar_one_or_none() is None:
         db.add(GroupMember(group_id=group_id, user_id=user_id))
+        await _maybe_await(db.execute(bump_group_version(group_id)))
+        invalidate_membership(group_id, user_id)
 
 
 @router.post("/register", response_model=AuthResponse, status_code=status.HTTP_201_CREATED)
@@ -67,10 +93,15 @@ async def register(body: RegisterRequest, db: AsyncSession = Depends(get_db)):
             detail="A user with this email already exists",
         )
 
+    try:
+        password_hash = await hash_password_async(body.password)
+    except PasswordHasherBusyError as e:
+        raise _hasher_busy() from e
+
     user = User(
         name=body.name,
         email=body.email,
-        password_hash=hash_password(body.password),
+        password_hash=password_hash,
     )
     db.add(user)
     await _maybe_await(db.flush())  # populate user.id
@@ -82,29 +113,44 @@ async def register(body: RegisterRequest, db: AsyncSession = Depends(get_db)):
     await _maybe_await(db.refresh(user))
 
     # Generate JWT token
-    access_token = create_access_token(user.id)
+    access_token = create_access_token(user.id, user)
 
     return AuthResponse(access_token=access_token, user=UserResponse.model_validate(user))
 
 
 @router.post("/login", response_model=AuthResponse)
-async def login(body: LoginRequest, db: AsyncSession = Depends(get_db)):
+async def login(body: LoginRequest, request: Request, db: AsyncSession = Depends(get_db)):
     """Log in with email and password and return JWT access token."""
+    _check_login_rate(request, body.email)
+
     result = await _maybe_await(db.execute(select(User).where(User.email == body.email)))
     user = result.scalar_one_or_none()
 
-    if user is None or not verify_password(body.password, user.password_hash):
+    valid, new_hash = False, None
+    try:
+        if user is not None:
+            valid, new_hash = await verify_and_update_password_async(
+                body.password, user.password_hash
+            )
+    except PasswordHasherBusyError as e:
+        raise _hasher_busy() from e
+
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
         )
 
+    # Upgrade hashes made with an older scheme or a lower cost than the current policy
+    if new_hash is not None:
+        user.password_hash = new_hash
+
     # Auto-join group if invite id provided
     await _maybe_join_group(db, user.id, body.invite_group_id)
     await _maybe_await(db.commit())
 
     # Generate JWT token
-    access_token = create_access_token(user.id)
+    access_token = create_access_token(user.id, user)
 
     return AuthResponse(access_token=access_token, user=UserResponse.model_validate(user))
 
@@ -113,3 +159,17 @@ async def login(body: LoginRequest, db: AsyncSession = Depends(get_db)):
 async def get_me(current_user: User = Depends(get_current_user)):
     """Get the current authenticated user's profile."""
     return UserResponse.model_validate(current_user)
+
+
+@router.post("/revoke", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_tokens(
+    current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)
+):
+    """Revoke every access token issued to the current user so far."""
+    result = await _maybe_await(db.execute(select(User).where(User.id == current_user.id)))
+    user = result.scalar_one()
+    new_version = user.token_version + 1
+    user.token_version = new_version
+    user.tokens_revoked_at = datetime.now(UTC)
+    await _maybe_await(db.commit())
+    token_denylist.revoke(current_user.id, new_version)
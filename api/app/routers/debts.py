@@ -1,17 +1,27 @@
 import uuid
 from decimal import Decimal
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.app.archival import restore_group
 from api.app.auth import get_current_user
 from api.app.dependencies import get_db
+from api.app.etag import (
+    bump_group_version,
+    etag_matches,
+    load_group_state,
+    not_modified,
+    set_etag,
+)
+from api.app.idempotency import commit_with_key, find_replay, request_fingerprint
+from api.app.membership import ensure_group_member
 from api.app.models.expense import Expense
 from api.app.models.expense_share import ExpenseShare
 from api.app.models.group import Group
-from api.app.models.group_member import GroupMember
 from api.app.models.user import User
+from api.app.read_replica import get_read_db
 from api.app.schemas.debt import DebtSummaryResponse, SettleResponse
 from domains.expense.repository import ExpenseRepository
 from domains.expense.service import ExpenseService
@@ -20,22 +30,6 @@ from domains.group.repository import GroupRepository
 router = APIRouter(prefix="/groups/{group_id}/debts", tags=["Debts"])
 
 
-async def _verify_group_membership(
-    db: AsyncSession, group_id: uuid.UUID, user_id: uuid.UUID
-) -> None:
-    """Verify that a user is a member of the group."""
-    result = await db.execute(
-        select(GroupMember).where(
-            GroupMember.group_id == group_id,
-            GroupMember.user_id == user_id,
-        )
-    )
-    if result.scalar_one_or_none() is None:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, detail="You are not a member of this group"
-        )
-
-
 class SQLAlchemyExpenseRepository(ExpenseRepository):
     def __init__(self, db):
         super().__init__()
@@ -69,20 +63,29 @@ class SQLAlchemyGroupRepository(GroupRepository):
 @router.get("", response_model=list[DebtSummaryResponse])
 async def list_debts(
     group_id: uuid.UUID,
+    response: Response,
+    if_none_match: str | None = Header(None),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
+    primary: AsyncSession = Depends(get_db),
 ):
     """List all pending debts in a group (aggregated by debtor/creditor)."""
-    # Verify user is a member
-    await _verify_group_membership(db, group_id, current_user.id)
+    # Verify user is a member; answer unchanged polls from the group version alone
+    etag, archived = await load_group_state(db, group_id, current_user.id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    if archived:
+        # Restore on the primary and read from it; a replica may not have the rows yet
+        await restore_group(primary, group_id)
+        await primary.commit()
+        db = primary
 
     # Fetch group to check debt_simplification
-    group_result = await db.execute(select(Group).where(Group.id == group_id))
-    group = group_result.scalar_one_or_none()
-    if group is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+    group_result = await db.execute(select(Group.debt_simplification).where(Group.id == group_id))
+    debt_simplification = group_result.scalar_one()
 
-    if group.debt_simplification:
+    if debt_simplification:
         from domain import Expense as DomainExpense
         from domain import User as DomainUser
 
@@ -173,12 +176,22 @@ async def list_debts(
 async def settle_debt(
     group_id: uuid.UUID,
     debt_id: uuid.UUID,
+    request: Request,
+    idempotency_key: str | None = Header(None, max_length=255),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Settle a specific debt (expense share) by marking it as settled."""
-    # Verify user is a member
-    await _verify_group_membership(db, group_id, current_user.id)
+    """Settle a specific debt (expense share) by marking it as settled.
+
+    Retries carrying the same ``Idempotency-Key`` header get the original response.
+    """
+    fingerprint = request_fingerprint(request.method, request.url.path)
+    # Verify user is a member before replaying, so removed members get no replays
+    await ensure_group_member(db, group_id, current_user.id)
+
+    replay = await find_replay(db, current_user.id, idempotency_key, fingerprint)
+    if replay is not None:
+        return replay
 
     # Find the specific expense share
     result = await db.execute(
@@ -203,8 +216,12 @@ async def settle_debt(
 
     # Mark as settled
     debt.status = "settled"
-    await db.commit()
+    await db.execute(bump_group_version(group_id))
 
-    return SettleResponse(
+    settled = SettleResponse(
         settled_count=1, message=f"Debt of {debt.amount_owed} settled successfully"
     )
+    replay = await commit_with_key(
+        db, current_user.id, idempotency_key, fingerprint, status.HTTP_200_OK, settled
+    )
+    return replay or settled
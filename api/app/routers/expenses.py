@@ -2,84 +2,150 @@ from __future__ import annotations
 
 import uuid
 from datetime import UTC, datetime
+from decimal import Decimal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from sqlalchemy import String, cast, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.app.archival import archived_group_of, restore_group
 from api.app.auth import get_current_user
 from api.app.dependencies import get_db
+from api.app.etag import (
+    bump_group_version,
+    etag_matches,
+    load_group_state,
+    not_modified,
+    set_etag,
+)
+from api.app.idempotency import commit_with_key, find_replay, request_fingerprint
+from api.app.membership import ensure_group_member
 from api.app.models.expense import Expense
 from api.app.models.expense_share import ExpenseShare
-from api.app.models.group_member import GroupMember
+from api.app.models.group import Group
 from api.app.models.user import User
+from api.app.read_replica import get_read_db
+from api.app.rollups import record_expense
 from api.app.schemas.expense import (
     ExpenseCreateRequest,
     ExpenseListResponse,
     ExpenseResponse,
+    ExpenseSplitResponse,
 )
+from api.app.sql_compat import json_array_agg, json_object_from
 
 router = APIRouter(tags=["Expenses"])
 
 
-async def _verify_group_membership(
-    db: AsyncSession, group_id: uuid.UUID, user_id: uuid.UUID
-) -> None:
-    """Verify that a user is a member of the group."""
-    result = await db.execute(
-        select(GroupMember).where(
-            GroupMember.group_id == group_id,
-            GroupMember.user_id == user_id,
+_CENTS = Decimal("0.01")
+
+
+def _expense_with_splits_query():
+    """Select expense columns plus their splits aggregated into one JSON array.
+
+    The splits come from a correlated subquery, so a page of expenses and all of
+    its shares are read in a single round trip without hydrating ORM objects.
+    Numeric values are cast to text inside the JSON to keep them exact.
+    """
+    splits = (
+        select(
+            json_array_agg(
+                json_object_from(
+                    id=ExpenseShare.id,
+                    debtor_id=ExpenseShare.debtor_id,
+                    creditor_id=ExpenseShare.creditor_id,
+                    amount_owed=cast(ExpenseShare.amount_owed, String),
+                    percentage=cast(ExpenseShare.percentage, String),
+                    status=ExpenseShare.status,
+                )
+            )
         )
+        .where(ExpenseShare.expense_id == Expense.id)
+        .correlate(Expense)
+        .scalar_subquery()
+    )
+    return select(
+        Expense.id,
+        Expense.group_id,
+        Expense.payer_id,
+        Expense.description,
+        Expense.amount,
+        Expense.category,
+        Expense.date,
+        Expense.created_at,
+        splits.label("splits"),
     )
-    if result.scalar_one_or_none() is None:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, detail="You are not a member of this group"
-        )
-
 
-async def _attach_shares(db: AsyncSession, expenses: list[Expense]) -> list[dict]:
-    """Fetch shares for a list of expenses and return dicts with shares attached."""
-    if not expenses:
-        return []
 
-    expense_ids = [e.id for e in expenses]
-    shares_result = await db.execute(
-        select(ExpenseShare).where(ExpenseShare.expense_id.in_(expense_ids))
+def _expense_from_row(row) -> ExpenseResponse:
+    """Map a row from `_expense_with_splits_query` straight to the response model."""
+    return ExpenseResponse.model_construct(
+        id=row.id,
+        group_id=row.group_id,
+        payer_id=row.payer_id,
+        description=row.description,
+        amount=row.amount,
+        category=row.category,
+        date=row.date,
+        created_at=row.created_at,
+        splits=[
+            ExpenseSplitResponse.model_construct(
+                id=uuid.UUID(s["id"]),
+                debtor_id=uuid.UUID(s["debtor_id"]),
+                creditor_id=uuid.UUID(s["creditor_id"]),
+                amount_owed=Decimal(s["amount_owed"]).quantize(_CENTS),
+                percentage=Decimal(s["percentage"]).quantize(_CENTS),
+                status=s["status"],
+            )
+            for s in row.splits or []
+        ],
     )
-    all_shares = shares_result.scalars().all()
-
-    # Group shares by expense_id
-    shares_by_expense: dict[uuid.UUID, list] = {}
-    for s in all_shares:
-        shares_by_expense.setdefault(s.expense_id, []).append(s)
-
-    result = []
-    for e in expenses:
-        result.append(
-            {
-                "id": e.id,
-                "group_id": e.group_id,
-                "payer_id": e.payer_id,
-                "description": e.description,
-                "amount": e.amount,
-                "category": e.category,
-                "date": e.date,
-                "created_at": e.created_at,
-                "splits": [
-                    {
-                        "id": s.id,
-                        "debtor_id": s.debtor_id,
-                        "creditor_id": s.creditor_id,
-                        "amount_owed": s.amount_owed,
-                        "percentage": s.percentage,
-                        "status": s.status,
-                    }
-                    for s in shares_by_expense.get(e.id, [])
-                ],
-            }
-        )
-    return result
+
+
+async def _get_expense(db: AsyncSession, expense_id: uuid.UUID) -> ExpenseResponse | None:
+    """Fetch a single expense with its splits, or None if it does not exist."""
+    result = await db.execute(_expense_with_splits_query().where(Expense.id == expense_id))
+    row = result.one_or_none()
+    return _expense_from_row(row) if row else None
+
+
+def _like_pattern(text: str) -> str:
+    """Build a substring LIKE pattern, escaping the LIKE wildcards in `text`."""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _expense_filters(
+    group_id: uuid.UUID,
+    category: str | None = None,
+    payer_id: uuid.UUID | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    min_amount: Decimal | None = None,
+    max_amount: Decimal | None = None,
+    q: str | None = None,
+) -> list:
+    """Build the WHERE criteria for an expense listing.
+
+    Equality on group and category plus the date range are served by the
+    (group_id, category, date) index; description search by the trigram index.
+    """
+    criteria = [Expense.group_id == group_id]
+    if category is not None:
+        criteria.append(Expense.category == category)
+    if payer_id is not None:
+        criteria.append(Expense.payer_id == payer_id)
+    if date_from is not None:
+        criteria.append(Expense.date >= date_from)
+    if date_to is not None:
+        criteria.append(Expense.date < date_to)
+    if min_amount is not None:
+        criteria.append(Expense.amount >= min_amount)
+    if max_amount is not None:
+        criteria.append(Expense.amount <= max_amount)
+    if q:
+        criteria.append(Expense.description.ilike(_like_pattern(q), escape="\\"))
+    return criteria
 
 
 # ── Group-scoped expense routes ──────────────────────────────────────────────
@@ -88,37 +154,53 @@ async def _attach_shares(db: AsyncSession, expenses: list[Expense]) -> list[dict
 @router.get("/groups/{group_id}/expenses", response_model=ExpenseListResponse)
 async def list_expenses(
     group_id: uuid.UUID,
+    response: Response,
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(50, ge=1, le=100, description="Items per page"),
+    category: str | None = Query(None, description="Only expenses in this category"),
+    payer_id: uuid.UUID | None = Query(None, description="Only expenses paid by this user"),
+    date_from: datetime | None = Query(None, description="Expenses dated at or after this"),
+    date_to: datetime | None = Query(None, description="Expenses dated before this"),
+    min_amount: Decimal | None = Query(None, ge=0, description="Minimum expense amount"),
+    max_amount: Decimal | None = Query(None, ge=0, description="Maximum expense amount"),
+    q: str | None = Query(None, max_length=100, description="Search in descriptions"),
+    if_none_match: str | None = Header(None),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
+    primary: AsyncSession = Depends(get_db),
 ):
-    """List all expenses for a group (paginated, DESC by date)."""
-    # Verify user is a member
-    await _verify_group_membership(db, group_id, current_user.id)
+    """List expenses for a group (paginated, DESC by date), optionally filtered."""
+    # Verify user is a member; answer unchanged polls from the group version alone
+    etag, archived = await load_group_state(db, group_id, current_user.id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    if archived:
+        # Restore on the primary and read from it; a replica may not have the rows yet
+        await restore_group(primary, group_id)
+        await primary.commit()
+        db = primary
 
-    # Get total count
-    count_result = await db.execute(
-        select(func.count()).select_from(Expense).where(Expense.group_id == group_id)
+    criteria = _expense_filters(
+        group_id, category, payer_id, date_from, date_to, min_amount, max_amount, q
     )
+
+    # Get total count
+    count_result = await db.execute(select(func.count()).select_from(Expense).where(*criteria))
     total = count_result.scalar()
 
     # Get paginated expenses
     offset = (page - 1) * limit
     result = await db.execute(
-        select(Expense)
-        .where(Expense.group_id == group_id)
+        _expense_with_splits_query()
+        .where(*criteria)
         .order_by(Expense.date.desc())
         .offset(offset)
         .limit(limit)
     )
-    expenses = list(result.scalars().all())
-
-    # Attach shares
-    items = await _attach_shares(db, expenses)
 
     return ExpenseListResponse(
-        expenses=[ExpenseResponse(**e) for e in items],
+        expenses=[_expense_from_row(row) for row in result.all()],
         total=total,
         page=page,
         limit=limit,
@@ -134,12 +216,28 @@ async def list_expenses(
 async def create_expense(
     group_id: uuid.UUID,
     body: ExpenseCreateRequest,
+    request: Request,
+    idempotency_key: str | None = Header(None, max_length=255),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Create a new expense or settlement. Settlements use category='settlement'."""
-    # Verify user is a member
-    await _verify_group_membership(db, group_id, current_user.id)
+    """Create a new expense or settlement. Settlements use category='settlement'.
+
+    Retries carrying the same ``Idempotency-Key`` header get the original response.
+    """
+    fingerprint = request_fingerprint(request.method, request.url.path, body)
+    # Verify user is a member before replaying, so removed members get no replays
+    await ensure_group_member(db, group_id, current_user.id)
+
+    replay = await find_replay(db, current_user.id, idempotency_key, fingerprint)
+    if replay is not None:
+        return replay
+
+    # The version bump also reports whether the group is archived; its archived
+    # expenses come back first so the new one does not leave it half in storage
+    result = await db.execute(bump_group_version(group_id).returning(Group.archived_at))
+    if result.scalar_one() is not None:
+        await restore_group(db, group_id)
 
     expense = Expense(
         group_id=group_id,
@@ -164,12 +262,16 @@ async def create_expense(
             )
         )
 
-    await db.commit()
-    await db.refresh(expense)
+    await record_expense(db, expense, body.splits)
+    await db.flush()
 
-    # Return with splits attached
-    items = await _attach_shares(db, [expense])
-    return ExpenseResponse(**items[0])
+    # Build the response with splits attached before committing, so it can be
+    # stored atomically with the expense under the idempotency key
+    created = await _get_expense(db, expense.id)
+    replay = await commit_with_key(
+        db, current_user.id, idempotency_key, fingerprint, status.HTTP_201_CREATED, created
+    )
+    return replay or created
 
 
 # ── Single expense route (not group-scoped) ──────────────────────────────────
@@ -179,16 +281,25 @@ async def create_expense(
 async def get_expense(
     id: uuid.UUID,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
+    primary: AsyncSession = Depends(get_db),
 ):
     """Get details of a single expense."""
-    result = await db.execute(select(Expense).where(Expense.id == id))
-    expense = result.scalar_one_or_none()
+    expense = await _get_expense(db, id)
+    if expense is None:
+        # It may be in cold storage: restore its group on the primary, then read it
+        # again there, since a replica may not have the rows yet
+        group_id = await archived_group_of(db, id)
+        if group_id is not None:
+            await ensure_group_member(db, group_id, current_user.id)
+            await restore_group(primary, group_id)
+            await primary.commit()
+            db = primary
+            expense = await _get_expense(db, id)
     if expense is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Expense not found")
 
     # Verify user is a member of the group
-    await _verify_group_membership(db, expense.group_id, current_user.id)
+    await ensure_group_member(db, expense.group_id, current_user.id)
 
-    items = await _attach_shares(db, [expense])
-    return ExpenseResponse(**items[0])
+    return expense
@@ -1,32 +1,126 @@
 import uuid
 
-from fastapi import APIRouter, Body, Depends, HTTPException, status
-from sqlalchemy import select, update
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, status
+from sqlalchemy import and_, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.app.auth import get_current_user
+from api.app.balances import net_balance_query
 from api.app.dependencies import get_db
+from api.app.invite_codes import (
+    invalidate_invite_code,
+    join_by_invite_code,
+    parse_group_id,
+    remember_invite_code,
+    resolve_group_ref,
+)
+from api.app.membership import ensure_group_member, invalidate_membership
+from api.app.models.expense import Expense
 from api.app.models.group import Group
+from api.app.models.group_archive import GroupArchive
 from api.app.models.group_member import GroupMember
 from api.app.models.user import User
-from api.app.schemas.group import GroupCreateRequest, GroupResponse
+from api.app.pagination import after_cursor, paginate, parse_fields, trimmed_response
+from api.app.read_replica import get_read_db
+from api.app.schemas.group import GroupCreateRequest, GroupDashboardResponse, GroupResponse
 
 router = APIRouter(prefix="/groups", tags=["Groups"])
 
 
 @router.get("", response_model=list[GroupResponse])
 async def list_groups(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500, description="Items per page"),
+    cursor: uuid.UUID | None = Query(None, description="X-Next-Cursor of the previous page"),
+    fields: str | None = Query(None, description="Comma-separated fields to return"),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """List all groups the current user belongs to."""
-    result = await db.execute(
-        select(Group)
+    """List the groups the current user belongs to, newest first (keyset-paginated)."""
+    selected = parse_fields(fields, GroupResponse.model_fields)
+    columns = [Group]
+    if selected is not None:
+        # The id is always selected: it is the next page's cursor
+        columns = [Group.id, *(getattr(Group, f) for f in selected if f != "id")]
+    query = (
+        select(*columns)
         .join(GroupMember, GroupMember.group_id == Group.id)
         .where(GroupMember.user_id == current_user.id)
+        .order_by(Group.created_at.desc(), Group.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor is not None:
+        query = query.where(after_cursor(Group.created_at, Group.id, cursor, descending=True))
+    result = await db.execute(query)
+
+    if selected is None:
+        return paginate(result.scalars().all(), limit, response, lambda group: group.id)
+    rows = paginate(result.all(), limit, response, lambda row: row.id)
+    return trimmed_response((row._mapping for row in rows), selected, response)
+
+
+def _dashboard_query(user_id: uuid.UUID):
+    """Every group of `user_id` with its dashboard figures, in a single query.
+
+    Each figure is a scalar subquery correlated on the group row only, so it is
+    evaluated per group against the group-scoped indexes.
+    """
+    member_count = (
+        select(func.count())
+        .select_from(GroupMember)
+        .where(GroupMember.group_id == Group.id)
+        .correlate(Group)
+        .scalar_subquery()
+    )
+    expense_count = (
+        select(func.count())
+        .select_from(Expense)
+        .where(Expense.group_id == Group.id)
+        .correlate(Group)
+        .scalar_subquery()
+    )
+    last_expense_at = (
+        select(func.max(Expense.created_at))
+        .where(Expense.group_id == Group.id)
+        .correlate(Group)
+        .scalar_subquery()
+    )
+    net_balance = net_balance_query(Group.id, user_id).correlate(Group).scalar_subquery()
+    return (
+        select(
+            Group,
+            member_count.label("member_count"),
+            (expense_count + func.coalesce(GroupArchive.expense_count, 0)).label("expense_count"),
+            func.coalesce(last_expense_at, GroupArchive.last_activity_at, Group.created_at).label(
+                "last_activity_at"
+            ),
+            net_balance.label("net_balance"),
+        )
+        .join(GroupMember, and_(GroupMember.group_id == Group.id, GroupMember.user_id == user_id))
+        # Archived groups keep their counts in the archive row
+        .outerjoin(GroupArchive, GroupArchive.group_id == Group.id)
         .order_by(Group.created_at.desc())
     )
-    return list(result.scalars().all())
+
+
+def _dashboard_from_row(row) -> GroupDashboardResponse:
+    return GroupDashboardResponse(
+        **GroupResponse.model_validate(row.Group).model_dump(),
+        member_count=row.member_count,
+        expense_count=row.expense_count,
+        last_activity_at=row.last_activity_at,
+        net_balance=row.net_balance,
+    )
+
+
+@router.get("/dashboard", response_model=list[GroupDashboardResponse])
+async def get_dashboard(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """List the user's groups with counts, last activity and the user's balance in each."""
+    result = await db.execute(_dashboard_query(current_user.id))
+    return [_dashboard_from_row(row) for row in result.all()]
 
 
 @router.post("", response_model=GroupResponse, status_code=status.HTTP_201_CREATED)
@@ -53,6 +147,47 @@ async def create_group(
     return group
 
 
+async def _load_group_by_ref(db: AsyncSession, code: str) -> Group:
+    """Load a group by id or invite code (the code resolved through the invite-code cache)."""
+    group_id = await resolve_group_ref(db, code)
+    group = await db.get(Group, group_id) if group_id is not None else None
+    if group is not None and parse_group_id(code) is None and group.invite_code != code:
+        # The code was regenerated (possibly in another worker) after it was cached
+        invalidate_invite_code(code)
+        group = None
+    if group is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+    return group
+
+
+@router.post("/join/{code}", response_model=GroupResponse, status_code=status.HTTP_201_CREATED)
+async def join_group_by_code(
+    code: str,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Join a group with its invite code. Answers 200 if the user is already a member."""
+    result = await db.execute(join_by_invite_code(db, code, current_user.id))
+    group_id = result.scalar_one_or_none()
+    if group_id is None:
+        # Nothing inserted: either the code is unknown or the user already belongs
+        group = await _load_group_by_ref(db, code)
+        await ensure_group_member(db, group.id, current_user.id)
+        response.status_code = status.HTTP_200_OK
+        return group
+
+    # Bump the version for the members' ETags and load the group in the same statement
+    result = await db.execute(
+        update(Group).where(Group.id == group_id).values(version=Group.version + 1).returning(Group)
+    )
+    group = result.scalar_one()
+    await db.commit()
+    remember_invite_code(code, group_id)
+    invalidate_membership(group_id, current_user.id)
+    return group
+
+
 @router.get("/{code}", response_model=GroupResponse)
 async def get_group_by_code(
     code: str,
@@ -60,18 +195,7 @@ async def get_group_by_code(
     db: AsyncSession = Depends(get_db),
 ):
     """Get group by invite code or group ID."""
-    # Try to parse as UUID first (for GET /groups/:id)
-    try:
-        group_id = uuid.UUID(code)
-        result = await db.execute(select(Group).where(Group.id == group_id))
-    except ValueError:
-        # Not a UUID, treat as invite code (for GET /groups/:code)
-        result = await db.execute(select(Group).where(Group.invite_code == code))
-
-    group = result.scalar_one_or_none()
-    if group is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
-    return group
+    return await _load_group_by_ref(db, code)
 
 
 @router.patch("/{code}", response_model=GroupResponse)
@@ -82,32 +206,15 @@ async def update_group_by_code(
     db: AsyncSession = Depends(get_db),
 ):
     """Update group by invite code or group ID (toggle debt_simplification)."""
-    # Try to parse as UUID first (for PATCH /groups/:id)
-    try:
-        group_id = uuid.UUID(code)
-        result = await db.execute(select(Group).where(Group.id == group_id))
-    except ValueError:
-        # Not a UUID, treat as invite code (for PATCH /groups/:code)
-        result = await db.execute(select(Group).where(Group.invite_code == code))
-
-    group = result.scalar_one_or_none()
-    if group is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+    group = await _load_group_by_ref(db, code)
 
     # Only allow group members to update
-    member_result = await db.execute(
-        select(GroupMember).where(
-            GroupMember.group_id == group.id,
-            GroupMember.user_id == current_user.id,
-        )
-    )
-    if member_result.scalar_one_or_none() is None:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, detail="You are not a member of this group"
-        )
+    await ensure_group_member(db, group.id, current_user.id)
 
     await db.execute(
-        update(Group).where(Group.id == group.id).values(debt_simplification=debt_simplification)
+        update(Group)
+        .where(Group.id == group.id)
+        .values(debt_simplification=debt_simplification, version=Group.version + 1)
     )
     await db.commit()
     await db.refresh(group)
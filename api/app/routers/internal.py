@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+
+from api.app import metrics
+from api.app.database import engine
+from api.app.db_pool import pool_status
+
+router = APIRouter(prefix="/internal", tags=["Internal"])
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """Per-process operational metrics (counters, gauges and timers)."""
+    return metrics.snapshot()
+
+
+@router.get("/pool")
+async def get_pool():
+    """Live state of this process's database connection pool and its checkout waits."""
+    return pool_status(engine.pool)
@@ -2,41 +2,39 @@ from __future__ import annotations
 
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.app.auth import get_current_user
+from api.app.balances import has_unsettled_balance
 from api.app.dependencies import get_db
-from api.app.models.group import Group
+from api.app.etag import (
+    bump_group_version,
+    etag_matches,
+    load_group_etag,
+    not_modified,
+    set_etag,
+)
+from api.app.invite_codes import invalidate_invite_code
+from api.app.membership import invalidate_membership, load_group_for_member
+from api.app.models.group import generate_invite_code
 from api.app.models.group_member import GroupMember
 from api.app.models.user import User as UserModel
-from api.app.schemas.member import AddMemberRequest, InviteCodeResponse, MemberResponse
+from api.app.pagination import after_cursor, paginate, parse_fields, trimmed_response
+from api.app.read_replica import get_read_db
+from api.app.schemas.member import (
+    AddMemberRequest,
+    BulkAddMembersRequest,
+    BulkAddMembersResponse,
+    InviteCodeResponse,
+    MemberResponse,
+)
+from api.app.sql_compat import upsert_insert
 
 router = APIRouter(prefix="/groups/{group_id}/members", tags=["Group Members"])
 
 
-async def _verify_group_exists(db: AsyncSession, group_id: uuid.UUID) -> None:
-    """Verify that a group exists, raise 404 if not."""
-    group = await db.get(Group, group_id)
-    if group is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
-
-
-async def _verify_user_in_group(db: AsyncSession, group_id: uuid.UUID, user_id: uuid.UUID) -> None:
-    """Verify that a user is a member of the group."""
-    result = await db.execute(
-        select(GroupMember).where(
-            GroupMember.group_id == group_id,
-            GroupMember.user_id == user_id,
-        )
-    )
-    if result.scalar_one_or_none() is None:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, detail="You are not a member of this group"
-        )
-
-
 async def _get_member_with_user(db: AsyncSession, member_id: uuid.UUID) -> dict | None:
     """Return a single member row joined with user info."""
     result = await db.execute(
@@ -76,35 +74,61 @@ async def _add_member_by_user_id(
 
     member = GroupMember(group_id=group_id, user_id=user_id)
     db.add(member)
+    await db.execute(bump_group_version(group_id))
     await db.commit()
+    invalidate_membership(group_id, user_id)
     await db.refresh(member)
     return member
 
 
+_MEMBER_COLUMNS = {
+    "id": GroupMember.id,
+    "group_id": GroupMember.group_id,
+    "user_id": GroupMember.user_id,
+    "joined_at": GroupMember.joined_at,
+    "user_name": UserModel.name.label("user_name"),
+    "user_email": UserModel.email.label("user_email"),
+}
+
+
 @router.get("", response_model=list[MemberResponse])
 async def get_members(
     group_id: uuid.UUID,
+    response: Response,
+    limit: int = Query(100, ge=1, le=500, description="Items per page"),
+    cursor: uuid.UUID | None = Query(None, description="X-Next-Cursor of the previous page"),
+    fields: str | None = Query(None, description="Comma-separated fields to return"),
+    if_none_match: str | None = Header(None),
     current_user: UserModel = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get list of users in a group. User must be a member to view."""
-    await _verify_group_exists(db, group_id)
-    await _verify_user_in_group(db, group_id, current_user.id)
+    """Get the users in a group in join order (keyset-paginated). User must be a member."""
+    selected = parse_fields(fields, _MEMBER_COLUMNS)
 
-    result = await db.execute(
-        select(
-            GroupMember.id,
-            GroupMember.group_id,
-            GroupMember.user_id,
-            GroupMember.joined_at,
-            UserModel.name.label("user_name"),
-            UserModel.email.label("user_email"),
-        )
-        .join(UserModel, UserModel.id == GroupMember.user_id)
+    # 404/403 checks and the group version in one lookup; unchanged polls stop here
+    etag = await load_group_etag(db, group_id, current_user.id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    # The id is always selected: it is the next page's cursor
+    names = ["id", *(f for f in selected if f != "id")] if selected else list(_MEMBER_COLUMNS)
+    query = (
+        select(*(_MEMBER_COLUMNS[name] for name in names))
         .where(GroupMember.group_id == group_id)
-        .order_by(GroupMember.joined_at)
+        .order_by(GroupMember.joined_at, GroupMember.id)
+        .limit(limit + 1)
     )
-    return [MemberResponse(**row._asdict()) for row in result.all()]
+    if {"user_name", "user_email"} & set(names):
+        query = query.join(UserModel, UserModel.id == GroupMember.user_id)
+    if cursor is not None:
+        query = query.where(after_cursor(GroupMember.joined_at, GroupMember.id, cursor))
+    result = await db.execute(query)
+
+    rows = paginate(result.all(), limit, response, lambda row: row.id)
+    if selected is not None:
+        return trimmed_response((row._mapping for row in rows), selected, response)
+    return [MemberResponse(**row._asdict()) for row in rows]
 
 
 @router.get("/invite", response_model=InviteCodeResponse)
@@ -114,10 +138,22 @@ async def get_invite_code(
     db: AsyncSession = Depends(get_db),
 ):
     """Get the invite code for a group. User must be a member."""
-    await _verify_group_exists(db, group_id)
-    await _verify_user_in_group(db, group_id, current_user.id)
+    group = await load_group_for_member(db, group_id, current_user.id)
+    return InviteCodeResponse(invite_code=group.invite_code)
+
 
-    group = await db.get(Group, group_id)
+@router.post("/invite/regenerate", response_model=InviteCodeResponse)
+async def regenerate_invite_code(
+    group_id: uuid.UUID,
+    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Replace the group's invite code, invalidating links with the old one. Requires membership."""
+    group = await load_group_for_member(db, group_id, current_user.id)
+    old_code = group.invite_code
+    group.invite_code = generate_invite_code()
+    await db.commit()
+    invalidate_invite_code(old_code)
     return InviteCodeResponse(invite_code=group.invite_code)
 
 
@@ -129,8 +165,7 @@ async def add_member(
     db: AsyncSession = Depends(get_db),
 ):
     """Add a user to a group by userId or email. Requires membership."""
-    await _verify_group_exists(db, group_id)
-    await _verify_user_in_group(db, group_id, current_user.id)
+    await load_group_for_member(db, group_id, current_user.id)
 
     if body.user_id is None and body.email is None:
         raise HTTPException(
@@ -156,6 +191,66 @@ async def add_member(
     return MemberResponse(**member_data)
 
 
+@router.post("/bulk", response_model=BulkAddMembersResponse, status_code=status.HTTP_201_CREATED)
+async def add_members_bulk(
+    group_id: uuid.UUID,
+    body: BulkAddMembersRequest,
+    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Add many users to a group by ids and/or emails. Requires membership.
+
+    Users already in the group and ids/emails that match no user are reported
+    separately instead of failing the request.
+    """
+    await load_group_for_member(db, group_id, current_user.id)
+
+    if not body.user_ids and not body.emails:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide user_ids and/or emails",
+        )
+
+    # Resolve every id and email with one IN query
+    result = await db.execute(
+        select(UserModel.id, UserModel.name, UserModel.email).where(
+            or_(UserModel.id.in_(body.user_ids), UserModel.email.in_(body.emails))
+        )
+    )
+    users = {row.id: row for row in result.all()}
+    found_emails = {row.email for row in users.values()}
+
+    added: list[MemberResponse] = []
+    if users:
+        inserted = await db.execute(
+            upsert_insert(db, GroupMember)
+            .values([{"group_id": group_id, "user_id": user_id} for user_id in users])
+            .on_conflict_do_nothing(index_elements=["group_id", "user_id"])
+            .returning(
+                GroupMember.id, GroupMember.group_id, GroupMember.user_id, GroupMember.joined_at
+            )
+        )
+        for row in inserted.all():
+            user = users[row.user_id]
+            added.append(
+                MemberResponse(**row._asdict(), user_name=user.name, user_email=user.email)
+            )
+
+    if added:
+        await db.execute(bump_group_version(group_id))
+    await db.commit()
+    for member in added:
+        invalidate_membership(group_id, member.user_id)
+
+    added_ids = {member.user_id for member in added}
+    return BulkAddMembersResponse(
+        added=added,
+        already_members=[user_id for user_id in users if user_id not in added_ids],
+        not_found_user_ids=[user_id for user_id in body.user_ids if user_id not in users],
+        not_found_emails=[email for email in body.emails if email not in found_emails],
+    )
+
+
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def remove_member(
     group_id: uuid.UUID,
@@ -163,9 +258,8 @@ async def remove_member(
     current_user: UserModel = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Remove a user from the group. Must be a member to remove others."""
-    await _verify_group_exists(db, group_id)
-    await _verify_user_in_group(db, group_id, current_user.id)
+    """Remove a user from the group. Must be a member; the user's balance must be settled."""
+    await load_group_for_member(db, group_id, current_user.id)
 
     result = await db.execute(
         select(GroupMember).where(
@@ -178,6 +272,13 @@ async def remove_member(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User is not a member of this group"
         )
+    if await has_unsettled_balance(db, group_id, user_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="User has unsettled debts in this group",
+        )
 
     await db.delete(member)
+    await db.execute(bump_group_version(group_id))
     await db.commit()
+    invalidate_membership(group_id, user_id)
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import uuid
+
+from pydantic import BaseModel, EmailStr, Field
+
+from api.app.schemas.auth import UserResponse
+
+MAX_BULK_USERS = 5000
+
+# ── Requests ──────────────────────────────────────────────────────────────────
+
+
+class BulkUser(BaseModel):
+    name: str
+    email: EmailStr
+    password: str
+
+
+class BulkProvisionRequest(BaseModel):
+    users: list[BulkUser] = Field(min_length=1, max_length=MAX_BULK_USERS)
+    # Add every user in the batch (new or existing) to this group
+    group_id: uuid.UUID | None = None
+
+
+# ── Responses ─────────────────────────────────────────────────────────────────
+
+
+class BulkProvisionResponse(BaseModel):
+    created: list[UserResponse]
+    existing_emails: list[str]
+    added_to_group: int
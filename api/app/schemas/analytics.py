@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from pydantic import BaseModel
+
+# ── Responses ─────────────────────────────────────────────────────────────────
+
+
+class SpendingBucket(BaseModel):
+    """Spending in one category during one calendar month."""
+
+    category: str
+    month: date
+    total: Decimal
+    # Only reported for group-wide analytics
+    expense_count: int | None = None
+
+
+class CategorySpending(BaseModel):
+    category: str
+    total: Decimal
+
+
+class MonthSpending(BaseModel):
+    month: date
+    total: Decimal
+
+
+class SpendingAnalyticsResponse(BaseModel):
+    """Spending totals for a group, or for one member's share of it."""
+
+    group_id: uuid.UUID
+    user_id: uuid.UUID | None = None
+    total: Decimal
+    by_category: list[CategorySpending]
+    by_month: list[MonthSpending]
+    buckets: list[SpendingBucket]
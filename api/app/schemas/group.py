@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
+from decimal import Decimal
 
 from pydantic import BaseModel
 
@@ -31,3 +32,14 @@ class GroupResponse(BaseModel):
     debt_simplification: bool  # NEW FIELD
 
     model_config = {"from_attributes": True}
+
+
+class GroupDashboardResponse(GroupResponse):
+    """A group with the summary figures shown on the home screen."""
+
+    member_count: int
+    expense_count: int
+    # Latest expense or settlement, or the group's creation if there is none
+    last_activity_at: datetime
+    # Positive: the caller is owed money in this group; negative: the caller owes
+    net_balance: Decimal
@@ -3,7 +3,9 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
+
+MAX_BULK_MEMBERS = 1000
 
 # ── Requests ──────────────────────────────────────────────────────────────────
 
@@ -13,6 +15,11 @@ class AddMemberRequest(BaseModel):
     email: EmailStr | None = None
 
 
+class BulkAddMembersRequest(BaseModel):
+    user_ids: list[uuid.UUID] = Field(default_factory=list, max_length=MAX_BULK_MEMBERS)
+    emails: list[EmailStr] = Field(default_factory=list, max_length=MAX_BULK_MEMBERS)
+
+
 # ── Responses ─────────────────────────────────────────────────────────────────
 
 
@@ -30,3 +37,11 @@ class MemberResponse(BaseModel):
 
 class InviteCodeResponse(BaseModel):
     invite_code: str
+
+
+class BulkAddMembersResponse(BaseModel):
+    added: list[MemberResponse]
+    # User ids that were already in the group
+    already_members: list[uuid.UUID]
+    not_found_user_ids: list[uuid.UUID]
+    not_found_emails: list[str]
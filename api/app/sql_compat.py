@@ -0,0 +1,83 @@
+"""Dialect-portable SQL constructs.
+
+Production runs on PostgreSQL while the test-suite runs on SQLite, so the few
+non-standard functions we rely on are expressed as small compiler extensions
+that render the native spelling for each backend.
+"""
+
+from sqlalchemy import TextClause, literal_column, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import JSON
+
+
+class json_object(FunctionElement):
+    """Build a JSON object from alternating key/value arguments."""
+
+    type = JSON()
+    name = "json_object"
+    inherit_cache = True
+
+
+class json_array_agg(FunctionElement):
+    """Aggregate the input rows into a JSON array (NULL/empty when no rows)."""
+
+    type = JSON()
+    name = "json_array_agg"
+    inherit_cache = True
+
+
+@compiles(json_object, "postgresql")
+def _compile_json_object_pg(element, compiler, **kw):
+    return f"json_build_object({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(json_object)
+def _compile_json_object(element, compiler, **kw):
+    return f"json_object({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(json_array_agg, "postgresql")
+def _compile_json_array_agg_pg(element, compiler, **kw):
+    return f"json_agg({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(json_array_agg)
+def _compile_json_array_agg(element, compiler, **kw):
+    return f"json_group_array({compiler.process(element.clauses, **kw)})"
+
+
+def json_object_from(**columns) -> json_object:
+    """Build a ``json_object`` from keyword arguments.
+
+    Keys are rendered as SQL string literals rather than bound parameters:
+    ``json_build_object`` is variadic, so asyncpg cannot infer a type for them.
+    """
+    args = []
+    for key, column in columns.items():
+        args.extend([literal_column(f"'{key}'"), column])
+    return json_object(*args)
+
+
+def upsert_insert(db, table):
+    """Return an INSERT for `table` that supports ``on_conflict_do_*`` on `db`'s backend."""
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(table)
+    return postgresql.insert(table)
+
+
+def explain(statement, dialect) -> TextClause:
+    """Return a statement that fetches `statement`'s query plan on `dialect`.
+
+    Parameters are rendered inline so the plan reflects the actual values, which
+    needs the dialect of a live connection (it knows how the server escapes
+    strings).
+    """
+    sql = str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    if dialect.paramstyle in ("format", "pyformat"):
+        # text() escapes percent signs for the driver itself.
+        sql = sql.replace("%%", "%")
+    prefix = "EXPLAIN" if dialect.name == "postgresql" else "EXPLAIN QUERY PLAN"
+    # Escape colons so text() does not read literals like ':x' as bind parameters.
+    return text(f"{prefix} {sql}".replace(":", r"\:"))
@@ -0,0 +1,73 @@
+"""Database preparation done once when a worker starts (``DB_STARTUP_MODE``).
+
+- ``create_all``: create missing tables from the models. Convenient in
+  development, but it inspects the catalog for every table on each boot.
+- ``check_revision``: a single ``alembic_version`` query, compared with the
+  migration heads on disk. Migrations are applied by the deploy, not by workers.
+- ``skip``: no database access at all; the first request opens the first
+  connection.
+
+With ``DB_STARTUP_FAIL_FAST`` a database that is unreachable or not at the
+expected revision stops the worker from starting; otherwise it is logged and
+the worker starts anyway.
+"""
+
+import logging
+from functools import lru_cache
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from api.app.database import Base
+
+STARTUP_MODES = ("create_all", "check_revision", "skip")
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def expected_heads() -> frozenset[str]:
+    """Head revisions of the migration scripts shipped with this code."""
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    return frozenset(ScriptDirectory.from_config(Config(str(ALEMBIC_INI))).get_heads())
+
+
+def verify_revision(connection) -> None:
+    """Raise RuntimeError unless the database behind `connection` is at the migration heads."""
+    from alembic.runtime.migration import MigrationContext
+
+    current = frozenset(MigrationContext.configure(connection).get_current_heads())
+    expected = expected_heads()
+    if current != expected:
+        raise RuntimeError(
+            f"Database is at revision {', '.join(sorted(current)) or '<none>'}, "
+            f"expected {', '.join(sorted(expected))}. Run `alembic upgrade head` "
+            "(from api/) before starting the API."
+        )
+
+
+async def prepare_database(engine: AsyncEngine, mode: str, fail_fast: bool = True) -> None:
+    """Run the startup step for `mode`; see the module docstring."""
+    if mode not in STARTUP_MODES:
+        raise RuntimeError(
+            f"Unknown DB_STARTUP_MODE {mode!r}; expected one of {', '.join(STARTUP_MODES)}"
+        )
+    if mode == "skip":
+        return
+    try:
+        if mode == "create_all":
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+        else:
+            async with engine.connect() as conn:
+                await conn.run_sync(verify_revision)
+    except Exception:
+        if fail_fast:
+            raise
+        logger.exception(
+            "Database startup check failed (DB_STARTUP_MODE=%s); starting anyway", mode
+        )
@@ -0,0 +1,60 @@
+"""Revocation of stateless access tokens.
+
+Every token carries its user's ``token_version`` as the ``ver`` claim, and
+revoking a user's sessions bumps that version and stamps ``tokens_revoked_at``.
+In stateless auth mode the current versions are not read per request: each
+worker keeps the versions of users who revoked within the last access-token
+lifetime in memory and reloads them every
+`MyVariables.token_revocation_refresh_seconds`, so a revocation made on another
+worker takes effect within that interval. Tokens issued before an older
+revocation have expired anyway, so the set stays small however many users ever
+revoked.
+"""
+
+import inspect
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.app.models.user import User
+from api.app.variables import MyVariables
+
+
+class TokenVersionDenylist:
+    """Minimum accepted token version per user, for users that revoked tokens."""
+
+    def __init__(self, refresh_seconds: float) -> None:
+        self.refresh_seconds = refresh_seconds
+        self._min_versions: dict[uuid.UUID, int] = {}
+        self._loaded_at: float | None = None
+
+    def is_revoked(self, user_id: uuid.UUID, version: int) -> bool:
+        return version < self._min_versions.get(user_id, 0)
+
+    def revoke(self, user_id: uuid.UUID, current_version: int) -> None:
+        """Apply a revocation made by this process without waiting for a refresh."""
+        self._min_versions[user_id] = max(self._min_versions.get(user_id, 0), current_version)
+
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at >= self.refresh_seconds
+
+    async def refresh_if_stale(self, db: AsyncSession) -> None:
+        if not self.is_stale():
+            return
+        cutoff = datetime.now(UTC) - timedelta(minutes=MyVariables.jwt_access_token_expire_minutes)
+        execution = db.execute(
+            select(User.id, User.token_version).where(User.tokens_revoked_at > cutoff)
+        )
+        result = await execution if inspect.isawaitable(execution) else execution
+        self._min_versions = {row.id: row.token_version for row in result.all()}
+        self._loaded_at = time.monotonic()
+
+    def clear(self) -> None:
+        self._min_versions.clear()
+        self._loaded_at = None
+
+
+token_denylist = TokenVersionDenylist(MyVariables.token_revocation_refresh_seconds)
@@ -2,14 +2,17 @@ import os
 from pathlib import Path
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
-from dotenv import load_dotenv
-
 # Load .env files using stable paths (independent of current working directory).
+# python-dotenv is only imported when there is a file to load; deployments that
+# set real environment variables skip it.
 _CURRENT_FILE = Path(__file__).resolve()
 _API_DIR = _CURRENT_FILE.parents[1]
 _PROJECT_ROOT = _CURRENT_FILE.parents[2]
-load_dotenv(_PROJECT_ROOT / ".env")
-load_dotenv(_API_DIR / ".env", override=True)
+for _env_file, _override in ((_PROJECT_ROOT / ".env", False), (_API_DIR / ".env", True)):
+    if _env_file.is_file():
+        from dotenv import load_dotenv
+
+        load_dotenv(_env_file, override=_override)
 
 
 def _strip_query_params(url: str, params_to_strip: list[str]) -> str:
@@ -43,6 +46,20 @@ class MyVariables:
         else None
     )
 
+    # Optional read replica for read-only endpoints (same URL format as DATABASE_URL)
+    replica_database_url = os.getenv("REPLICA_DATABASE_URL") or None
+    replica_async_database_url = (
+        _strip_query_params(
+            replica_database_url.replace("postgresql://", "postgresql+asyncpg://", 1),
+            ["sslmode", "channel_binding"],
+        )
+        if replica_database_url
+        else None
+    )
+    # After a user writes, their reads stay on the primary for this many seconds
+    # (per worker process); keep it above the replica's usual lag
+    replica_freshness_seconds = float(os.getenv("REPLICA_FRESHNESS_SECONDS", "5"))
+
     # psycopg2 driver for seeds/scripts (keeps sslmode in the URL)
     sync_database_url = (
         database_url.replace("postgresql://", "postgresql+psycopg2://", 1) if database_url else None
@@ -56,6 +73,32 @@ class MyVariables:
     )
     db_ssl_verify = os.getenv("DB_SSL_VERIFY", _default_ssl_verify).lower() == "true"
 
+    # Connection pool (per worker process; see GET /internal/pool to size it)
+    db_pool_size = int(os.getenv("DB_POOL_SIZE", "5"))
+    # Extra connections opened under load and closed when returned
+    db_max_overflow = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    # Seconds a request waits for a connection before failing
+    db_pool_timeout = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    # Reopen connections older than this many seconds (-1 never)
+    db_pool_recycle = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    # Test each connection with a round trip on checkout
+    db_pool_pre_ping = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    # Prepared statements cached per connection by asyncpg and by SQLAlchemy;
+    # set to 0 behind PgBouncer in transaction pooling mode
+    db_statement_cache_size = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+
+    # What each worker does with the database on startup: "create_all" (create
+    # missing tables), "check_revision" (compare alembic_version with the
+    # migration heads) or "skip". create_all is the default only in development.
+    db_startup_mode = os.getenv(
+        "DB_STARTUP_MODE",
+        "create_all"
+        if os.getenv("ENVIRONMENT", "development").lower() == "development"
+        else "check_revision",
+    ).lower()
+    # Refuse to start when the startup step fails, instead of logging it
+    db_startup_fail_fast = os.getenv("DB_STARTUP_FAIL_FAST", "true").lower() == "true"
+
     # ────────────────────────────────────────────────────────────────────────────
     # JWT Authentication Configuration
     # ────────────────────────────────────────────────────────────────────────────
@@ -64,6 +107,72 @@ class MyVariables:
     jwt_access_token_expire_minutes = int(
         os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "1440")
     )  # 24 hours
+    # "database" loads the user on each request; "stateless" trusts the signed
+    # claims (id, name, email, token version) and skips the database
+    auth_mode = os.getenv("AUTH_MODE", "database").lower()
+    # How often stateless mode reloads the revoked token versions
+    token_revocation_refresh_seconds = int(os.getenv("TOKEN_REVOCATION_REFRESH_SECONDS", "30"))
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # Password Hashing
+    # ────────────────────────────────────────────────────────────────────────────
+    # Threads dedicated to bcrypt (per worker process)
+    password_hash_workers = int(
+        os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))
+    )
+    # Hashing calls allowed to wait for a thread before new ones get 503
+    password_hash_max_queue = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+    # passlib scheme for new hashes; hashes in other schemes are upgraded at login
+    password_hash_scheme = os.getenv("PASSWORD_HASH_SCHEME", "bcrypt")
+    # Cost for the scheme (bcrypt: log2 rounds). Unset uses passlib's default.
+    # Hashes below this cost are re-hashed at login.
+    # Pick a value with scripts/calibrate_password_hash.py.
+    _password_hash_rounds = os.getenv("PASSWORD_HASH_ROUNDS")
+    password_hash_rounds = int(_password_hash_rounds) if _password_hash_rounds else None
+    # Processes used to hash passwords for bulk user provisioning
+    bulk_hash_processes = int(os.getenv("BULK_HASH_PROCESSES", str(os.cpu_count() or 1)))
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # Login Rate Limiting
+    # ────────────────────────────────────────────────────────────────────────────
+    # Token buckets per client IP and per email: burst size and refill per minute
+    login_rate_limit_ip_burst = int(os.getenv("LOGIN_RATE_LIMIT_IP_BURST", "30"))
+    login_rate_limit_ip_per_minute = float(os.getenv("LOGIN_RATE_LIMIT_IP_PER_MINUTE", "30"))
+    login_rate_limit_email_burst = int(os.getenv("LOGIN_RATE_LIMIT_EMAIL_BURST", "10"))
+    login_rate_limit_email_per_minute = float(os.getenv("LOGIN_RATE_LIMIT_EMAIL_PER_MINUTE", "5"))
+    # Reverse proxies (IPs or CIDRs, comma-separated) whose X-Forwarded-For names the
+    # client. Empty: the connecting address is the client.
+    trusted_proxies = [p.strip() for p in os.getenv("TRUSTED_PROXIES", "").split(",") if p.strip()]
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # Authenticated User Cache
+    # ────────────────────────────────────────────────────────────────────────────
+    # Users kept in process memory by get_current_user (0 disables the cache)
+    user_cache_size = int(os.getenv("USER_CACHE_SIZE", "10000"))
+    # Upper bound on how stale a cached user can be in another worker process
+    user_cache_ttl_seconds = int(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+    # Verified access tokens kept in memory so repeat requests skip signature checks
+    token_cache_size = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # Group Membership Cache
+    # ────────────────────────────────────────────────────────────────────────────
+    # (user, group) memberships kept in process memory (0 disables the cache)
+    membership_cache_size = int(os.getenv("MEMBERSHIP_CACHE_SIZE", "50000"))
+    # How long another worker may still admit a member removed elsewhere
+    membership_cache_ttl_seconds = int(os.getenv("MEMBERSHIP_CACHE_TTL_SECONDS", "30"))
+    # Invite code -> group id resolutions kept in process memory (0 disables the cache)
+    invite_code_cache_size = int(os.getenv("INVITE_CODE_CACHE_SIZE", "10000"))
+    # How long another worker may still resolve a code regenerated elsewhere
+    invite_code_cache_ttl_seconds = int(os.getenv("INVITE_CODE_CACHE_TTL_SECONDS", "60"))
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # Idempotency Keys
+    # ────────────────────────────────────────────────────────────────────────────
+    # How long a stored response can be replayed for the same Idempotency-Key
+    idempotency_key_ttl_hours = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+    # Most recently used keys kept in process memory (per worker)
+    idempotency_cache_size = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
 
     # ────────────────────────────────────────────────────────────────────────────
     # Application Configuration
@@ -78,6 +187,18 @@ class MyVariables:
     environment = os.getenv("ENVIRONMENT", "development")
     debug = os.getenv("DEBUG", "true").lower() == "true"
 
+    # Key required in the X-Admin-Key header by /admin/* endpoints (unset disables them)
+    admin_api_key = os.getenv("ADMIN_API_KEY", "")
+
+    # Expose /internal/* operational endpoints (metrics). Defaults to on only in development.
+    internal_endpoints_enabled = (
+        os.getenv(
+            "INTERNAL_ENDPOINTS_ENABLED",
+            "true" if environment.lower() == "development" else "false",
+        ).lower()
+        == "true"
+    )
+
     # ────────────────────────────────────────────────────────────────────────────
     # Server Configuration
     # ────────────────────────────────────────────────────────────────────────────
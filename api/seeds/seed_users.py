@@ -1,6 +1,6 @@
 from api.app.database import Session
 from api.app.models.user import User
-from api.app.routers.auth import hash_password
+from api.app.passwords import hash_password
 
 
 def seed_users():
@@ -1,15 +1,46 @@
-from domain import Expense
+from domain import Expense, User
 
 
 class ExpenseRepository:
     def __init__(self) -> None:
         self._expenses: dict[str, Expense] = {}
+        # Running net balance per group and user, kept in step with every save
+        self._balances: dict[str, dict[User, float]] = {}
+        # What each saved expense contributed to the balances, to undo on re-save
+        self._applied: dict[str, tuple[str, dict[User, float]]] = {}
 
     def save(self, expense: Expense) -> None:
         self._expenses[expense.id] = expense
 
+        previous = self._applied.get(expense.id)
+        if previous is not None:
+            self._apply(previous[0], previous[1], sign=-1)
+        deltas = self._balance_deltas(expense)
+        self._applied[expense.id] = (expense.group_id, deltas)
+        self._apply(expense.group_id, deltas, sign=1)
+
     def find_by_id(self, expense_id: str) -> Expense | None:
         return self._expenses.get(expense_id)
 
     def find_by_group_id(self, group_id: str) -> list[Expense]:
         return [e for e in self._expenses.values() if e.group_id == group_id]
+
+    def balance_of(self, group_id: str, user: User) -> float:
+        """Net balance of `user` in the group: positive if owed money, negative if owing."""
+        return self._balances.get(group_id, {}).get(user, 0.0)
+
+    @staticmethod
+    def _balance_deltas(expense: Expense) -> dict[User, float]:
+        share = expense.amount / len(expense.debtors)
+        deltas: dict[User, float] = {}
+        for debtor in expense.debtors:
+            if debtor == expense.payer:
+                continue
+            deltas[debtor] = deltas.get(debtor, 0.0) - share
+            deltas[expense.payer] = deltas.get(expense.payer, 0.0) + share
+        return deltas
+
+    def _apply(self, group_id: str, deltas: dict[User, float], sign: int) -> None:
+        balances = self._balances.setdefault(group_id, {})
+        for user, delta in deltas.items():
+            balances[user] = balances.get(user, 0.0) + sign * delta
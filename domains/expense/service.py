@@ -44,6 +44,11 @@ class ExpenseService:
         expenses = self._expense_repo.find_by_group_id(group_id)
         return self._calculate_debt_matrix(expenses)
 
+    def get_balance(self, group_id: str, user: User) -> float:
+        """Net balance of `user` in the group, read from the repository's running totals."""
+        self._get_group_or_raise(group_id)
+        return round(self._expense_repo.balance_of(group_id, user), 2)
+
     def settle_up(self, group_id: str, payer: User, payee: User, amount: float) -> Expense:
         self._get_group_or_raise(group_id)
         expenses = self._expense_repo.find_by_group_id(group_id)
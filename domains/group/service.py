@@ -27,6 +27,10 @@ class GroupService:
     def drop_out_from_group(self, group_id: str, user: User) -> Group:
         group = self._get_group_or_raise(group_id)
 
+        # A non-zero net balance is an O(1) rejection; a zero one can still hide
+        # debts that cancel out across different members, so check each pair.
+        if abs(self._expense_service.get_balance(group_id, user)) > 0.005:
+            raise ValueError(f"User '{user.name}' has unsettled debts.")
         debts = self._expense_service.calculate_debts(group_id)
         for (debtor, creditor), amount in debts.items():
             if (debtor == user or creditor == user) and amount > 0.005:
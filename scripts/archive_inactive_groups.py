@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Archive Inactive Groups
+
+Moves the expenses and debts of fully settled groups that have had no expense
+for ``--idle-months`` into compressed archive rows (``group_archives``). Each
+group is archived in its own transaction. Archived groups are restored
+automatically when their expenses or debts are read; ``--restore`` does it by
+hand.
+
+On PostgreSQL the size of the hot tables and their indexes is printed before
+and after. Deleted rows only become reusable space after VACUUM (``--vacuum``
+runs it); indexes shrink on disk only when rebuilt (REINDEX).
+
+Usage:
+    python3 scripts/archive_inactive_groups.py --dry-run
+    python3 scripts/archive_inactive_groups.py --idle-months 12 --limit 500 --vacuum
+    python3 scripts/archive_inactive_groups.py --restore <group-uuid>
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import text  # noqa: E402
+
+from api.app.archival import (  # noqa: E402
+    archive_group,
+    find_archivable_groups,
+    idle_cutoff,
+    restore_group,
+)
+from api.app.database import AsyncSessionLocal, engine  # noqa: E402
+
+HOT_TABLES = ("expenses", "expense_shares")
+
+
+async def table_sizes() -> dict[str, tuple[int, int]] | None:
+    """(heap bytes, index bytes) per hot table, or None when not on PostgreSQL."""
+    if engine.dialect.name != "postgresql":
+        return None
+    async with engine.connect() as conn:
+        sizes = {}
+        for table in HOT_TABLES:
+            result = await conn.execute(
+                text("SELECT pg_relation_size(:t), pg_indexes_size(:t)"), {"t": table}
+            )
+            sizes[table] = tuple(result.one())
+        return sizes
+
+
+def print_sizes(label: str, sizes: dict[str, tuple[int, int]] | None) -> None:
+    if sizes is None:
+        return
+    print(f"{label}:")
+    for table, (heap, indexes) in sizes.items():
+        print(f"  {table:<16} table {heap / 2**20:10.2f} MiB   indexes {indexes / 2**20:10.2f} MiB")
+
+
+async def vacuum() -> None:
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for table in HOT_TABLES:
+            await conn.execute(text(f"VACUUM (ANALYZE) {table}"))
+
+
+async def run_archive(idle_months: int, limit: int | None, dry_run: bool, do_vacuum: bool) -> None:
+    idle_since = idle_cutoff(idle_months)
+    before = await table_sizes()
+    print_sizes("Before", before)
+
+    async with AsyncSessionLocal() as session:
+        group_ids = await find_archivable_groups(session, idle_since, limit)
+    print(f"{len(group_ids)} settled groups idle since {idle_since:%Y-%m-%d}")
+    if dry_run or not group_ids:
+        await engine.dispose()
+        return
+
+    start = time.perf_counter()
+    archived_groups = archived_expenses = 0
+    for group_id in group_ids:
+        async with AsyncSessionLocal() as session:
+            count = await archive_group(session, group_id, idle_since)
+            await session.commit()
+        if count:
+            archived_groups += 1
+            archived_expenses += count
+    print(
+        f"✅ Archived {archived_groups} groups ({archived_expenses} expenses) "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+
+    if do_vacuum and engine.dialect.name == "postgresql":
+        await vacuum()
+    print_sizes("After", await table_sizes())
+    await engine.dispose()
+
+
+async def run_restore(group_id: uuid.UUID) -> None:
+    async with AsyncSessionLocal() as session:
+        count = await restore_group(session, group_id)
+        await session.commit()
+    await engine.dispose()
+    print(f"✅ Restored {count} expenses for group {group_id}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--idle-months", type=int, default=6)
+    parser.add_argument("--limit", type=int, default=None, help="archive at most this many groups")
+    parser.add_argument("--dry-run", action="store_true", help="only count qualifying groups")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM the hot tables afterwards")
+    parser.add_argument("--restore", type=uuid.UUID, metavar="GROUP_ID", default=None)
+    args = parser.parse_args()
+    if args.idle_months < 1:
+        parser.error("--idle-months must be at least 1")
+
+    if args.restore is not None:
+        asyncio.run(run_restore(args.restore))
+    else:
+        asyncio.run(run_archive(args.idle_months, args.limit, args.dry_run, args.vacuum))
+
+
+if __name__ == "__main__":
+    main()
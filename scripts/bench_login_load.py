@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Login Load Benchmark
+
+Checks that bcrypt work on the login path does not stall the event loop. The
+script probes a cheap endpoint (``GET /``) while idle, then again while a burst
+of concurrent logins is running, and prints the probe latency percentiles for
+both phases. With hashing on the worker pool the probe p99 should stay close to
+its idle value; rejected logins (503) mean the hashing queue was full.
+
+Usage:
+    python3 scripts/bench_login_load.py
+    python3 scripts/bench_login_load.py --url http://localhost:8000 --logins 200 --concurrency 50
+
+Run it against a server started with ``uvicorn api.app.main:app`` (a single
+worker gives the clearest signal). A throwaway user is registered on each run.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def describe(label: str, samples: list[float]) -> None:
+    ms = [s * 1000 for s in samples]
+    print(
+        f"{label:<14} n={len(ms):<5} p50={statistics.median(ms):8.2f} ms  "
+        f"p99={percentile(ms, 99):8.2f} ms  max={max(ms):8.2f} ms"
+    )
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event, interval: float) -> list[float]:
+    samples = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get("/")
+        response.raise_for_status()
+        samples.append(time.perf_counter() - started)
+        await asyncio.sleep(interval)
+    return samples
+
+
+async def run(args: argparse.Namespace) -> None:
+    email = f"load-{uuid.uuid4().hex[:10]}@example.com"
+    password = "load-test-password"
+    limits = httpx.Limits(max_connections=args.concurrency + 2)
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=60, limits=limits) as client:
+        response = await client.post(
+            "/auth/register", json={"name": "Load Test", "email": email, "password": password}
+        )
+        response.raise_for_status()
+
+        stop = asyncio.Event()
+        idle_task = asyncio.create_task(probe(client, stop, args.interval))
+        await asyncio.sleep(args.idle_seconds)
+        stop.set()
+        idle = await idle_task
+
+        semaphore = asyncio.Semaphore(args.concurrency)
+        statuses: dict[int, int] = {}
+        login_latencies: list[float] = []
+
+        async def login() -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post(
+                    "/auth/login", json={"email": email, "password": password}
+                )
+                login_latencies.append(time.perf_counter() - started)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        stop = asyncio.Event()
+        busy_task = asyncio.create_task(probe(client, stop, args.interval))
+        started = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(args.logins)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        busy = await busy_task
+
+    print(f"{args.logins} logins, concurrency {args.concurrency}, {elapsed:.2f}s")
+    print(f"login statuses: {dict(sorted(statuses.items()))}")
+    describe("probe idle", idle)
+    describe("probe busy", busy)
+    describe("login", login_latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=25)
+    parser.add_argument("--interval", type=float, default=0.01, help="seconds between probes")
+    parser.add_argument("--idle-seconds", type=float, default=2.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
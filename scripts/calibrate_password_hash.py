@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Password Hash Calibration
+
+Finds the password hash cost that makes one verification take about
+``--target-ms`` on this machine, and prints the PASSWORD_HASH_ROUNDS setting to
+use. Run it on the production hardware: the right cost depends on the CPU.
+
+bcrypt's cost is logarithmic, so its candidates are tried one step at a time.
+For iteration-count schemes (pbkdf2_*, sha*_crypt) the cost is linear and is
+extrapolated from a timed sample.
+
+Usage:
+    python3 scripts/calibrate_password_hash.py
+    python3 scripts/calibrate_password_hash.py --target-ms 250 --scheme bcrypt
+    python3 scripts/calibrate_password_hash.py --scheme pbkdf2_sha256 --target-ms 100
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from api.app.passwords import build_context  # noqa: E402
+
+SAMPLE_PASSWORD = "calibration-password"
+LOG_COST_SCHEMES = {"bcrypt": (4, 31)}
+
+
+def verify_ms(scheme: str, rounds: int, samples: int) -> float:
+    """Median time of one verification at `rounds`, in milliseconds."""
+    context = build_context(scheme, rounds)
+    hashed = context.hash(SAMPLE_PASSWORD)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.verify(SAMPLE_PASSWORD, hashed)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate_log_cost(scheme: str, target_ms: float, samples: int) -> int:
+    low, high = LOG_COST_SCHEMES[scheme]
+    chosen = low
+    for rounds in range(low, high + 1):
+        elapsed = verify_ms(scheme, rounds, samples)
+        print(f"  rounds={rounds:<3} {elapsed:9.1f} ms")
+        if elapsed > target_ms:
+            break
+        chosen = rounds
+    return chosen
+
+
+def calibrate_linear_cost(scheme: str, target_ms: float, samples: int) -> int:
+    context = build_context(scheme)
+    handler = context.handler(scheme)
+    base = handler.default_rounds
+    elapsed = verify_ms(scheme, base, samples)
+    print(f"  rounds={base:<9} {elapsed:9.1f} ms")
+    rounds = max(handler.min_rounds, int(base * target_ms / elapsed))
+    return min(rounds, handler.max_rounds)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scheme", default="bcrypt")
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument("--samples", type=int, default=3, help="verifications timed per cost")
+    args = parser.parse_args()
+
+    print(f"Calibrating {args.scheme} for ~{args.target_ms:.0f} ms per verification")
+    if args.scheme in LOG_COST_SCHEMES:
+        rounds = calibrate_log_cost(args.scheme, args.target_ms, args.samples)
+    else:
+        rounds = calibrate_linear_cost(args.scheme, args.target_ms, args.samples)
+        print(f"  check: rounds={rounds} -> {verify_ms(args.scheme, rounds, args.samples):.1f} ms")
+
+    print()
+    print(f"PASSWORD_HASH_SCHEME={args.scheme}")
+    print(f"PASSWORD_HASH_ROUNDS={rounds}")
+
+
+if __name__ == "__main__":
+    main()
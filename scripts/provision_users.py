@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Bulk User Provisioning
+
+Creates users from a CSV file with ``name,email,password`` columns (header row
+required), skipping emails that are already registered. Each batch is hashed
+across a process pool and written in one transaction. With ``--group-id`` every
+user in the file is also added to that group.
+
+Usage:
+    python3 scripts/provision_users.py users.csv
+    python3 scripts/provision_users.py users.csv --group-id <uuid> --batch-size 500
+"""
+
+import argparse
+import asyncio
+import csv
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from api.app.database import AsyncSessionLocal, engine  # noqa: E402
+from api.app.provisioning import GroupNotFoundError, NewUser, provision_users  # noqa: E402
+from api.app.schemas.admin import MAX_BULK_USERS  # noqa: E402
+
+
+def read_users(path: Path) -> list[NewUser]:
+    with path.open(newline="") as f:
+        return [
+            NewUser(name=row["name"], email=row["email"].strip(), password=row["password"])
+            for row in csv.DictReader(f)
+        ]
+
+
+async def run(path: Path, group_id: uuid.UUID | None, batch_size: int) -> None:
+    users = read_users(path)
+    start = time.perf_counter()
+    created = existing = added = 0
+    async with AsyncSessionLocal() as session:
+        for i in range(0, len(users), batch_size):
+            result = await provision_users(session, users[i : i + batch_size], group_id)
+            await session.commit()
+            created += len(result.created)
+            existing += len(result.existing_emails)
+            added += result.added_to_group
+            print(f"  {min(i + batch_size, len(users))}/{len(users)} processed")
+    await engine.dispose()
+    print(
+        f"✅ Created {created} users, skipped {existing} existing"
+        + (f", added {added} to group {group_id}" if group_id else "")
+        + f" in {time.perf_counter() - start:.2f}s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Create users in bulk from a CSV file.")
+    parser.add_argument("csv_file", type=Path)
+    parser.add_argument("--group-id", type=uuid.UUID, default=None)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    if not 1 <= args.batch_size <= MAX_BULK_USERS:
+        parser.error(f"--batch-size must be between 1 and {MAX_BULK_USERS}")
+    try:
+        asyncio.run(run(args.csv_file, args.group_id, args.batch_size))
+    except GroupNotFoundError:
+        sys.exit(f"❌ Group {args.group_id} not found")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Rebuild Spending Rollups
+
+Recomputes `group_spending_rollups` and `user_spending_rollups` from the raw
+expense history. Run it after backfills, manual data fixes, or when adding the
+rollup tables to an existing database.
+
+Usage:
+    python3 scripts/rebuild_spending_rollups.py
+    python3 scripts/rebuild_spending_rollups.py --group-id <uuid>
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from api.app.database import AsyncSessionLocal, engine  # noqa: E402
+from api.app.rollups import rebuild_spending_rollups  # noqa: E402
+
+
+async def run(group_id: uuid.UUID | None) -> None:
+    start = time.perf_counter()
+    async with AsyncSessionLocal() as session:
+        processed = await rebuild_spending_rollups(session, group_id)
+    await engine.dispose()
+    scope = f"group {group_id}" if group_id else "all groups"
+    print(
+        f"✅ Rebuilt rollups for {scope}: {processed} expenses in {time.perf_counter() - start:.2f}s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild spending analytics rollups.")
+    parser.add_argument("--group-id", type=uuid.UUID, default=None)
+    args = parser.parse_args()
+    asyncio.run(run(args.group_id))
+
+
+if __name__ == "__main__":
+    main()
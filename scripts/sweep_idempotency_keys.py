@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Sweep Expired Idempotency Keys
+
+Deletes expired rows from `idempotency_keys` in small batches, committing after
+each batch so the sweep never holds long locks. Schedule it (e.g. hourly cron).
+
+Usage:
+    python3 scripts/sweep_idempotency_keys.py
+    python3 scripts/sweep_idempotency_keys.py --batch-size 5000
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from api.app.database import AsyncSessionLocal, engine  # noqa: E402
+from api.app.idempotency import sweep_expired_keys  # noqa: E402
+
+
+async def run(batch_size: int) -> None:
+    async with AsyncSessionLocal() as session:
+        deleted = await sweep_expired_keys(session, batch_size=batch_size)
+    await engine.dispose()
+    print(f"✅ Deleted {deleted} expired idempotency keys")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Delete expired idempotency keys.")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
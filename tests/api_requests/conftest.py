@@ -6,10 +6,11 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from api.app.auth import get_db_for_auth
+from api.app import passwords
 from api.app.database import Base
 from api.app.dependencies import get_db
 from api.app.main import app
+from api.app.rate_limit import login_email_limiter, login_ip_limiter
 
 test_client = TestClient(app)
 
@@ -45,12 +46,25 @@ class SyncSessionAdapter:
     async def commit(self):
         return self._session.commit()
 
+    async def rollback(self):
+        return self._session.rollback()
+
     async def refresh(self, instance):
         return self._session.refresh(instance)
 
     async def delete(self, instance):
         return self._session.delete(instance)
 
+    async def close(self):
+        return self._session.close()
+
+    def get_bind(self):
+        return self._session.get_bind()
+
+    @property
+    def info(self):
+        return self._session.info
+
 
 async def override_get_db():
     db = TestingSessionLocal()
@@ -64,23 +78,35 @@ async def override_get_db():
 @pytest.fixture(autouse=True)
 def setup_database():
     Base.metadata.create_all(bind=engine)
+    # Every test client request comes from the same address.
+    login_ip_limiter.reset()
+    login_email_limiter.reset()
     prev_get_db = app.dependency_overrides.get(get_db)
-    prev_get_db_for_auth = app.dependency_overrides.get(get_db_for_auth)
     app.dependency_overrides[get_db] = override_get_db
-    app.dependency_overrides[get_db_for_auth] = override_get_db
     yield
     if prev_get_db is None:
         app.dependency_overrides.pop(get_db, None)
     else:
         app.dependency_overrides[get_db] = prev_get_db
-
-    if prev_get_db_for_auth is None:
-        app.dependency_overrides.pop(get_db_for_auth, None)
-    else:
-        app.dependency_overrides[get_db_for_auth] = prev_get_db_for_auth
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture
+def password_context():
+    """Install a CryptContext for one test; the configured one is restored afterwards."""
+    yield passwords.set_context
+    passwords.set_context(None)
+
+
+@pytest.fixture
+def db_session():
+    db = TestingSessionLocal()
+    try:
+        yield SyncSessionAdapter(db)
+    finally:
+        db.close()
+
+
 @pytest.fixture
 def client():
     yield test_client
@@ -0,0 +1,151 @@
+import asyncio
+
+import pytest
+
+from api.app import metrics, passwords
+from api.app.variables import MyVariables
+
+ADMIN_KEY = "test-admin-key"
+
+
+@pytest.fixture
+def admin_headers(monkeypatch):
+    monkeypatch.setattr(MyVariables, "admin_api_key", ADMIN_KEY)
+    return {"X-Admin-Key": ADMIN_KEY}
+
+
+def test_bulk_provision_requires_admin_key(client, admin_headers):
+    payload = {"users": [{"name": "A", "email": "a@example.com", "password": "pw"}]}
+
+    missing = client.post("/admin/users/bulk", json=payload)
+    wrong = client.post("/admin/users/bulk", json=payload, headers={"X-Admin-Key": "nope"})
+
+    assert missing.status_code == wrong.status_code == 403
+
+
+def test_bulk_provision_is_disabled_without_configured_key(client, monkeypatch):
+    monkeypatch.setattr(MyVariables, "admin_api_key", "")
+    payload = {"users": [{"name": "A", "email": "a@example.com", "password": "pw"}]}
+
+    response = client.post("/admin/users/bulk", json=payload, headers={"X-Admin-Key": ""})
+
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Admin endpoints are disabled"
+
+
+def test_bulk_provision_creates_users_and_skips_existing(
+    client, admin_headers, register_user, unique_email
+):
+    existing = register_user(name="Existing")
+    new_emails = [unique_email("bulk") for _ in range(3)]
+    users = [
+        {"name": f"Bulk {i}", "email": e, "password": f"pw-{i}"} for i, e in enumerate(new_emails)
+    ]
+    users.append({"name": "Dup", "email": new_emails[0], "password": "other"})
+    users.append({"name": "Existing", "email": existing["user"]["email"], "password": "x"})
+
+    response = client.post("/admin/users/bulk", json={"users": users}, headers=admin_headers)
+
+    assert response.status_code == 201
+    data = response.json()
+    assert sorted(u["email"] for u in data["created"]) == sorted(new_emails)
+    assert data["existing_emails"] == [existing["user"]["email"]]
+    assert data["added_to_group"] == 0
+
+    login = client.post("/auth/login", json={"email": new_emails[1], "password": "pw-1"})
+    assert login.status_code == 200
+
+
+def test_bulk_provision_adds_everyone_to_group(
+    client, admin_headers, created_group, auth_user, second_user, unique_email
+):
+    group_id = created_group["id"]
+    users = [
+        {"name": "New", "email": unique_email("bulk"), "password": "pw"},
+        {"name": "Second", "email": second_user["user"]["email"], "password": "pw"},
+        {"name": "Owner", "email": auth_user["user"]["email"], "password": "pw"},
+    ]
+
+    response = client.post(
+        "/admin/users/bulk", json={"users": users, "group_id": group_id}, headers=admin_headers
+    )
+
+    assert response.status_code == 201
+    # The owner already belongs to the group.
+    assert response.json()["added_to_group"] == 2
+    members = client.get(f"/groups/{group_id}/members", headers=auth_user["headers"]).json()
+    assert {m["user_email"] for m in members} == {u["email"] for u in users}
+
+
+def test_bulk_provision_unknown_group_returns_404(client, admin_headers, unique_email):
+    payload = {
+        "users": [{"name": "A", "email": unique_email("bulk"), "password": "pw"}],
+        "group_id": "00000000-0000-0000-0000-000000000000",
+    }
+
+    response = client.post("/admin/users/bulk", json=payload, headers=admin_headers)
+
+    assert response.status_code == 404
+
+
+def test_bulk_provision_hashing_overload_returns_503(
+    client, admin_headers, unique_email, monkeypatch
+):
+    monkeypatch.setattr(passwords.hash_pool, "max_pending", 0)
+    payload = {"users": [{"name": "A", "email": unique_email("bulk"), "password": "pw"}]}
+
+    response = client.post("/admin/users/bulk", json=payload, headers=admin_headers)
+
+    assert response.status_code == 503
+
+
+def test_hash_passwords_bulk_uses_process_pool_for_large_batches(monkeypatch, password_context):
+    monkeypatch.setattr(passwords, "BULK_HASH_MIN_PROCESS_BATCH", 2)
+    password_context(passwords.build_context("bcrypt", 4))
+    monkeypatch.setattr(MyVariables, "bulk_hash_processes", 2)
+    plains = [f"password-{i}" for i in range(5)]
+    hashed = metrics.timer("password_hash.duration")
+    before = hashed.count
+
+    hashes = asyncio.run(passwords.hash_passwords_bulk(plains))
+
+    assert passwords._process_pool is not None
+    assert all(passwords.verify_password(p, h) for p, h in zip(plains, hashes, strict=True))
+    assert hashed.count > before
+    assert passwords.hash_pool.pending == 0
+
+
+def test_hash_passwords_bulk_is_bounded_by_the_hash_pool_queue(monkeypatch):
+    monkeypatch.setattr(passwords, "BULK_HASH_MIN_PROCESS_BATCH", 2)
+    monkeypatch.setattr(MyVariables, "bulk_hash_processes", 2)
+    monkeypatch.setattr(passwords.hash_pool, "max_pending", 4)
+    monkeypatch.setattr(passwords.hash_pool, "pending", 3)
+    rejected = metrics.counter("password_hash.rejected")
+    before = rejected.value
+
+    with pytest.raises(passwords.PasswordHasherBusyError):
+        asyncio.run(passwords.hash_passwords_bulk([f"password-{i}" for i in range(8)]))
+
+    assert rejected.value == before + 1
+    assert passwords.hash_pool.pending == 3
+
+
+def test_hash_passwords_bulk_holds_a_queue_slot_per_password(monkeypatch):
+    monkeypatch.setattr(passwords.hash_pool, "max_pending", 8)
+    monkeypatch.setattr(passwords, "hash_passwords", lambda plains: [p.upper() for p in plains])
+    held: list[int] = []
+    original_reserve = passwords.hash_pool._reserve
+
+    def reserve(calls: int) -> None:
+        held.append(calls)
+        original_reserve(calls)
+
+    monkeypatch.setattr(passwords.hash_pool, "_reserve", reserve)
+    plains = [f"password-{i}" for i in range(10)]
+
+    hashes = asyncio.run(passwords.hash_passwords_bulk(plains))
+
+    assert hashes == [p.upper() for p in plains]
+    # half the queue per wave, one slot per password
+    assert held == [4, 4, 2]
+    assert passwords.hash_pool.pending == 0
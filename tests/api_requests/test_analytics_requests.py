@@ -0,0 +1,139 @@
+import asyncio
+
+from sqlalchemy import func, select
+
+from api.app.models.group import Group
+from api.app.rollups import rebuild_spending_rollups
+
+
+def _post_expense(client, group, amount, category, date, splits):
+    response = client.post(
+        f"/groups/{group['group']['id']}/expenses",
+        headers=group["owner"]["headers"],
+        json={
+            "description": f"{category} expense",
+            "amount": amount,
+            "payer_id": group["owner"]["user"]["id"],
+            "category": category,
+            "date": date,
+            "splits": splits,
+        },
+    )
+    assert response.status_code == 201
+
+
+def _split(group, amount_owed):
+    return {
+        "debtor_id": group["member"]["user"]["id"],
+        "creditor_id": group["owner"]["user"]["id"],
+        "amount_owed": amount_owed,
+        "percentage": "50.00",
+    }
+
+
+def _seed(client, group):
+    _post_expense(client, group, "60.00", "food", "2026-03-05T19:00:00Z", [_split(group, "30.00")])
+    _post_expense(client, group, "40.00", "food", "2026-03-20T12:00:00Z", [_split(group, "20.00")])
+    _post_expense(client, group, "10.00", None, "2026-04-02T08:00:00Z", [_split(group, "10.00")])
+    # Settlements are transfers, not spending
+    _post_expense(
+        client, group, "30.00", "settlement", "2026-04-03T08:00:00Z", [_split(group, "30.00")]
+    )
+
+
+def _spending(client, group, **params):
+    response = client.get(
+        f"/groups/{group['group']['id']}/analytics/spending",
+        headers=group["owner"]["headers"],
+        params=params,
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_group_spending_rollups_are_updated_on_expense_creation(client, group_with_two_members):
+    group = group_with_two_members
+    _seed(client, group)
+
+    data = _spending(client, group)
+
+    assert data["total"] == "110.00"
+    assert data["by_category"] == [
+        {"category": "food", "total": "100.00"},
+        {"category": "uncategorized", "total": "10.00"},
+    ]
+    assert data["by_month"] == [
+        {"month": "2026-03-01", "total": "100.00"},
+        {"month": "2026-04-01", "total": "10.00"},
+    ]
+    assert data["buckets"][0] == {
+        "category": "food",
+        "month": "2026-03-01",
+        "total": "100.00",
+        "expense_count": 2,
+    }
+
+
+def test_user_spending_splits_payer_and_debtor_shares(client, group_with_two_members):
+    group = group_with_two_members
+    _seed(client, group)
+
+    owner = _spending(client, group, user_id=group["owner"]["user"]["id"])
+    member = _spending(client, group, user_id=group["member"]["user"]["id"])
+
+    assert owner["total"] == "50.00"
+    assert member["total"] == "60.00"
+    assert member["by_month"] == [
+        {"month": "2026-03-01", "total": "50.00"},
+        {"month": "2026-04-01", "total": "10.00"},
+    ]
+    assert member["buckets"][0]["expense_count"] is None
+
+
+def test_rebuild_reproduces_incremental_rollups(client, group_with_two_members, db_session):
+    group = group_with_two_members
+    _seed(client, group)
+    before = (
+        _spending(client, group),
+        _spending(client, group, user_id=group["member"]["user"]["id"]),
+    )
+
+    processed = asyncio.run(rebuild_spending_rollups(db_session))
+
+    assert processed == 3
+    after = (
+        _spending(client, group),
+        _spending(client, group, user_id=group["member"]["user"]["id"]),
+    )
+    assert after == before
+
+
+def test_rebuild_commits_each_group_separately(
+    client, group_with_two_members, db_session, monkeypatch
+):
+    _seed(client, group_with_two_members)
+    live_groups = asyncio.run(
+        db_session.execute(
+            select(func.count()).select_from(Group).where(Group.archived_at.is_(None))
+        )
+    ).scalar_one()
+    commits = []
+    commit = db_session.commit
+
+    async def counting_commit():
+        commits.append(1)
+        await commit()
+
+    monkeypatch.setattr(db_session, "commit", counting_commit)
+
+    asyncio.run(rebuild_spending_rollups(db_session))
+
+    assert len(commits) == live_groups
+
+
+def test_spending_analytics_requires_membership(client, created_group, second_user):
+    response = client.get(
+        f"/groups/{created_group['id']}/analytics/spending", headers=second_user["headers"]
+    )
+
+    assert response.status_code == 403
@@ -0,0 +1,169 @@
+import asyncio
+import uuid
+from datetime import UTC, datetime
+
+from sqlalchemy import func, select, update
+
+from api.app.archival import archive_group, find_archivable_groups, idle_cutoff
+from api.app.models.expense import Expense
+from api.app.models.group import Group
+
+
+def _settle(client, expense_and_debt):
+    response = client.post(
+        f"/groups/{expense_and_debt['group_id']}/debts/{expense_and_debt['debt_id']}/settle",
+        headers=expense_and_debt["owner"]["headers"],
+    )
+    assert response.status_code == 200
+
+
+def _age_expenses(db_session, group_id):
+    group_id = uuid.UUID(group_id)
+    asyncio.run(
+        db_session.execute(
+            update(Expense)
+            .where(Expense.group_id == group_id)
+            .values(created_at=datetime(2025, 1, 1, tzinfo=UTC))
+        )
+    )
+    asyncio.run(db_session.commit())
+
+
+def _archivable(db_session):
+    return [
+        str(group_id)
+        for group_id in asyncio.run(find_archivable_groups(db_session, idle_cutoff(6)))
+    ]
+
+
+def _hot_expense_count(db_session, group_id):
+    group_id = uuid.UUID(group_id)
+    result = asyncio.run(
+        db_session.execute(
+            select(func.count()).select_from(Expense).where(Expense.group_id == group_id)
+        )
+    )
+    return result.scalar()
+
+
+def test_only_settled_idle_groups_are_archivable(client, expense_and_debt, db_session):
+    group_id = expense_and_debt["group_id"]
+    _age_expenses(db_session, group_id)
+    assert _archivable(db_session) == []  # the debt is still pending
+
+    _settle(client, expense_and_debt)
+    assert _archivable(db_session) == [group_id]
+
+
+def test_recently_active_group_is_not_archivable(client, expense_and_debt, db_session):
+    _settle(client, expense_and_debt)
+
+    assert _archivable(db_session) == []
+
+
+def test_archived_group_is_restored_when_its_expenses_are_read(
+    client, expense_and_debt, db_session
+):
+    group_id = expense_and_debt["group_id"]
+    headers = expense_and_debt["owner"]["headers"]
+    _settle(client, expense_and_debt)
+    _age_expenses(db_session, group_id)
+    before = client.get(f"/groups/{group_id}/expenses", headers=headers).json()
+
+    archived = asyncio.run(archive_group(db_session, uuid.UUID(group_id), idle_cutoff(6)))
+    asyncio.run(db_session.commit())
+
+    assert archived == 1
+    assert _hot_expense_count(db_session, group_id) == 0
+    dashboard = client.get("/groups/dashboard", headers=headers).json()
+    assert dashboard[0]["expense_count"] == 1
+    assert dashboard[0]["last_activity_at"].startswith("2025-01-01")
+
+    after = client.get(f"/groups/{group_id}/expenses", headers=headers).json()
+
+    assert after == before
+    assert _hot_expense_count(db_session, group_id) == 1
+    archived_at = asyncio.run(
+        db_session.execute(select(Group.archived_at).where(Group.id == uuid.UUID(group_id)))
+    ).scalar()
+    assert archived_at is None
+
+
+def test_archived_expense_is_restored_when_read_by_id(
+    client, expense_and_debt, db_session, register_user
+):
+    group_id = expense_and_debt["group_id"]
+    expense_id = expense_and_debt["expense"]["id"]
+    headers = expense_and_debt["owner"]["headers"]
+    _settle(client, expense_and_debt)
+    _age_expenses(db_session, group_id)
+    before = client.get(f"/expenses/{expense_id}", headers=headers).json()
+    asyncio.run(archive_group(db_session, uuid.UUID(group_id), idle_cutoff(6)))
+    asyncio.run(db_session.commit())
+    outsider = register_user(name="Outsider")
+
+    forbidden = client.get(
+        f"/expenses/{expense_id}",
+        headers={"Authorization": f"Bearer {outsider['access_token']}"},
+    )
+    assert forbidden.status_code == 403
+    assert _hot_expense_count(db_session, group_id) == 0
+
+    response = client.get(f"/expenses/{expense_id}", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json() == before
+    assert _hot_expense_count(db_session, group_id) == 1
+    assert client.get(f"/expenses/{uuid.uuid4()}", headers=headers).status_code == 404
+
+
+def _archive(client, expense_and_debt, db_session):
+    group_id = expense_and_debt["group_id"]
+    _settle(client, expense_and_debt)
+    _age_expenses(db_session, group_id)
+    assert asyncio.run(archive_group(db_session, uuid.UUID(group_id), idle_cutoff(6))) == 1
+    asyncio.run(db_session.commit())
+
+
+def test_unchanged_poll_of_archived_group_does_not_restore_it(client, expense_and_debt, db_session):
+    group_id = expense_and_debt["group_id"]
+    headers = expense_and_debt["owner"]["headers"]
+    _settle(client, expense_and_debt)
+    etag = client.get(f"/groups/{group_id}/expenses", headers=headers).headers["etag"]
+    _age_expenses(db_session, group_id)
+    asyncio.run(archive_group(db_session, uuid.UUID(group_id), idle_cutoff(6)))
+    asyncio.run(db_session.commit())
+
+    for path in ("expenses", "debts"):
+        response = client.get(
+            f"/groups/{group_id}/{path}", headers={**headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 304
+
+    assert _hot_expense_count(db_session, group_id) == 0
+
+
+def test_new_expense_in_archived_group_restores_it_first(client, expense_and_debt, db_session):
+    group_id = expense_and_debt["group_id"]
+    owner = expense_and_debt["owner"]
+    _archive(client, expense_and_debt, db_session)
+
+    created = client.post(
+        f"/groups/{group_id}/expenses",
+        headers=owner["headers"],
+        json={
+            "description": "Reunion",
+            "amount": "10.00",
+            "payer_id": owner["user"]["id"],
+            "splits": [],
+        },
+    )
+
+    assert created.status_code == 201
+    assert _hot_expense_count(db_session, group_id) == 2
+    archived_at = asyncio.run(
+        db_session.execute(select(Group.archived_at).where(Group.id == uuid.UUID(group_id)))
+    ).scalar()
+    assert archived_at is None
+    dashboard = client.get("/groups/dashboard", headers=owner["headers"]).json()
+    assert dashboard[0]["expense_count"] == 2
@@ -1,3 +1,19 @@
+import asyncio
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from jose import jwt
+from sqlalchemy import delete, select, update
+
+from api.app import auth, metrics, passwords
+from api.app.dependencies import get_db
+from api.app.main import app
+from api.app.models import User
+from api.app.rate_limit import login_email_limiter, login_ip_limiter
+from api.app.token_revocation import token_denylist
+from api.app.variables import MyVariables
+
+
 def test_register_returns_token_and_user(client, unique_email):
     email = unique_email("register")
     response = client.post(
@@ -61,3 +77,222 @@ def test_me_returns_current_user(client, auth_user):
     data = response.json()
     assert data["id"] == auth_user["user"]["id"]
     assert data["email"] == auth_user["user"]["email"]
+
+
+def test_login_is_shed_with_503_when_hash_pool_is_saturated(client, unique_email, monkeypatch):
+    from api.app.passwords import hash_pool
+
+    email = unique_email("busy")
+    client.post("/auth/register", json={"name": "Busy", "email": email, "password": "password123"})
+    monkeypatch.setattr(hash_pool, "max_pending", 0)
+
+    login = client.post("/auth/login", json={"email": email, "password": "password123"})
+    register = client.post(
+        "/auth/register",
+        json={"name": "Busy 2", "email": unique_email("busy"), "password": "password123"},
+    )
+
+    assert login.status_code == register.status_code == 503
+    assert login.headers["retry-after"] == "1"
+
+
+def test_me_is_served_from_user_cache_and_invalidated_on_update(client, auth_user, db_session):
+    hits = metrics.counter("auth.user_cache.hits")
+    client.get("/auth/me", headers=auth_user["headers"])
+    before = hits.value
+    assert client.get("/auth/me", headers=auth_user["headers"]).json()["name"] == "Primary User"
+    assert hits.value == before + 1
+
+    async def rename():
+        user = await db_session.get(User, uuid.UUID(auth_user["user"]["id"]))
+        user.name = "Renamed User"
+        await db_session.commit()
+
+    asyncio.run(rename())
+
+    assert client.get("/auth/me", headers=auth_user["headers"]).json()["name"] == "Renamed User"
+
+
+def test_deleted_user_token_is_rejected_despite_cache(client, auth_user, db_session):
+    client.get("/auth/me", headers=auth_user["headers"])
+
+    async def remove():
+        user = await db_session.get(User, uuid.UUID(auth_user["user"]["id"]))
+        await db_session.delete(user)
+        await db_session.commit()
+
+    asyncio.run(remove())
+
+    assert client.get("/auth/me", headers=auth_user["headers"]).status_code == 401
+
+
+def test_revoke_rejects_previously_issued_tokens(client, auth_user):
+    revoke = client.post("/auth/revoke", headers=auth_user["headers"])
+    assert revoke.status_code == 204
+
+    assert client.get("/auth/me", headers=auth_user["headers"]).status_code == 401
+
+
+def test_stateless_mode_authenticates_from_claims_without_user_row(
+    client, unique_email, db_session, monkeypatch
+):
+    monkeypatch.setattr(MyVariables, "auth_mode", "stateless")
+    email = unique_email("stateless")
+    registered = client.post(
+        "/auth/register", json={"name": "Stateless", "email": email, "password": "password123"}
+    ).json()
+    headers = {"Authorization": f"Bearer {registered['access_token']}"}
+
+    # Remove the row behind the ORM's back: a stateless token never looks it up.
+    asyncio.run(db_session.execute(delete(User).where(User.email == email)))
+    asyncio.run(db_session.commit())
+
+    response = client.get("/auth/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["email"] == email
+
+
+def test_stateless_mode_honours_revocations_after_refresh(
+    client, unique_email, db_session, monkeypatch
+):
+    monkeypatch.setattr(MyVariables, "auth_mode", "stateless")
+    monkeypatch.setattr(token_denylist, "refresh_seconds", 0)
+    email = unique_email("stateless")
+    registered = client.post(
+        "/auth/register", json={"name": "Stateless", "email": email, "password": "password123"}
+    ).json()
+    headers = {"Authorization": f"Bearer {registered['access_token']}"}
+    assert client.get("/auth/me", headers=headers).status_code == 200
+
+    # A revocation made by another worker only shows up in the database.
+    asyncio.run(
+        db_session.execute(
+            update(User)
+            .where(User.email == email)
+            .values(token_version=1, tokens_revoked_at=datetime.now(UTC))
+        )
+    )
+    asyncio.run(db_session.commit())
+
+    assert client.get("/auth/me", headers=headers).status_code == 401
+    fresh = client.post("/auth/login", json={"email": email, "password": "password123"})
+    fresh_headers = {"Authorization": f"Bearer {fresh.json()['access_token']}"}
+    assert client.get("/auth/me", headers=fresh_headers).status_code == 200
+
+
+def test_denylist_skips_revocations_older_than_the_token_lifetime(db_session, monkeypatch):
+    monkeypatch.setattr(token_denylist, "refresh_seconds", 0)
+    lifetime = timedelta(minutes=MyVariables.jwt_access_token_expire_minutes)
+    recent, old = uuid.uuid4(), uuid.uuid4()
+    for user_id, revoked_at in (
+        (recent, datetime.now(UTC)),
+        (old, datetime.now(UTC) - 2 * lifetime),
+    ):
+        db_session.add(
+            User(
+                id=user_id,
+                name="Revoker",
+                email=f"{user_id}@example.com",
+                password_hash="-",
+                token_version=1,
+                tokens_revoked_at=revoked_at,
+            )
+        )
+    asyncio.run(db_session.commit())
+
+    asyncio.run(token_denylist.refresh_if_stale(db_session))
+
+    assert token_denylist.is_revoked(recent, 0)
+    assert not token_denylist.is_revoked(old, 0)
+
+
+def test_authenticated_request_opens_a_single_session(client, auth_user):
+    opened = []
+    shared_override = app.dependency_overrides[get_db]
+
+    async def counting_get_db():
+        opened.append(1)
+        async for session in shared_override():
+            yield session
+
+    app.dependency_overrides[get_db] = counting_get_db
+    try:
+        response = client.get("/groups", headers=auth_user["headers"])
+    finally:
+        app.dependency_overrides[get_db] = shared_override
+
+    assert response.status_code == 200
+    assert len(opened) == 1
+
+
+def test_repeat_requests_skip_token_signature_verification(client, auth_user, monkeypatch):
+    decodes = []
+    real_decode = jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        decodes.append(1)
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(jwt, "decode", counting_decode)
+    auth._token_cache.clear()
+
+    for _ in range(3):
+        assert client.get("/auth/me", headers=auth_user["headers"]).status_code == 200
+
+    assert len(decodes) == 1
+
+
+def test_expired_token_is_rejected(client, auth_user):
+    expired = jwt.encode(
+        {"sub": auth_user["user"]["id"], "exp": datetime.now(UTC) - timedelta(seconds=1)},
+        MyVariables.jwt_secret_key,
+        algorithm=MyVariables.jwt_algorithm,
+    )
+
+    response = client.get("/auth/me", headers={"Authorization": f"Bearer {expired}"})
+
+    assert response.status_code == 401
+
+
+def test_login_rehashes_passwords_below_policy(client, unique_email, db_session, password_context):
+    password_context(passwords.build_context("bcrypt", 5))
+    email = unique_email("rehash")
+    weak_hash = passwords.build_context("bcrypt", 4).hash("password123")
+    db_session.add(User(name="Rehash", email=email, password_hash=weak_hash))
+    asyncio.run(db_session.commit())
+
+    response = client.post("/auth/login", json={"email": email, "password": "password123"})
+
+    assert response.status_code == 200
+    stored = asyncio.run(db_session.execute(select(User.password_hash).where(User.email == email)))
+    new_hash = stored.scalar_one()
+    assert new_hash.startswith("$2b$05$")
+    assert passwords.verify_password("password123", new_hash)
+
+
+def test_login_over_email_limit_is_rejected_before_password_check(
+    client, unique_email, monkeypatch
+):
+    email = unique_email("limited")
+    client.post("/auth/register", json={"name": "L", "email": email, "password": "password123"})
+    monkeypatch.setattr(login_email_limiter, "capacity", 2)
+    hashed = metrics.timer("password_hash.duration")
+
+    for _ in range(2):
+        client.post("/auth/login", json={"email": email.upper(), "password": "wrong"})
+    before = hashed.count
+    limited = client.post("/auth/login", json={"email": email, "password": "password123"})
+
+    assert limited.status_code == 429
+    assert int(limited.headers["retry-after"]) >= 1
+    assert hashed.count == before
+
+
+def test_login_over_ip_limit_is_rejected(client, unique_email, monkeypatch):
+    monkeypatch.setattr(login_ip_limiter, "capacity", 1)
+
+    first = client.post("/auth/login", json={"email": unique_email("a"), "password": "x"})
+    second = client.post("/auth/login", json={"email": unique_email("b"), "password": "x"})
+
+    assert first.status_code == 401
+    assert second.status_code == 429
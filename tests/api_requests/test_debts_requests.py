@@ -100,8 +100,14 @@ def test_debts_respects_debt_simplification_toggle(client, auth_user, register_u
             "amount": "30.00",
             "payer_id": a_id,
             "category": "other",
-            "splits": [{"debtor_id": b_id, "creditor_id": a_id,
-                         "amount_owed": "30.00", "percentage": "100.00"}],
+            "splits": [
+                {
+                    "debtor_id": b_id,
+                    "creditor_id": a_id,
+                    "amount_owed": "30.00",
+                    "percentage": "100.00",
+                }
+            ],
         },
     )
     assert r1.status_code == 201
@@ -115,8 +121,14 @@ def test_debts_respects_debt_simplification_toggle(client, auth_user, register_u
             "amount": "20.00",
             "payer_id": b_id,
             "category": "other",
-            "splits": [{"debtor_id": c_id, "creditor_id": b_id,
-                         "amount_owed": "20.00", "percentage": "100.00"}],
+            "splits": [
+                {
+                    "debtor_id": c_id,
+                    "creditor_id": b_id,
+                    "amount_owed": "20.00",
+                    "percentage": "100.00",
+                }
+            ],
         },
     )
     assert r2.status_code == 201
@@ -135,9 +147,7 @@ def test_debts_respects_debt_simplification_toggle(client, auth_user, register_u
     assert len(normal_debts) == 2
 
     # ---- toggle ON ----
-    patch = client.patch(
-        f"/groups/{group_id}", json={"debt_simplification": True}, headers=headers
-    )
+    patch = client.patch(f"/groups/{group_id}", json={"debt_simplification": True}, headers=headers)
     assert patch.status_code == 200
     assert patch.json()["debt_simplification"] is True
 
@@ -294,6 +304,34 @@ def test_circular_debts_cancel_out_with_simplification(client, auth_user, regist
     )
     assert debts_resp.status_code == 200
     debts = debts_resp.json()
-    assert debts == [], f"Circular debts A->B(10), B->C(10), C->A(10) should cancel out, got: {debts}"
+    assert debts == [], (
+        f"Circular debts A->B(10), B->C(10), C->A(10) should cancel out, got: {debts}"
+    )
+
+
+def test_list_debts_etag_changes_after_settlement(client, expense_and_debt):
+    url = f"/groups/{expense_and_debt['group_id']}/debts"
+    headers = expense_and_debt["owner"]["headers"]
+    etag = client.get(url, headers=headers).headers["etag"]
 
+    assert client.get(url, headers={**headers, "If-None-Match": etag}).status_code == 304
+    assert client.get(url, headers={**headers, "If-None-Match": "*"}).status_code == 304
 
+    client.post(
+        f"/groups/{expense_and_debt['group_id']}/debts/{expense_and_debt['debt_id']}/settle",
+        headers=headers,
+    )
+    response = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_toggling_debt_simplification_invalidates_debts_etag(client, expense_and_debt):
+    group_id = expense_and_debt["group_id"]
+    headers = expense_and_debt["owner"]["headers"]
+    etag = client.get(f"/groups/{group_id}/debts", headers=headers).headers["etag"]
+
+    client.patch(f"/groups/{group_id}", json={"debt_simplification": True}, headers=headers)
+
+    response = client.get(f"/groups/{group_id}/debts", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
@@ -1,4 +1,17 @@
+import os
 import uuid
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import create_engine, create_mock_engine, insert, select, text
+from sqlalchemy.dialects import postgresql
+
+from api.app.database import Base
+from api.app.models.expense import Expense
+from api.app.models.group import Group
+from api.app.models.user import User
+from api.app.routers.expenses import _expense_filters, _expense_with_splits_query
+from api.app.sql_compat import explain
 
 
 def test_create_expense_returns_expense_with_splits(client, group_with_two_members):
@@ -78,3 +91,244 @@ def test_get_expense_not_found_returns_404(client, auth_user):
 
     assert response.status_code == 404
     assert response.json()["detail"] == "Expense not found"
+
+
+def test_expense_splits_keep_exact_amounts(client, group_with_two_members):
+    group_id = group_with_two_members["group"]["id"]
+    owner_id = group_with_two_members["owner"]["user"]["id"]
+    member_id = group_with_two_members["member"]["user"]["id"]
+
+    response = client.post(
+        f"/groups/{group_id}/expenses",
+        headers=group_with_two_members["owner"]["headers"],
+        json={
+            "description": "Taxi",
+            "amount": "10.01",
+            "payer_id": owner_id,
+            "splits": [
+                {
+                    "debtor_id": member_id,
+                    "creditor_id": owner_id,
+                    "amount_owed": "3.34",
+                    "percentage": "33.33",
+                },
+                {
+                    "debtor_id": owner_id,
+                    "creditor_id": owner_id,
+                    "amount_owed": "6.67",
+                    "percentage": "66.67",
+                },
+            ],
+        },
+    )
+    assert response.status_code == 201
+
+    listed = client.get(
+        f"/groups/{group_id}/expenses", headers=group_with_two_members["owner"]["headers"]
+    ).json()
+    splits = sorted(listed["expenses"][0]["splits"], key=lambda s: s["amount_owed"])
+    assert [s["amount_owed"] for s in splits] == ["3.34", "6.67"]
+    assert [s["percentage"] for s in splits] == ["33.33", "66.67"]
+    assert all(s["status"] == "pending" for s in splits)
+
+
+def test_expense_query_uses_json_agg_on_postgres():
+    sql = str(_expense_with_splits_query().compile(dialect=postgresql.dialect()))
+    assert "json_agg(json_build_object('id', expense_shares.id" in sql
+    assert sql.count("SELECT") == 2
+
+
+def _post_expense(client, group, description, amount, category, date):
+    owner_id = group["owner"]["user"]["id"]
+    member_id = group["member"]["user"]["id"]
+    response = client.post(
+        f"/groups/{group['group']['id']}/expenses",
+        headers=group["owner"]["headers"],
+        json={
+            "description": description,
+            "amount": amount,
+            "payer_id": owner_id,
+            "category": category,
+            "date": date,
+            "splits": [
+                {
+                    "debtor_id": member_id,
+                    "creditor_id": owner_id,
+                    "amount_owed": amount,
+                    "percentage": "100.00",
+                }
+            ],
+        },
+    )
+    assert response.status_code == 201
+
+
+def test_list_expenses_applies_filters(client, group_with_two_members):
+    group = group_with_two_members
+    _post_expense(client, group, "Sushi dinner", "80.00", "food", "2026-03-05T19:00:00Z")
+    _post_expense(client, group, "Train 50%_off", "20.00", "transport", "2026-03-06T08:00:00Z")
+    _post_expense(client, group, "Ramen lunch", "15.00", "food", "2026-04-01T12:00:00Z")
+
+    def descriptions(**params):
+        response = client.get(
+            f"/groups/{group['group']['id']}/expenses",
+            headers=group["owner"]["headers"],
+            params=params,
+        )
+        assert response.status_code == 200
+        return sorted(e["description"] for e in response.json()["expenses"])
+
+    assert descriptions(category="food") == ["Ramen lunch", "Sushi dinner"]
+    assert descriptions(date_from="2026-03-06T00:00:00Z") == ["Ramen lunch", "Train 50%_off"]
+    assert descriptions(category="food", date_to="2026-04-01T00:00:00Z") == ["Sushi dinner"]
+    assert descriptions(min_amount="16", max_amount="50") == ["Train 50%_off"]
+    assert descriptions(q="DINNER") == ["Sushi dinner"]
+    assert descriptions(q="50%_") == ["Train 50%_off"]
+    assert descriptions(q="%") == ["Train 50%_off"]
+    assert descriptions(payer_id=group["member"]["user"]["id"]) == []
+
+
+@pytest.fixture
+def plan_engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def _query_plan(engine, statement) -> str:
+    with engine.connect() as conn:
+        return "\n".join(row[-1] for row in conn.execute(explain(statement, conn.dialect)))
+
+
+def test_filtered_expense_queries_use_index_scans(plan_engine):
+    criteria = _expense_filters(
+        uuid.uuid4(),
+        category="food",
+        date_from=datetime(2026, 1, 1, tzinfo=UTC),
+        date_to=datetime(2026, 2, 1, tzinfo=UTC),
+    )
+    plan = _query_plan(
+        plan_engine,
+        _expense_with_splits_query().where(*criteria).order_by(Expense.date.desc()).limit(50),
+    )
+
+    assert "SEARCH expenses USING INDEX ix_expenses_group_id_category_date" in plan
+    assert "SEARCH expense_shares USING INDEX ix_expense_shares_expense_id" in plan
+
+
+def test_unfiltered_expense_listing_uses_group_date_index(plan_engine):
+    plan = _query_plan(
+        plan_engine,
+        _expense_with_splits_query()
+        .where(*_expense_filters(uuid.uuid4()))
+        .order_by(Expense.date.desc())
+        .limit(50),
+    )
+
+    assert "SEARCH expenses USING INDEX ix_expenses_group_id_date" in plan
+    assert "USE TEMP B-TREE FOR ORDER BY" not in plan
+
+
+def test_explain_renders_postgres_syntax():
+    dialect = postgresql.asyncpg.dialect()
+    statement = select(Expense.id).where(Expense.description.like("%:x%"))
+    compiled = explain(statement, dialect).compile(dialect=dialect)
+
+    assert str(compiled).startswith("EXPLAIN SELECT")
+    assert "LIKE '%:x%'" in str(compiled)
+    assert not compiled.params
+
+
+@pytest.fixture(scope="module")
+def postgres_plan_engine():
+    url = os.getenv("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    group_id, user_id = uuid.uuid4(), uuid.uuid4()
+    with engine.begin() as conn:
+        conn.execute(insert(User).values(id=user_id, name="U", email="u@x.io", password_hash="-"))
+        conn.execute(insert(Group).values(id=group_id, name="G", created_by=user_id))
+        # Enough rows that the planner prefers indexes over sequential scans.
+        conn.execute(
+            text(
+                "INSERT INTO expenses (id, group_id, payer_id, description, amount, category, date)"
+                " SELECT gen_random_uuid(), :group_id, :user_id, md5(n::text), 1,"
+                " (ARRAY['food', 'rent', 'travel', 'fun'])[n % 4 + 1],"
+                " TIMESTAMPTZ '2025-01-01' + n * INTERVAL '1 hour'"
+                " FROM generate_series(1, 50000) AS n"
+            ),
+            {"group_id": group_id, "user_id": user_id},
+        )
+        conn.execute(text("ANALYZE"))
+    yield engine, group_id
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.mark.postgres
+def test_postgres_category_filter_uses_group_category_date_index(postgres_plan_engine):
+    engine, group_id = postgres_plan_engine
+    criteria = _expense_filters(
+        group_id,
+        category="food",
+        date_from=datetime(2025, 3, 1, tzinfo=UTC),
+        date_to=datetime(2025, 3, 8, tzinfo=UTC),
+    )
+    plan = _query_plan(
+        engine,
+        _expense_with_splits_query().where(*criteria).order_by(Expense.date.desc()).limit(50),
+    )
+
+    assert "using ix_expenses_group_id_category_date on expenses" in plan
+
+
+@pytest.mark.postgres
+def test_postgres_description_search_uses_trigram_index(postgres_plan_engine):
+    engine, group_id = postgres_plan_engine
+    plan = _query_plan(
+        engine,
+        _expense_with_splits_query()
+        .where(*_expense_filters(group_id, q="dinner"))
+        .order_by(Expense.date.desc())
+        .limit(50),
+    )
+
+    assert "Bitmap Index Scan on ix_expenses_description_trgm" in plan
+
+
+def test_list_expenses_supports_conditional_get(client, group_with_two_members):
+    group = group_with_two_members
+    url = f"/groups/{group['group']['id']}/expenses"
+    headers = group["owner"]["headers"]
+
+    first = client.get(url, headers=headers)
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+
+    unchanged = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert unchanged.headers["etag"] == etag
+
+    _post_expense(client, group, "Snacks", "5.00", "food", "2026-03-05T19:00:00Z")
+
+    changed = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["total"] == 1
+
+
+def test_create_all_creates_pg_trgm_before_the_expenses_table():
+    statements = []
+    engine = create_mock_engine(
+        "postgresql+psycopg2://",
+        lambda sql, *args, **kwargs: statements.append(str(sql.compile(dialect=engine.dialect))),
+    )
+    Expense.__table__.create(engine)
+
+    assert statements[0] == "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+    assert any("gin_trgm_ops" in statement for statement in statements[1:])
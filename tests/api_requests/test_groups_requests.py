@@ -1,4 +1,8 @@
 import uuid
+from decimal import Decimal
+
+from api.app import metrics
+from api.app.invite_codes import _invite_code_cache, remember_invite_code
 
 
 def test_create_group_returns_group_payload(client, auth_user):
@@ -26,6 +30,45 @@ def test_list_groups_returns_created_group(client, auth_user, created_group):
     assert any(group["id"] == created_group["id"] for group in data)
 
 
+def test_list_groups_pages_with_cursor_header(client, auth_user):
+    created = []
+    for i in range(5):
+        response = client.post("/groups", json={"name": f"G{i}"}, headers=auth_user["headers"])
+        created.append(response.json()["id"])
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2} | ({"cursor": cursor} if cursor else {})
+        response = client.get("/groups", params=params, headers=auth_user["headers"])
+        assert response.status_code == 200
+        assert len(response.json()) <= 2
+        seen.extend(group["id"] for group in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert len(seen) == len(set(seen)) == 5
+    assert set(seen) == set(created)
+
+
+def test_list_groups_returns_only_requested_fields(client, auth_user, created_group):
+    response = client.get(
+        "/groups", params={"fields": "name,invite_code"}, headers=auth_user["headers"]
+    )
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {"name": created_group["name"], "invite_code": created_group["invite_code"]}
+    ]
+
+
+def test_list_groups_rejects_unknown_fields(client, auth_user):
+    response = client.get("/groups", params={"fields": "name,secret"}, headers=auth_user["headers"])
+
+    assert response.status_code == 400
+    assert "secret" in response.json()["detail"]
+
+
 def test_list_groups_requires_auth(client):
     response = client.get("/groups")
     assert response.status_code == 403
@@ -56,6 +99,73 @@ def test_get_group_not_found_returns_404(client, auth_user):
     assert response.json()["detail"] == "Group not found"
 
 
+def test_invite_code_lookups_are_cached(client, auth_user, created_group):
+    code = created_group["invite_code"]
+    hits = metrics.counter("invite_code_cache.hits")
+    before = hits.value
+
+    for _ in range(3):
+        response = client.get(f"/groups/{code}", headers=auth_user["headers"])
+        assert response.status_code == 200
+        assert response.json()["id"] == created_group["id"]
+
+    assert hits.value == before + 2
+
+
+def test_join_group_by_code_adds_member_once(client, created_group, second_user):
+    code = created_group["invite_code"]
+
+    joined = client.post(f"/groups/join/{code}", headers=second_user["headers"])
+    again = client.post(f"/groups/join/{code}", headers=second_user["headers"])
+
+    assert joined.status_code == 201
+    assert joined.json()["id"] == created_group["id"]
+    assert again.status_code == 200
+    assert again.json()["id"] == created_group["id"]
+    members = client.get(
+        f"/groups/{created_group['id']}/members", headers=second_user["headers"]
+    ).json()
+    assert [m["user_id"] for m in members].count(second_user["user"]["id"]) == 1
+
+
+def test_join_group_with_unknown_code_returns_404(client, auth_user):
+    response = client.post("/groups/join/NOPE0000", headers=auth_user["headers"])
+
+    assert response.status_code == 404
+
+
+def test_regenerated_invite_code_replaces_the_old_one(
+    client, auth_user, second_user, created_group
+):
+    old_code = created_group["invite_code"]
+    assert client.get(f"/groups/{old_code}", headers=auth_user["headers"]).status_code == 200
+
+    response = client.post(
+        f"/groups/{created_group['id']}/members/invite/regenerate", headers=auth_user["headers"]
+    )
+
+    assert response.status_code == 200
+    new_code = response.json()["invite_code"]
+    assert new_code != old_code
+    assert client.get(f"/groups/{old_code}", headers=auth_user["headers"]).status_code == 404
+    assert (
+        client.post(f"/groups/join/{old_code}", headers=second_user["headers"]).status_code == 404
+    )
+    assert (
+        client.post(f"/groups/join/{new_code}", headers=second_user["headers"]).status_code == 201
+    )
+
+
+def test_stale_cached_invite_code_is_not_resolved(client, auth_user, created_group):
+    # Another worker regenerated the code; this one still has the old code cached
+    remember_invite_code("OLDCODE1", uuid.UUID(created_group["id"]))
+
+    response = client.get("/groups/OLDCODE1", headers=auth_user["headers"])
+
+    assert response.status_code == 404
+    assert "OLDCODE1" not in _invite_code_cache
+
+
 def test_group_response_includes_debt_simplification(client, auth_user):
     response = client.post(
         "/groups",
@@ -95,3 +205,39 @@ def test_patch_group_toggle_debt_simplification(client, auth_user, created_group
     assert response.status_code == 200
     data = response.json()
     assert data["debt_simplification"] is False
+
+
+def test_dashboard_returns_counts_activity_and_balance(client, expense_and_debt):
+    owner = expense_and_debt["owner"]
+    member = expense_and_debt["member"]
+    client.post("/groups", json={"name": "Empty", "currency_code": "USD"}, headers=owner["headers"])
+
+    owner_view = client.get("/groups/dashboard", headers=owner["headers"])
+    member_view = client.get("/groups/dashboard", headers=member["headers"])
+
+    assert owner_view.status_code == 200
+    by_name = {g["name"]: g for g in owner_view.json()}
+    trip = by_name["Trip to Tokyo"]
+    assert trip["member_count"] == 2
+    assert trip["expense_count"] == 1
+    assert trip["last_activity_at"] == expense_and_debt["expense"]["created_at"]
+    assert Decimal(trip["net_balance"]) == Decimal("30.00")
+    empty = by_name["Empty"]
+    assert (empty["member_count"], empty["expense_count"]) == (1, 0)
+    assert Decimal(empty["net_balance"]) == 0
+
+    [member_trip] = member_view.json()
+    assert Decimal(member_trip["net_balance"]) == Decimal("-30.00")
+
+
+def test_dashboard_balance_ignores_settled_debts(client, expense_and_debt):
+    owner = expense_and_debt["owner"]
+    settle = client.post(
+        f"/groups/{expense_and_debt['group_id']}/debts/{expense_and_debt['debt_id']}/settle",
+        headers=owner["headers"],
+    )
+    assert settle.status_code == 200
+
+    [trip] = client.get("/groups/dashboard", headers=owner["headers"]).json()
+
+    assert Decimal(trip["net_balance"]) == 0
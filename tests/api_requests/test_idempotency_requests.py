@@ -0,0 +1,161 @@
+import asyncio
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from api.app import idempotency
+from api.app.models.idempotency_key import IdempotencyKey
+
+
+def _expense_payload(group, description="Dinner"):
+    owner_id = group["owner"]["user"]["id"]
+    return {
+        "description": description,
+        "amount": "60.00",
+        "payer_id": owner_id,
+        "splits": [
+            {
+                "debtor_id": group["member"]["user"]["id"],
+                "creditor_id": owner_id,
+                "amount_owed": "30.00",
+                "percentage": "50.00",
+            }
+        ],
+    }
+
+
+def test_retried_expense_creation_is_replayed(client, group_with_two_members):
+    group = group_with_two_members
+    url = f"/groups/{group['group']['id']}/expenses"
+    headers = {**group["owner"]["headers"], "Idempotency-Key": "create-1"}
+
+    first = client.post(url, headers=headers, json=_expense_payload(group))
+    retry = client.post(url, headers=headers, json=_expense_payload(group))
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+    listed = client.get(url, headers=group["owner"]["headers"]).json()
+    assert listed["total"] == 1
+
+
+def test_replay_survives_in_process_cache_loss(client, group_with_two_members):
+    group = group_with_two_members
+    url = f"/groups/{group['group']['id']}/expenses"
+    headers = {**group["owner"]["headers"], "Idempotency-Key": "create-2"}
+
+    first = client.post(url, headers=headers, json=_expense_payload(group))
+    idempotency._cache.clear()
+    retry = client.post(url, headers=headers, json=_expense_payload(group))
+
+    assert retry.status_code == 201
+    assert retry.json()["id"] == first.json()["id"]
+
+
+def test_expired_key_not_yet_swept_can_be_reused(client, db_session, group_with_two_members):
+    group = group_with_two_members
+    url = f"/groups/{group['group']['id']}/expenses"
+    headers = {**group["owner"]["headers"], "Idempotency-Key": "create-expired"}
+
+    first = client.post(url, headers=headers, json=_expense_payload(group))
+    asyncio.run(
+        db_session.execute(
+            IdempotencyKey.__table__.update().values(
+                expires_at=datetime.now(UTC) - timedelta(hours=1)
+            )
+        )
+    )
+    asyncio.run(db_session.commit())
+    idempotency._cache.clear()
+    second = client.post(url, headers=headers, json=_expense_payload(group))
+
+    assert second.status_code == 201
+    assert second.json()["id"] != first.json()["id"]
+    assert "idempotent-replayed" not in second.headers
+    retry = client.post(url, headers=headers, json=_expense_payload(group))
+    assert retry.json()["id"] == second.json()["id"]
+
+
+def test_removed_member_gets_no_replay(client, group_with_two_members):
+    group = group_with_two_members
+    group_id = group["group"]["id"]
+    member_id = group["member"]["user"]["id"]
+    url = f"/groups/{group_id}/expenses"
+    headers = {**group["member"]["headers"], "Idempotency-Key": "create-removed"}
+    payload = {"description": "Snacks", "amount": "5.00", "payer_id": member_id, "splits": []}
+
+    first = client.post(url, headers=headers, json=payload)
+    removed = client.delete(
+        f"/groups/{group_id}/members/{member_id}", headers=group["owner"]["headers"]
+    )
+    retry = client.post(url, headers=headers, json=payload)
+
+    assert first.status_code == 201
+    assert removed.status_code == 204
+    assert retry.status_code == 403
+
+
+def test_reusing_key_for_different_request_is_rejected(client, group_with_two_members):
+    group = group_with_two_members
+    url = f"/groups/{group['group']['id']}/expenses"
+    headers = {**group["owner"]["headers"], "Idempotency-Key": "create-3"}
+
+    client.post(url, headers=headers, json=_expense_payload(group, "Dinner"))
+    response = client.post(url, headers=headers, json=_expense_payload(group, "Lunch"))
+
+    assert response.status_code == 422
+    assert "different request" in response.json()["detail"]
+
+
+def test_idempotency_keys_are_scoped_per_user(client, group_with_two_members):
+    group = group_with_two_members
+    url = f"/groups/{group['group']['id']}/expenses"
+
+    first = client.post(
+        url,
+        headers={**group["owner"]["headers"], "Idempotency-Key": "shared"},
+        json=_expense_payload(group),
+    )
+    second = client.post(
+        url,
+        headers={**group["member"]["headers"], "Idempotency-Key": "shared"},
+        json=_expense_payload(group),
+    )
+
+    assert second.status_code == 201
+    assert second.json()["id"] != first.json()["id"]
+
+
+def test_retried_settlement_is_replayed(client, expense_and_debt):
+    url = f"/groups/{expense_and_debt['group_id']}/debts/{expense_and_debt['debt_id']}/settle"
+    headers = {**expense_and_debt["owner"]["headers"], "Idempotency-Key": "settle-1"}
+
+    first = client.post(url, headers=headers)
+    retry = client.post(url, headers=headers)
+    without_key = client.post(url, headers=expense_and_debt["owner"]["headers"])
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.json() == first.json()
+    assert without_key.status_code == 400
+
+
+def test_sweep_deletes_only_expired_keys_in_batches(db_session, auth_user):
+    user_id = uuid.UUID(auth_user["user"]["id"])
+    now = datetime.now(UTC)
+    for i, expires_at in enumerate([now - timedelta(hours=1)] * 3 + [now + timedelta(hours=1)]):
+        db_session.add(
+            IdempotencyKey(
+                user_id=user_id,
+                key=f"key-{i}",
+                request_hash="0" * 64,
+                status_code=201,
+                response_body={},
+                expires_at=expires_at,
+            )
+        )
+    asyncio.run(db_session.commit())
+
+    deleted = asyncio.run(idempotency.sweep_expired_keys(db_session, batch_size=2))
+
+    assert deleted == 3
+    remaining = asyncio.run(db_session.execute(IdempotencyKey.__table__.select())).all()
+    assert [row.key for row in remaining] == ["key-3"]
@@ -0,0 +1,21 @@
+def test_metrics_report_password_hashing(client, unique_email):
+    email = unique_email("metrics")
+    client.post("/auth/register", json={"name": "Metrics", "email": email, "password": "pw123456"})
+    client.post("/auth/login", json={"email": email, "password": "pw123456"})
+
+    response = client.get("/internal/metrics")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["password_hash.duration"]["count"] >= 2
+    assert data["password_hash.in_flight"]["value"] == 0
+    assert "password_hash.rejected" in data
+
+
+def test_pool_endpoint_reports_pool_state(client):
+    response = client.get("/internal/pool")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["size"] >= 1
+    assert {"checked_out", "overflow", "checkout_wait", "timeouts"} <= set(data)
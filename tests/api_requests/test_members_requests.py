@@ -1,5 +1,9 @@
 import uuid
 
+from sqlalchemy import event
+
+from api.app import metrics
+
 
 def test_get_members_returns_group_members(client, group_with_two_members):
     group_id = group_with_two_members["group"]["id"]
@@ -16,6 +20,48 @@ def test_get_members_returns_group_members(client, group_with_two_members):
     assert all("user_email" in member for member in members)
 
 
+def test_get_members_pages_with_cursor_header(client, created_group, auth_user, register_user):
+    group_id = created_group["id"]
+    for _ in range(4):
+        user = register_user()
+        client.post(
+            f"/groups/{group_id}/members",
+            json={"user_id": user["user"]["id"]},
+            headers=auth_user["headers"],
+        )
+
+    first = client.get(
+        f"/groups/{group_id}/members", params={"limit": 3}, headers=auth_user["headers"]
+    )
+    cursor = first.headers["X-Next-Cursor"]
+    second = client.get(
+        f"/groups/{group_id}/members",
+        params={"limit": 3, "cursor": cursor},
+        headers=auth_user["headers"],
+    )
+
+    assert first.status_code == second.status_code == 200
+    assert cursor == first.json()[-1]["id"]
+    assert "X-Next-Cursor" not in second.headers
+    ids = [member["id"] for member in first.json() + second.json()]
+    assert len(ids) == len(set(ids)) == 5
+
+
+def test_get_members_returns_only_requested_fields(client, group_with_two_members):
+    group_id = group_with_two_members["group"]["id"]
+    response = client.get(
+        f"/groups/{group_id}/members",
+        params={"fields": "user_id,joined_at"},
+        headers=group_with_two_members["owner"]["headers"],
+    )
+
+    assert response.status_code == 200
+    assert "ETag" in response.headers
+    members = response.json()
+    assert len(members) == 2
+    assert all(set(member) == {"user_id", "joined_at"} for member in members)
+
+
 def test_get_invite_code_returns_code(client, created_group, auth_user):
     response = client.get(
         f"/groups/{created_group['id']}/members/invite",
@@ -72,3 +118,185 @@ def test_get_members_for_nonexistent_group_returns_404(client, auth_user):
 
     assert response.status_code == 404
     assert response.json()["detail"] == "Group not found"
+
+
+def test_get_members_etag_changes_when_membership_changes(
+    client, created_group, auth_user, second_user
+):
+    url = f"/groups/{created_group['id']}/members"
+    etag = client.get(url, headers=auth_user["headers"]).headers["etag"]
+
+    cached = client.get(url, headers={**auth_user["headers"], "If-None-Match": f"other, {etag}"})
+    assert cached.status_code == 304
+
+    client.post(url, json={"user_id": second_user["user"]["id"]}, headers=auth_user["headers"])
+    refreshed = client.get(url, headers={**auth_user["headers"], "If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert len(refreshed.json()) == 2
+
+    new_etag = refreshed.headers["etag"]
+    client.delete(f"{url}/{second_user['user']['id']}", headers=auth_user["headers"])
+    after_removal = client.get(url, headers={**auth_user["headers"], "If-None-Match": new_etag})
+    assert after_removal.status_code == 200
+
+
+def test_get_members_conditional_get_still_requires_membership(
+    client, created_group, auth_user, second_user
+):
+    url = f"/groups/{created_group['id']}/members"
+    etag = client.get(url, headers=auth_user["headers"]).headers["etag"]
+
+    response = client.get(url, headers={**second_user["headers"], "If-None-Match": etag})
+    assert response.status_code == 403
+
+
+def test_membership_is_cached_and_revoked_on_removal(client, group_with_two_members):
+    group_id = group_with_two_members["group"]["id"]
+    owner = group_with_two_members["owner"]
+    member = group_with_two_members["member"]
+    url = f"/groups/{group_id}/analytics/spending"
+    hits = metrics.counter("membership_cache.hits")
+
+    assert client.get(url, headers=member["headers"]).status_code == 200
+    before = hits.value
+    assert client.get(url, headers=member["headers"]).status_code == 200
+    assert hits.value == before + 1
+
+    removed = client.delete(
+        f"/groups/{group_id}/members/{member['user']['id']}", headers=owner["headers"]
+    )
+    assert removed.status_code == 204
+
+    assert client.get(url, headers=member["headers"]).status_code == 403
+
+
+def test_get_invite_code_checks_group_and_membership_in_one_query(
+    client, created_group, auth_user, db_session
+):
+    url = f"/groups/{created_group['id']}/members/invite"
+    client.get("/auth/me", headers=auth_user["headers"])  # warm the user cache
+    engine = db_session.get_bind()
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get(url, headers=auth_user["headers"])
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    assert len(statements) == 1
+
+
+def test_get_invite_code_distinguishes_missing_group_from_non_member(
+    client, created_group, second_user
+):
+    missing = client.get(f"/groups/{uuid.uuid4()}/members/invite", headers=second_user["headers"])
+    forbidden = client.get(
+        f"/groups/{created_group['id']}/members/invite", headers=second_user["headers"]
+    )
+
+    assert missing.status_code == 404
+    assert forbidden.status_code == 403
+
+
+def test_bulk_add_members_reports_added_present_and_unknown(
+    client, group_with_two_members, register_user
+):
+    group_id = group_with_two_members["group"]["id"]
+    owner = group_with_two_members["owner"]
+    existing = group_with_two_members["member"]["user"]
+    by_id = register_user(name="By Id")["user"]
+    by_email = register_user(name="By Email")["user"]
+    unknown_id = str(uuid.uuid4())
+
+    response = client.post(
+        f"/groups/{group_id}/members/bulk",
+        json={
+            "user_ids": [by_id["id"], existing["id"], unknown_id],
+            "emails": [by_email["email"], "nobody@example.com"],
+        },
+        headers=owner["headers"],
+    )
+
+    assert response.status_code == 201
+    data = response.json()
+    assert {m["user_id"] for m in data["added"]} == {by_id["id"], by_email["id"]}
+    assert all(m["group_id"] == group_id and m["user_name"] for m in data["added"])
+    assert data["already_members"] == [existing["id"]]
+    assert data["not_found_user_ids"] == [unknown_id]
+    assert data["not_found_emails"] == ["nobody@example.com"]
+
+    members = client.get(f"/groups/{group_id}/members", headers=owner["headers"]).json()
+    assert len(members) == 4
+
+
+def test_bulk_add_members_requires_ids_or_emails(client, created_group, auth_user):
+    response = client.post(
+        f"/groups/{created_group['id']}/members/bulk", json={}, headers=auth_user["headers"]
+    )
+
+    assert response.status_code == 400
+
+
+def test_remove_member_with_unsettled_balance_returns_409(client, expense_and_debt):
+    url = (
+        f"/groups/{expense_and_debt['group_id']}/members/{expense_and_debt['member']['user']['id']}"
+    )
+    owner_headers = expense_and_debt["owner"]["headers"]
+
+    blocked = client.delete(url, headers=owner_headers)
+    assert blocked.status_code == 409
+    assert "unsettled" in blocked.json()["detail"]
+
+    settle = client.post(
+        f"/groups/{expense_and_debt['group_id']}/debts/{expense_and_debt['debt_id']}/settle",
+        headers=expense_and_debt["member"]["headers"],
+    )
+    assert settle.status_code == 200
+    assert client.delete(url, headers=owner_headers).status_code == 204
+
+
+def test_remove_member_with_offsetting_pending_debts_returns_409(
+    client, group_with_two_members, register_user
+):
+    group_id = group_with_two_members["group"]["id"]
+    owner = group_with_two_members["owner"]
+    member = group_with_two_members["member"]
+    third = register_user(name="Third User")["user"]
+    client.post(
+        f"/groups/{group_id}/members", json={"user_id": third["id"]}, headers=owner["headers"]
+    )
+
+    # The member owes the owner 10 and is owed 10 by the third user: net balance zero
+    for payer_id, debtor_id in [
+        (owner["user"]["id"], member["user"]["id"]),
+        (member["user"]["id"], third["id"]),
+    ]:
+        created = client.post(
+            f"/groups/{group_id}/expenses",
+            headers=owner["headers"],
+            json={
+                "description": "Tickets",
+                "amount": "10.00",
+                "payer_id": payer_id,
+                "splits": [
+                    {
+                        "debtor_id": debtor_id,
+                        "creditor_id": payer_id,
+                        "amount_owed": "10.00",
+                        "percentage": "100.00",
+                    }
+                ],
+            },
+        )
+        assert created.status_code == 201
+
+    response = client.delete(
+        f"/groups/{group_id}/members/{member['user']['id']}", headers=owner["headers"]
+    )
+
+    assert response.status_code == 409
@@ -0,0 +1,123 @@
+import pytest
+from sqlalchemy import create_engine, event, insert, select
+
+from api.app import auth, metrics, read_replica
+from api.app.database import Base
+from api.app.read_replica import RoutingSession, _recent_writers
+
+
+@pytest.fixture
+def replica(monkeypatch, db_session, tmp_path):
+    """A replica database in its own SQLite file, empty until `_replicate` copies into it."""
+    replica_engine = create_engine(
+        f"sqlite:///{tmp_path / 'replica.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=replica_engine)
+    primary_engine = db_session.get_bind()
+    adapter = type(db_session)
+    monkeypatch.setattr(
+        read_replica,
+        "ReadSessionLocal",
+        lambda: adapter(RoutingSession(primary=primary_engine, replica=replica_engine)),
+    )
+    _recent_writers.clear()
+    yield replica_engine
+    _recent_writers.clear()
+    replica_engine.dispose()
+
+
+def _replicate(primary_engine, replica_engine) -> None:
+    """Copy every row of the primary into the replica, as replication would."""
+    with primary_engine.connect() as source, replica_engine.begin() as target:
+        for table in Base.metadata.sorted_tables:
+            rows = [row._asdict() for row in source.execute(select(table))]
+            if rows:
+                target.execute(insert(table), rows)
+
+
+def _simplifies_debts(client, headers) -> list[bool]:
+    response = client.get("/groups", headers=headers)
+    assert response.status_code == 200
+    return [group["debt_simplification"] for group in response.json()]
+
+
+def test_recent_writer_reads_primary_data_and_others_read_the_replica(
+    client, replica, db_session, auth_user, created_group
+):
+    _replicate(db_session.get_bind(), replica)
+    primary_reads = metrics.counter("db.read_sessions.primary").value
+    replica_reads = metrics.counter("db.read_sessions.replica").value
+
+    # A write the replica has not received yet.
+    toggled = client.patch(
+        f"/groups/{created_group['invite_code']}",
+        json={"debt_simplification": True},
+        headers=auth_user["headers"],
+    )
+    assert toggled.status_code == 200
+
+    assert _simplifies_debts(client, auth_user["headers"]) == [True]
+    assert metrics.counter("db.read_sessions.primary").value == primary_reads + 1
+
+    _recent_writers.clear()
+    assert _simplifies_debts(client, auth_user["headers"]) == [False]
+    assert metrics.counter("db.read_sessions.replica").value == replica_reads + 1
+
+
+def test_recent_writer_sees_a_group_the_replica_has_not_received(
+    client, replica, auth_user, created_group
+):
+    assert [
+        group["id"] for group in client.get("/groups", headers=auth_user["headers"]).json()
+    ] == [created_group["id"]]
+
+    _recent_writers.clear()
+    assert client.get("/groups", headers=auth_user["headers"]).json() == []
+
+
+def test_replica_reads_release_the_primary_connection(
+    client, replica, db_session, auth_user, created_group
+):
+    _recent_writers.clear()
+    auth._user_cache.clear()  # make get_current_user read the primary
+    primary_engine = db_session.get_bind()
+    primary = {"checkouts": 0, "held": 0}
+    held_during_replica_reads = []
+
+    def on_checkout(*_):
+        primary["checkouts"] += 1
+        primary["held"] += 1
+
+    def on_checkin(*_):
+        primary["held"] -= 1
+
+    event.listen(primary_engine, "checkout", on_checkout)
+    event.listen(primary_engine, "checkin", on_checkin)
+    event.listen(
+        replica,
+        "checkout",
+        lambda *_: held_during_replica_reads.append(primary["held"]),
+    )
+    try:
+        response = client.get("/groups", headers=auth_user["headers"])
+    finally:
+        event.remove(primary_engine, "checkout", on_checkout)
+        event.remove(primary_engine, "checkin", on_checkin)
+
+    assert response.status_code == 200
+    assert primary["checkouts"] == 1  # authentication only
+    assert held_during_replica_reads == [0]
+
+
+def test_routing_session_pins_to_primary_after_a_write():
+    primary_engine = create_engine("sqlite://")
+    replica_engine = create_engine("sqlite://")
+    session = RoutingSession(primary=primary_engine, replica=replica_engine)
+    select_clause = Base.metadata.tables["groups"].select()
+
+    assert session.get_bind(clause=select_clause) is replica_engine
+    assert session.get_bind(clause=Base.metadata.tables["groups"].delete()) is primary_engine
+    assert session.get_bind(clause=select_clause) is primary_engine
+    session.close()
+    replica_engine.dispose()
+    primary_engine.dispose()
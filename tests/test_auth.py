@@ -6,7 +6,6 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from api.app.auth import get_db_for_auth
 from api.app.database import Base
 from api.app.dependencies import get_db
 from api.app.main import app
@@ -32,7 +31,6 @@ async def override_get_db():
 
 
 app.dependency_overrides[get_db] = override_get_db
-app.dependency_overrides[get_db_for_auth] = override_get_db
 
 client = TestClient(app)
 
@@ -0,0 +1,54 @@
+"""Tests for the in-process TTL/LRU cache."""
+
+from api.app import cache
+from api.app.cache import TTLCache
+
+
+def test_evicts_least_recently_used_entry():
+    c = TTLCache(maxsize=2, ttl=60)
+    c.set("a", 1)
+    c.set("b", 2)
+    assert c.get("a") == 1  # "b" is now the least recently used
+    c.set("c", 3)
+
+    assert "b" not in c
+    assert c.get("a") == 1
+    assert c.get("c") == 3
+    assert len(c) == 2
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    c = TTLCache(maxsize=10, ttl=5)
+    c.set("default", 1)
+    c.set("short", 2, ttl=1)
+
+    now[0] += 2
+    assert c.get("short") is None
+    assert c.get("default") == 1
+
+    now[0] += 4
+    assert c.get("default", "gone") == "gone"
+
+
+def test_non_positive_ttl_and_size_store_nothing():
+    c = TTLCache(maxsize=10, ttl=60)
+    c.set("a", 1)
+    c.set("a", 2, ttl=0)
+    assert "a" not in c
+
+    disabled = TTLCache(maxsize=0, ttl=60)
+    disabled.set("a", 1)
+    assert len(disabled) == 0
+
+
+def test_pop_and_clear():
+    c = TTLCache(maxsize=10, ttl=60)
+    c.set("a", 1)
+    c.set("b", 2)
+
+    assert c.pop("a") == 1
+    assert c.pop("a", "missing") == "missing"
+    c.clear()
+    assert len(c) == 0
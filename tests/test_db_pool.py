@@ -0,0 +1,48 @@
+"""Tests for the instrumented connection pool."""
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from api.app import metrics
+from api.app.db_pool import InstrumentedQueuePool, pool_status
+
+
+def _engine(**pool_kwargs):
+    return create_engine("sqlite://", poolclass=InstrumentedQueuePool, **pool_kwargs)
+
+
+def test_reports_live_checkouts_and_overflow():
+    engine = _engine(pool_size=1, max_overflow=1)
+    first = engine.connect()
+    second = engine.connect()
+    try:
+        first.execute(text("SELECT 1"))
+        status = pool_status(engine.pool)
+        assert status["checked_out"] == 2
+        assert status["overflow"] == 1
+        assert status["peak_checked_out"] >= 2
+    finally:
+        first.close()
+        second.close()
+        engine.dispose()
+
+    assert pool_status(engine.pool)["checked_out"] == 0
+
+
+def test_times_checkouts_and_counts_timeouts():
+    engine = _engine(pool_size=1, max_overflow=0, pool_timeout=0.05)
+    waits = metrics.timer("db.pool.checkout_wait")
+    timeouts = metrics.counter("db.pool.timeouts")
+    waits_before, timeouts_before = waits.count, timeouts.value
+
+    held = engine.connect()
+    try:
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+    finally:
+        held.close()
+        engine.dispose()
+
+    assert waits.count == waits_before + 2
+    assert waits.max >= 0.05
+    assert timeouts.value == timeouts_before + 1
@@ -90,6 +90,26 @@ class TestDineAndDash:
         updated_group = group_service.drop_out_from_group(group.id, user_bob)
         assert user_bob not in updated_group.members
 
+    def test_cannot_drop_out_when_debts_cancel_out(
+        self, group_service, expense_service, user_alice, user_bob, user_charlie
+    ):
+
+        group = group_service.create_group("Dinner Group", "USD", user_alice)
+        group_service.invite_to_group(group.id, user_bob)
+        group_service.invite_to_group(group.id, user_charlie)
+
+        # Bob owes Alice 10 and Charlie owes Bob 10: Bob's net balance is zero
+        expense_service.create_expense(
+            group_id=group.id, amount=10.0, payer=user_alice, debtors={user_bob}
+        )
+        expense_service.create_expense(
+            group_id=group.id, amount=10.0, payer=user_bob, debtors={user_charlie}
+        )
+
+        assert expense_service.get_balance(group.id, user_bob) == 0
+        with pytest.raises(ValueError, match="has unsettled debts"):
+            group_service.drop_out_from_group(group.id, user_bob)
+
 
 class TestSoloSurvivor:
     def test_last_person_in_group_can_add_expense(self, group_service, expense_service, user_alice):
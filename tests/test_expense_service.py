@@ -131,3 +131,35 @@ def test_cannot_leave_group_with_debts(group_with_two, alice, bob):
 
     with pytest.raises(ValueError, match="unsettled debts"):
         group_service.drop_out_from_group(group.id, bob)
+
+
+def test_balance_tracks_expenses_settlements_and_drop_outs(group_with_three, alice, bob, charlie):
+    group, expense_service, _ = group_with_three
+
+    expense = expense_service.create_expense(
+        group.id, 90, payer=alice, debtors={alice, bob, charlie}
+    )
+    assert expense_service.get_balance(group.id, alice) == 60.0
+    assert expense_service.get_balance(group.id, bob) == -30.0
+
+    expense_service.drop_out_from_expense(expense.id, charlie)
+    assert expense_service.get_balance(group.id, alice) == 45.0
+    assert expense_service.get_balance(group.id, charlie) == 0.0
+
+    expense_service.settle_up(group.id, payer=bob, payee=alice, amount=45.0)
+    assert expense_service.get_balance(group.id, alice) == 0.0
+    assert expense_service.get_balance(group.id, bob) == 0.0
+
+
+def test_balance_matches_debt_matrix(group_with_three, alice, bob, charlie):
+    group, expense_service, _ = group_with_three
+
+    expense_service.create_expense(group.id, 90, payer=alice, debtors={alice, bob, charlie})
+    expense_service.create_expense(group.id, 40, payer=bob, debtors={alice, bob})
+    expense_service.create_expense(group.id, 25, payer=charlie, debtors={bob})
+
+    debts = expense_service.calculate_debts(group.id)
+    for user in (alice, bob, charlie):
+        owed = sum(amount for (_, creditor), amount in debts.items() if creditor == user)
+        owes = sum(amount for (debtor, _), amount in debts.items() if debtor == user)
+        assert expense_service.get_balance(group.id, user) == pytest.approx(owed - owes)
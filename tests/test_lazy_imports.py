@@ -0,0 +1,41 @@
+"""The API process imports its seed/script-only dependencies on first use."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from api.app import database, passwords
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_importing_the_api_skips_deferred_dependencies():
+    code = (
+        "import sys, api.app.main; "
+        "print(sorted({'psycopg2', 'passlib', 'multiprocessing', 'jose'} & set(sys.modules)))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_ROOT,
+        env=os.environ,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == "[]"
+
+
+def test_sync_engine_and_session_are_created_on_first_access():
+    from api.app.database import Session, sync_engine
+
+    assert sync_engine is database.get_sync_engine()
+    assert Session.kw["bind"] is sync_engine
+
+
+def test_password_context_is_built_on_first_access():
+    passwords.get_context.cache_clear()
+
+    assert passwords.verify_password("secret", passwords.get_context().hash("secret"))
+    assert passwords.get_context.cache_info().currsize == 1
@@ -0,0 +1,47 @@
+"""Tests for the in-process metrics registry."""
+
+import pytest
+
+from api.app import metrics
+
+
+def test_counter_reports_total_and_recent_rate(monkeypatch):
+    now = [5000.0]
+    monkeypatch.setattr(metrics.time, "monotonic", lambda: now[0])
+    c = metrics.Counter()
+    c.inc()
+    c.inc(59)
+
+    assert c.snapshot() == {"total": 60, "per_second": 1.0}
+
+    now[0] += 30
+    c.inc(60)
+    assert c.rate() == 2.0
+
+    now[0] += 45  # the first bucket left the window
+    assert c.rate() == 1.0
+    assert c.value == 120
+
+
+def test_gauge_tracks_peak():
+    g = metrics.Gauge()
+    g.inc(3)
+    g.dec(2)
+
+    assert g.snapshot() == {"value": 1, "peak": 3}
+
+
+def test_timer_summarises_observations():
+    t = metrics.Timer()
+    assert t.snapshot()["mean_ms"] == 0.0
+    t.observe(0.1)
+    t.observe(0.3)
+
+    assert t.snapshot() == {"count": 2, "mean_ms": 200.0, "max_ms": 300.0}
+
+
+def test_registry_returns_same_metric_and_rejects_kind_clash():
+    assert metrics.counter("tests.registry") is metrics.counter("tests.registry")
+    assert "tests.registry" in metrics.snapshot()
+    with pytest.raises(TypeError):
+        metrics.gauge("tests.registry")
@@ -0,0 +1,88 @@
+"""Tests for the token-bucket rate limiter."""
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from api.app import rate_limit
+from api.app.rate_limit import MemoryBucketStore, TokenBucketLimiter
+from api.app.routers.auth import _check_login_rate
+
+
+def test_bucket_allows_burst_then_reports_wait_until_refill():
+    store = MemoryBucketStore()
+
+    assert [store.take("k", 3, 1.0, now=100.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert store.take("k", 3, 1.0, now=100.0) == pytest.approx(1.0)
+    assert store.take("k", 3, 1.0, now=100.5) == pytest.approx(0.5)
+    assert store.take("k", 3, 1.0, now=101.0) == 0.0
+
+
+def test_bucket_refill_is_capped_at_capacity():
+    store = MemoryBucketStore()
+    store.take("k", 2, 1.0, now=0.0)
+
+    results = [store.take("k", 2, 1.0, now=1000.0) for _ in range(3)]
+
+    assert results[:2] == [0.0, 0.0]
+    assert results[2] > 0
+
+
+def test_store_forgets_least_recently_used_key():
+    store = MemoryBucketStore(maxsize=2)
+    store.take("a", 1, 1.0, now=0.0)
+    store.take("b", 1, 1.0, now=0.0)
+    store.take("a", 1, 1.0, now=0.0)
+    store.take("c", 1, 1.0, now=0.0)
+
+    # "b" was evicted, so it starts with a full bucket again.
+    assert store.take("b", 1, 1.0, now=0.0) == 0.0
+    assert store.take("c", 1, 1.0, now=0.0) > 0
+
+
+def test_limiter_counts_rejections_and_resets(monkeypatch):
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: 50.0)
+    limiter = TokenBucketLimiter("tests", capacity=1, per_minute=6)
+
+    assert limiter.check("ip") == 0.0
+    assert limiter.check("ip") == pytest.approx(10.0)
+    assert rate_limit.metrics.counter("rate_limit.tests.rejected").value >= 1
+
+    limiter.reset()
+    assert limiter.check("ip") == 0.0
+
+
+def test_client_ip_ignores_forwarded_for_from_untrusted_peers():
+    proxies = rate_limit._parse_networks(["10.0.0.0/8"])
+
+    assert rate_limit.client_ip("203.0.113.9", "198.51.100.1", proxies) == "203.0.113.9"
+    assert rate_limit.client_ip("10.0.0.2", None, proxies) == "10.0.0.2"
+    assert rate_limit.client_ip(None, None, proxies) == "unknown"
+
+
+def test_client_ip_skips_trusted_proxies_in_forwarded_for():
+    proxies = rate_limit._parse_networks(["10.0.0.0/8"])
+
+    # The leftmost entry is client-controlled; the rightmost untrusted hop is the client
+    forwarded = "192.0.2.66, 198.51.100.7, 10.0.0.5"
+    assert rate_limit.client_ip("10.0.0.2", forwarded, proxies) == "198.51.100.7"
+
+
+def _login_request(peer: str):
+    return Request({"type": "http", "client": (peer, 1234), "headers": []})
+
+
+def test_email_bucket_is_per_client_ip(monkeypatch):
+    monkeypatch.setattr(rate_limit.login_email_limiter, "capacity", 2)
+    rate_limit.login_email_limiter.reset()
+    rate_limit.login_ip_limiter.reset()
+
+    for _ in range(2):
+        _check_login_rate(_login_request("203.0.113.9"), "victim@example.com")
+    with pytest.raises(HTTPException) as blocked:
+        _check_login_rate(_login_request("203.0.113.9"), "Victim@example.com")
+    _check_login_rate(_login_request("198.51.100.1"), "victim@example.com")
+
+    assert blocked.value.status_code == 429
+    rate_limit.login_email_limiter.reset()
+    rate_limit.login_ip_limiter.reset()